@@ -0,0 +1,295 @@
+# argparse reads the command line
+# concurrent.futures spreads the messages over processes
+# itertools cuts the message stream into batches
+# json reads and writes JSONL streams
+# os and sys are needed for files, the number of cores and
+# the standard streams
+# CipherCore provides the cipher functions
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+from CipherCore import Hex
+from CipherCore import KeyPool
+from CipherCore import Normalization
+from CipherCore import OneTimePad
+from CipherCore import Substitution
+from CipherCore import Transposition
+from CipherCore import Vigenere
+
+# The ciphers which can be applied by the command line.
+Ciphers = ["caesar", "mono", "vigenere", "otp", "reverse", "disrcoltrans2"]
+
+# This function applies the cipher to one message. Texts
+# are normalized first (strictly if options["strict"] is
+# set, but keeping the blanks of disrcoltrans2 cipher
+# texts), OTP messages are bytes and are XORed with the key
+# file starting at KeyOffset.
+# It returns the en- or decrypted message.
+def Apply(cipher, message, options, KeyOffset = 0):
+    if cipher == "otp":
+        with open(options["key_file"], mode = "br") as KeyFile:
+            KeyFile.seek(KeyOffset)
+            key = KeyFile.read(len(message))
+        if len(key) < len(message):
+            raise ValueError("Key file is shorter than the data.")
+        return OneTimePad.XorBlock(message, key)
+    # The blanks of a disrcoltrans2 cipher text are part of
+    # it, so they are kept even if normalizing strictly.
+    KeepBlanks = (not options["strict"]) or ((cipher == "disrcoltrans2") and options["decrypt"])
+    text = Normalization.NormalizeText(message,
+                                       KeepBlanks = KeepBlanks,
+                                       KeepNonalpha = not options["strict"])
+    key = (options["key"] or "").upper()
+    if cipher in ["caesar", "mono"]:
+        if cipher == "caesar":
+            key = Substitution.CaesarKey(key[:1] or "a").upper()
+        if options["decrypt"]:
+            key = Substitution.InverseKey(key)
+        return Substitution.Substitute(text, key)
+    if cipher == "vigenere":
+        if options["decrypt"]:
+            return Vigenere.VigenereDecrypt(text, key)
+        return Vigenere.VigenereEncrypt(text, key)
+    if cipher == "reverse":
+        return Transposition.ReverseCipher(text)
+    if cipher == "disrcoltrans2":
+        DisruptionKey = (options["disruption_key"] or "").upper()
+        if options["decrypt"]:
+            return Transposition.DisrColTrans2Decrypt(text, key, DisruptionKey)[0]
+        return Transposition.DisrColTrans2Encrypt(text, key, DisruptionKey)
+    raise ValueError("Unknown cipher " + cipher)
+
+# The file in which the key offsets of the OTP messages of
+# a directory are stored.
+KeyOffsetsName = "key_offsets.json"
+
+# This function en- or decrypts a text file with the Vigenère
+# cipher block by block, carrying the position in the key
+# from block to block, so files of any size need only
+# constant memory.
+def StreamVigenere(InPath, OutPath, options):
+    blocks = Normalization.NormalizeFile(InPath,
+                                         KeepBlanks = not options["strict"],
+                                         KeepNonalpha = not options["strict"])
+    with open(OutPath, mode = "wt", encoding = "utf-8") as OutFile:
+        for block in Vigenere.VigenereChunks(blocks, (options["key"] or "").upper(), options["decrypt"]):
+            OutFile.write(block)
+
+# This function processes one file of a directory in a worker
+# process and writes the result into the output directory.
+# It returns the name of the file and the error message (or
+# None).
+def ProcessFile(job):
+    cipher, options, name, KeyOffset = job
+    try:
+        if cipher == "otp":
+            with open(os.path.join(options["input"], name), mode = "br") as InFile:
+                result = Apply(cipher, InFile.read(), options, KeyOffset)
+            with open(os.path.join(options["output"], name), mode = "bw") as OutFile:
+                OutFile.write(result)
+        elif cipher == "vigenere":
+            StreamVigenere(os.path.join(options["input"], name), os.path.join(options["output"], name), options)
+        else:
+            with open(os.path.join(options["input"], name), mode = "rt", encoding = "utf-8") as InFile:
+                result = Apply(cipher, InFile.read(), options)
+            with open(os.path.join(options["output"], name), mode = "wt", encoding = "utf-8") as OutFile:
+                OutFile.write(result)
+    except (OSError, ValueError) as e:
+        return name, str(e)
+    return name, None
+
+# This function processes one record of a JSONL stream in a
+# worker process. The message is taken from the field
+# "text" (hexadecimal values for OTP) and replaced by the
+# result, or an "error" field is added.
+# It returns the record.
+def ProcessRecord(job):
+    cipher, options, record = job
+    try:
+        message = record["text"]
+        if not isinstance(message, str):
+            raise ValueError("The field text must be a string")
+        if cipher == "otp":
+            message = Hex.FromHexStr(message)
+            record["text"] = Hex.ToHexStr(Apply(cipher, message, options, record.get("key_offset", 0)))
+        else:
+            record["text"] = Apply(cipher, message, options)
+    except (KeyError, TypeError, OSError, ValueError) as e:
+        record["error"] = str(e)
+    return record
+
+# This function returns the offsets of keys of the given
+# lengths which follow each other in the key file, the first
+# one at offset.
+def ConsecutiveOffsets(lengths, offset = 0):
+    offsets = []
+    for length in lengths:
+        offsets.append(offset)
+        offset += length
+    return offsets
+
+# This function reserves keys of the given lengths in the key
+# pool at once and returns their offsets.
+def ReserveKeys(path, lengths):
+    return ConsecutiveOffsets(lengths, KeyPool.KeyPool(path).Reserve(sum(lengths)))
+
+# This function returns the offsets of the keys of the OTP
+# messages to encrypt, given their lengths. With a key pool
+# the keys are reserved in it, otherwise the messages of one
+# run use consecutive parts of the key file starting at
+# offset. A part of the key file is never used for two
+# messages of a run.
+def EncryptionOffsets(options, lengths, offset = 0):
+    if options["key_pool"]:
+        return ReserveKeys(options["key_file"], lengths)
+    return ConsecutiveOffsets(lengths, offset)
+
+# This function spreads the jobs over the pool in chunks of
+# ChunkSize jobs, so the processes do not wait for every
+# single message. Without a given size every process gets
+# about four chunks.
+def MapJobs(executor, function, jobs, options):
+    ChunkSize = options["chunksize"] or max(1, len(jobs) // (4 * options["workers"]))
+    return executor.map(function, jobs, chunksize = ChunkSize)
+
+# This function en- or decrypts every file of the input
+# directory into a file of the same name in the output
+# directory. The files are read and written by the worker
+# processes. Every OTP file gets a key of its own (from the
+# key pool, if given, or else the next part of the key file)
+# and the offsets are stored in the file key_offsets.json of
+# the output directory, which is used again for the
+# decryption.
+# It returns the number of failed files.
+def RunDirectory(cipher, options):
+    os.makedirs(options["output"], exist_ok = True)
+    names = sorted([name for name in os.listdir(options["input"])
+                    if os.path.isfile(os.path.join(options["input"], name)) and name != KeyOffsetsName])
+    offsets = {}
+    if (cipher == "otp") and not options["decrypt"]:
+        lengths = [os.path.getsize(os.path.join(options["input"], name)) for name in names]
+        offsets = dict(zip(names, EncryptionOffsets(options, lengths)))
+        with open(os.path.join(options["output"], KeyOffsetsName), mode = "wt", encoding = "utf-8") as OffsetsFile:
+            json.dump(offsets, OffsetsFile)
+    elif (cipher == "otp") and os.path.isfile(os.path.join(options["input"], KeyOffsetsName)):
+        with open(os.path.join(options["input"], KeyOffsetsName), mode = "rt", encoding = "utf-8") as OffsetsFile:
+            offsets = json.load(OffsetsFile)
+    jobs = [(cipher, options, name, offsets.get(name, 0)) for name in names]
+    failed = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers = options["workers"]) as executor:
+        for name, error in MapJobs(executor, ProcessFile, jobs, options):
+            if error is not None:
+                print(name + ": " + error, file = sys.stderr)
+                failed += 1
+    return failed
+
+# This function reads one line of a JSONL stream. It returns
+# the record and None, or None and the error message if the
+# line is no valid JSON object.
+def ParseRecord(line):
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        return None, "Invalid JSON: " + str(e)
+    if not isinstance(record, dict):
+        return None, "The line is no JSON object"
+    return record, None
+
+# This function en- or decrypts every record of the JSONL
+# stream InFile and writes the records in the same order to
+# OutFile. The stream is read in batches, so it may be of
+# any length. Every OTP message to encrypt gets a key of its
+# own (from the key pool, if given, or else the next part of
+# the key file), whose offset is stored in the field
+# "key_offset". A line which is no valid JSON object is
+# replaced by a record with the field "error" only.
+# It returns the number of failed records.
+def RunJsonl(cipher, options, InFile, OutFile):
+    failed = 0
+    NextOffset = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers = options["workers"]) as executor:
+        lines = (line for line in InFile if line.strip() != "")
+        while True:
+            batch = [ParseRecord(line) for line in itertools.islice(lines, 256 * options["workers"])]
+            if len(batch) == 0:
+                break
+            records = [record for record, error in batch if error is None]
+            if (cipher == "otp") and not options["decrypt"]:
+                messages = [record for record in records if isinstance(record.get("text"), str)]
+                lengths = [len(record["text"].split()) for record in messages]
+                for record, offset in zip(messages, EncryptionOffsets(options, lengths, NextOffset)):
+                    record["key_offset"] = offset
+                NextOffset += sum(lengths)
+            results = MapJobs(executor, ProcessRecord, [(cipher, options, record) for record in records], options)
+            for record, error in batch:
+                record = next(results) if error is None else {"error": error}
+                if "error" in record:
+                    failed += 1
+                OutFile.write(json.dumps(record, ensure_ascii = False) + "\n")
+    return failed
+
+# The ciphers whose keys consist of the letters A to Z.
+LetterKeyCiphers = ["caesar", "mono", "vigenere", "disrcoltrans2"]
+
+# This function checks a key of letters given on the command
+# line and returns it in capitals. Since the ciphers compute
+# with the positions of the letters in the alphabet, a key
+# which is empty or changes by the strict normalization
+# (blanks, digits, umlauts, ...) is refused by the parser.
+def LetterKey(parser, name, key):
+    normalized = Normalization.NormalizeText(key or "")
+    if (normalized == "") or (normalized != (key or "").upper()):
+        parser.error(name + " may only consist of the letters A to Z")
+    return normalized
+
+# This function reads the command line and runs the batch.
+# It returns the exit code: 0 if all messages succeeded,
+# 1 if some failed and 2 for wrong arguments.
+def Main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python -m CipherCore",
+                                     description = "En- or decrypts a directory of files or a JSONL stream of messages.")
+    parser.add_argument("cipher", choices = Ciphers)
+    parser.add_argument("input", help = "directory, JSONL file or - for standard input")
+    parser.add_argument("output", help = "directory, JSONL file or - for standard output")
+    parser.add_argument("-d", "--decrypt", action = "store_true")
+    parser.add_argument("-k", "--key", help = "key (Caesar: substitute of A)")
+    parser.add_argument("--disruption-key", help = "disruption key of disrcoltrans2")
+    parser.add_argument("--key-file", help = "binary key file of otp")
+    parser.add_argument("--key-pool", action = "store_true",
+                        help = "use the key file as key pool, so later runs do not use the same keys either")
+    parser.add_argument("--strict", action = "store_true",
+                        help = "remove blanks and non-alphabetic chars of texts")
+    parser.add_argument("-w", "--workers", type = int, default = os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type = int, default = 0)
+    options = vars(parser.parse_args(argv))
+    if (options["cipher"] == "otp") and (options["key_file"] is None):
+        parser.error("otp needs --key-file")
+    if options["key_pool"] and (options["decrypt"] or options["cipher"] != "otp"):
+        parser.error("--key-pool is only used for otp encryption")
+    if options["workers"] < 1:
+        parser.error("--workers must be at least 1")
+    if options["cipher"] in LetterKeyCiphers:
+        options["key"] = LetterKey(parser, "--key", options["key"])
+    if options["cipher"] == "mono":
+        try:
+            Substitution.InverseKey(options["key"])
+        except ValueError as e:
+            parser.error(str(e))
+    if options["cipher"] == "disrcoltrans2":
+        options["disruption_key"] = LetterKey(parser, "--disruption-key", options["disruption_key"])
+    if (options["input"] != "-") and os.path.isdir(options["input"]):
+        failed = RunDirectory(options["cipher"], options)
+    else:
+        InFile = sys.stdin if options["input"] == "-" else open(options["input"], mode = "rt", encoding = "utf-8")
+        OutFile = sys.stdout if options["output"] == "-" else open(options["output"], mode = "wt", encoding = "utf-8")
+        try:
+            failed = RunJsonl(options["cipher"], options, InFile, OutFile)
+        finally:
+            if InFile is not sys.stdin:
+                InFile.close()
+            if OutFile is not sys.stdout:
+                OutFile.close()
+    return 1 if failed > 0 else 0
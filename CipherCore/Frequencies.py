@@ -0,0 +1,31 @@
+# numpy provides the arrays for the analysis of long texts
+import numpy as np
+
+# This function counts each letter A-Z in the text and
+# returns a list of 26 numbers. The capitals are counted as
+# bytes of the UTF-8 encoding, in which they never occur
+# within other characters.
+def LetterFrequencies(text):
+    counts = np.bincount(np.frombuffer(text.encode("utf-8"), dtype = np.uint8), minlength = 256)
+    return counts[ord("A") : ord("Z") + 1].tolist()
+
+# This function converts a strictly normalized text, i.e.
+# capitals only, into an array of the numbers 0 to 25.
+def ToNumbers(text):
+    return np.frombuffer(text.encode("ascii"), dtype = np.uint8) - ord("A")
+
+# This function numbers every string of StringLength letters
+# of the array of letters (0-25), so that equal strings get
+# equal numbers. The string starting at position i gets
+# the number at index i.
+def NGramNumbers(letters, StringLength):
+    if (StringLength < 1) or (StringLength > 13):
+        raise ValueError("Length of strings must be from 1 to 13")
+    count = len(letters) - StringLength + 1
+    if count < 1:
+        return np.zeros(0, dtype = np.int64)
+    numbers = np.zeros(count, dtype = np.int64)
+    for t in range(StringLength):
+        numbers *= 26
+        numbers += letters[t : t + count]
+    return numbers
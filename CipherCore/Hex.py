@@ -0,0 +1,53 @@
+# numpy provides the fast check of the token lengths
+# re finds the entries and their offsets if the fast
+# conversion fails
+import numpy as np
+import re
+
+# This lookup table marks the ASCII whitespaces, which
+# separate the entries (as for bytes.fromhex).
+WhitespaceTable = np.zeros(256, dtype = bool)
+WhitespaceTable[list(b" \t\n\r\x0b\x0c")] = True
+
+# This function formats the input data as a string of
+# hexadecimal values for each byte separated by spaces,
+# e.g. "a3 e2 00". If BytesPerLine is given, a newline is
+# inserted after every BytesPerLine bytes instead.
+def ToHexStr(data, BytesPerLine = 0):
+    text = bytes(data).hex(" ")
+    if BytesPerLine < 1:
+        return text
+    n = 3 * BytesPerLine
+    return "\n".join([text[i : i + n - 1] for i in range(0, len(text), n)])
+
+# This function converts a string of hexadecimal values
+# separated by whitespaces into bytes. It raises a
+# ValueError if one of the values is not a hexadecimal
+# number from 0 to 255, telling the first wrong entry and
+# its offset (in characters) in the text.
+# Text consisting of two-digit entries only is converted by
+# bytes.fromhex at once, other text entry by entry.
+def FromHexStr(text):
+    try:
+        data = bytes.fromhex(text)
+        TextBytes = np.frombuffer(text.encode("ascii"), dtype = np.uint8)
+    except ValueError:
+        pass
+    else:
+        # bytes.fromhex also accepts entries like "a3e2", so
+        # the number of entries must equal the number of bytes.
+        whitespace = WhitespaceTable[TextBytes]
+        entries = np.count_nonzero(~whitespace[1:] & whitespace[:-1]) + int(len(text) > 0 and not whitespace[0])
+        if entries == len(data):
+            return data
+    DataList = []
+    for entry in re.finditer(r"\S+", text):
+        try:
+            value = int(entry.group(), 16)
+        except ValueError:
+            value = -1
+        if (value < 0) or (value > 255):
+            raise ValueError("Entry '" + entry.group() + "' at offset " + str(entry.start()) +
+                             " is not a hexadecimal number from 0 to 255.")
+        DataList.append(value)
+    return bytes(DataList)
@@ -0,0 +1,134 @@
+# os provides the cryptographically secure random numbers
+# and the atomic replacement of files
+# mmap maps the pool file into memory
+# contextlib builds the lock of the pool
+# fcntl (or msvcrt on Windows) locks the pool against other
+# processes
+import os
+import mmap
+import contextlib
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# This function generates a random key of length bytes by
+# the random number generator of the operating system,
+# which (unlike the random module) is suitable for one-time
+# pads.
+def GenerateKey(length):
+    return os.urandom(length)
+
+# This class manages a pool of pre-generated key material in
+# the file path. The number of bytes already handed out is
+# stored in the file path + ".used" and saved before a key
+# is handed out, so no part of the pool is ever used twice,
+# even if the program is stopped afterwards. While a key is
+# reserved, the file path + ".lock" is locked and the number
+# of used bytes is read anew, so several pools or processes
+# on the same file never hand out the same bytes.
+# Keys are handed out as memoryview slices of the mapped
+# pool file without copying them.
+class KeyPool:
+
+    def __init__(self, path):
+        self.path = path
+        self.UsedPath = path + ".used"
+        self.map = None
+        self.LockPath = path + ".lock"
+        if not os.path.exists(path):
+            open(path, mode = "bw").close()
+        self.Refresh()
+
+    # This method reads the number of used bytes and the size
+    # of the pool from the files, which other processes may
+    # have changed.
+    def Refresh(self):
+        try:
+            with open(self.UsedPath, mode = "rt", encoding = "utf-8") as UsedFile:
+                self.used = int(UsedFile.read())
+        except FileNotFoundError:
+            self.used = 0
+        self.size = os.path.getsize(self.path)
+        if self.used > self.size:
+            raise ValueError("Key pool is corrupted: more bytes used than available.")
+
+    # This method locks the pool exclusively for the with
+    # block; other processes wait until it is unlocked.
+    @contextlib.contextmanager
+    def Locked(self):
+        with open(self.LockPath, mode = "ab") as LockFile:
+            if fcntl is not None:
+                fcntl.flock(LockFile.fileno(), fcntl.LOCK_EX)
+            else:
+                LockFile.seek(0)
+                msvcrt.locking(LockFile.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(LockFile.fileno(), fcntl.LOCK_UN)
+                else:
+                    LockFile.seek(0)
+                    msvcrt.locking(LockFile.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+    # This method returns the number of bytes not handed
+    # out yet (by the last reading of the files).
+    def Available(self):
+        return self.size - self.used
+
+    # This method appends length random bytes to the pool.
+    # They are generated in blocks of BlockSize bytes.
+    def Fill(self, length, BlockSize = 1 << 24):
+        with self.Locked():
+            with open(self.path, mode = "ba") as PoolFile:
+                while length > 0:
+                    PoolFile.write(GenerateKey(min(length, BlockSize)))
+                    length -= min(length, BlockSize)
+            self.Refresh()
+        # Keys handed out before still refer to the old
+        # mapping, so it is not closed here.
+        self.map = None
+
+    # This method marks the next length bytes of the pool as
+    # used and returns their offset in the pool file, e.g.
+    # for XorFile. It raises a ValueError if the pool does
+    # not contain enough unused bytes.
+    def Reserve(self, length):
+        with self.Locked():
+            self.Refresh()
+            if length > self.Available():
+                raise ValueError("Key pool contains only " + str(self.Available()) + " unused bytes.")
+            offset = self.used
+            with open(self.UsedPath + ".tmp", mode = "wt", encoding = "utf-8") as UsedFile:
+                UsedFile.write(str(offset + length))
+                UsedFile.flush()
+                os.fsync(UsedFile.fileno())
+            os.replace(self.UsedPath + ".tmp", self.UsedPath)
+            self.used = offset + length
+        return offset
+
+    # This method hands out the next length bytes of the pool
+    # as a key (a read-only memoryview).
+    def Take(self, length):
+        offset = self.Reserve(length)
+        if length == 0:
+            return memoryview(b"")
+        # Another process may have filled the pool since it
+        # was mapped.
+        if (self.map is None) or (len(self.map) < offset + length):
+            with open(self.path, mode = "br") as PoolFile:
+                self.map = mmap.mmap(PoolFile.fileno(), 0, access = mmap.ACCESS_READ)
+        return memoryview(self.map)[offset : offset + length]
+
+    # This method drops the mapping of the pool file. It is
+    # closed as soon as no key refers to it anymore.
+    def Close(self):
+        self.map = None
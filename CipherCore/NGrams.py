@@ -0,0 +1,190 @@
+# argparse and sys are needed for the command line building
+# a language model
+# functools keeps the loaded tables, os finds their files
+# numpy provides the tables of the n-gram statistics and the
+# scoring of many texts at once
+# Normalization prepares the sample text
+import argparse
+import functools
+import os
+import sys
+import numpy as np
+from CipherCore.Normalization import NormalizeText
+
+# The letters A-Z are numbered 0 to 25, every other character
+# (blanks, digits, punctuation) is counted as the separator 26.
+Separator = 26
+Symbols = 27
+
+# This function converts a normalized text into an array of
+# the numbers 0 to 26.
+def SymbolNumbers(text):
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype = np.uint32).astype(np.int64) - ord("A")
+    codes[(codes < 0) | (codes > 25)] = Separator
+    return codes
+
+# This function numbers every string of StringLength symbols
+# along the last axis of the array of symbols (0-26), so that
+# equal strings get equal numbers. An array of several texts
+# of equal length (one per row) is numbered at once.
+def NGramIds(symbols, StringLength = 4):
+    count = symbols.shape[-1] - StringLength + 1
+    if count < 1:
+        return np.zeros(symbols.shape[:-1] + (0,), dtype = np.int64)
+    ids = np.zeros(symbols.shape[:-1] + (count,), dtype = np.int64)
+    for t in range(StringLength):
+        ids *= Symbols
+        ids += symbols[..., t : t + count]
+    return ids
+
+# This function computes the logarithmic probabilities
+# (base 10) of all strings of StringLength symbols in the
+# sample text. The strings are counted in the sample with
+# blanks (runs of other characters become one separator) and
+# in the sample without them, so the table scores texts with
+# and without blanks. Strings never seen get the probability
+# of a hundredth of a single occurrence.
+# It returns a table indexed by the numbers of NGramIds.
+def NGramTable(sample, StringLength = 4):
+    counts = np.zeros(Symbols ** StringLength, dtype = np.int64)
+    for text in [" ".join(NormalizeText(sample, KeepBlanks = True).split()),
+                 NormalizeText(sample)]:
+        counts += np.bincount(NGramIds(SymbolNumbers(text), StringLength),
+                              minlength = Symbols ** StringLength)
+    total = max(counts.sum(), 1)
+    return np.log10(np.maximum(counts, 0.01) / total).astype(np.float32)
+
+# This function returns the longest strings whose statistics
+# a sample of the given number of letters can provide:
+# quadgrams need some ten thousand letters, trigrams some
+# hundred.
+def StringLengthFor(letters):
+    if letters >= 20000:
+        return 4
+    return 3 if letters >= 500 else 2
+
+# This function returns the longest strings whose statistics
+# the sample text can provide.
+def SuitableStringLength(sample):
+    return StringLengthFor(len(NormalizeText(sample)))
+
+# This function scores the text (an array of symbols or
+# several of them, one per row) by the sum of the
+# logarithmic probabilities of its strings. The better the
+# text matches the sample, the higher is its score.
+def Fitness(table, symbols, StringLength = 4):
+    return table[NGramIds(symbols, StringLength)].sum(axis = -1, dtype = np.float64)
+
+# A language model is a directory holding the letter counts
+# of a corpus and its tables of NGramTable for the string
+# lengths 1 to 4 as NumPy files. It is built once and then
+# loaded memory-mapped, so the crackers of all ciphers share
+# the same tables without counting the corpus again.
+LettersName = "letters.npy"
+ModelLengths = [1, 2, 3, 4]
+
+# This function returns the name of the file of the table of
+# strings of StringLength symbols.
+def TableName(StringLength):
+    return "ngrams" + str(StringLength) + ".npy"
+
+# This function builds the language model of the corpus text
+# and saves it into the directory.
+def BuildModel(corpus, directory, lengths = ModelLengths):
+    os.makedirs(directory, exist_ok = True)
+    letters = np.bincount(SymbolNumbers(NormalizeText(corpus)), minlength = Symbols)[:26]
+    np.save(os.path.join(directory, LettersName), letters.astype(np.int64))
+    for StringLength in lengths:
+        np.save(os.path.join(directory, TableName(StringLength)), NGramTable(corpus, StringLength))
+
+# This function loads a file of a language model
+# memory-mapped. Each file is loaded once per process, and
+# again only if it has been rebuilt meanwhile.
+def LoadModelFile(directory, name):
+    path = os.path.join(directory, name)
+    if not os.path.isfile(path):
+        raise ValueError("The language model in " + directory + " has no file " + name)
+    return CachedModelFile(os.path.abspath(path), os.path.getmtime(path))
+
+# This function loads the file at path. The time of its last
+# modification is part of the key of the cache.
+@functools.lru_cache(maxsize = 32)
+def CachedModelFile(path, modified):
+    return np.load(path, mmap_mode = "r")
+
+# This function returns the table of strings of StringLength
+# symbols of the language model.
+def LoadTable(directory, StringLength = 4):
+    return LoadModelFile(directory, TableName(StringLength))
+
+# This function returns the letter counts A-Z of the corpus
+# of the language model, e.g. as sample frequencies of the
+# Vigenère analysis.
+def LoadLetterFrequencies(directory):
+    return LoadModelFile(directory, LettersName)
+
+# This function returns the longest strings which the
+# language model provides and its corpus is large enough for.
+def ModelStringLength(directory):
+    StringLength = StringLengthFor(int(LoadLetterFrequencies(directory).sum()))
+    while (StringLength > 1) and not os.path.isfile(os.path.join(directory, TableName(StringLength))):
+        StringLength -= 1
+    return StringLength
+
+# This class provides the statistics of the target language
+# to the crackers, either from a language model directory
+# or from a sample text. The tables of a sample text are
+# computed once, those of a model are loaded from its files.
+class LanguageSample:
+
+    def __init__(self, text = "", model = None):
+        self.text = text
+        self.model = model
+        self.letters = None
+        self.tables = {}
+
+    # This method returns the letter counts A-Z as a list.
+    def LetterFrequencies(self):
+        if self.letters is None:
+            if self.model is not None:
+                self.letters = LoadLetterFrequencies(self.model).tolist()
+            else:
+                self.letters = np.bincount(SymbolNumbers(NormalizeText(self.text)), minlength = Symbols)[:26].tolist()
+        return self.letters
+
+    # This method checks if the sample provides no letters.
+    def IsEmpty(self):
+        return sum(self.LetterFrequencies()) == 0
+
+    # This method returns the longest strings whose statistics
+    # the sample provides.
+    def StringLength(self):
+        if self.model is not None:
+            return ModelStringLength(self.model)
+        return SuitableStringLength(self.text)
+
+    # This method returns the table of strings of StringLength
+    # symbols.
+    def Table(self, StringLength = 4):
+        if self.model is not None:
+            return LoadTable(self.model, StringLength)
+        if StringLength not in self.tables:
+            self.tables[StringLength] = NGramTable(self.text, StringLength)
+        return self.tables[StringLength]
+
+# This function reads the command line and builds the
+# language model of a corpus file.
+# It returns the exit code.
+def Main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python -m CipherCore.NGrams",
+                                     description = "Builds the n-gram language model of a corpus.")
+    parser.add_argument("corpus", help = "text file in the language of the plain texts")
+    parser.add_argument("model", help = "directory of the language model")
+    parser.add_argument("--lengths", type = int, nargs = "+", choices = ModelLengths, default = ModelLengths)
+    options = parser.parse_args(argv)
+    with open(options.corpus, mode = "rt", encoding = "utf-8") as CorpusFile:
+        BuildModel(CorpusFile.read(), options.model, options.lengths)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(Main())
@@ -0,0 +1,84 @@
+# functools provides the cache for the translation tables
+import functools
+
+# The umlauts and ß are the only characters which are
+# replaced by two letters.
+Expansions = [("ä", "AE"), ("Ä", "AE"), ("ö", "OE"), ("Ö", "OE"),
+              ("ü", "UE"), ("Ü", "UE"), ("ß", "SS")]
+
+# The translation tables of NormalizeText map every
+# character to its normalized form (or None to delete it).
+# Only letters, umlauts, ß, blanks and newlines are listed
+# explicitly, all other characters are added on their first
+# occurrence by __missing__ according to KeepNonalpha.
+class NormalizationTable(dict):
+    def __init__(self, KeepBlanks, KeepNonalpha):
+        super().__init__()
+        self.KeepNonalpha = KeepNonalpha
+        for i in range(26):
+            self[ord("A") + i] = chr(ord("A") + i)
+            self[ord("a") + i] = chr(ord("A") + i)
+        for c, s in Expansions:
+            self[ord(c)] = s
+        self[ord(" ")] = " " if KeepBlanks else None
+        self[10] = " " if KeepBlanks else None
+
+    def __missing__(self, key):
+        value = chr(key) if self.KeepNonalpha else None
+        self[key] = value
+        return value
+
+# This function returns the translation table for one
+# combination of the settings. Each table is created only
+# once and reused by all later calls.
+@functools.lru_cache(maxsize = None)
+def GetNormalizationTable(KeepBlanks = False, KeepNonalpha = False):
+    return NormalizationTable(bool(KeepBlanks), bool(KeepNonalpha))
+
+# This function returns the table and the characters to
+# delete for bytes.translate, which normalizes ASCII texts
+# much faster than the general table. Each combination of
+# the settings is created only once.
+@functools.lru_cache(maxsize = None)
+def GetAsciiTable(KeepBlanks = False, KeepNonalpha = False):
+    table = GetNormalizationTable(KeepBlanks, KeepNonalpha)
+    source = bytes([c for c in range(128) if table[c] != None])
+    target = "".join([table[c] for c in range(128) if table[c] != None])
+    delete = bytes([c for c in range(128) if table[c] == None])
+    return bytes.maketrans(source, target.encode("ascii")), delete
+
+# This function normalizes the parameter text:
+# Letters are converted to capitals, umlauts and ß are
+# replaced by two letters, blanks and newlines are kept
+# as blanks only if KeepBlanks is set and all other
+# characters are kept only if KeepNonalpha is set.
+# Texts which only contain ASCII characters after the
+# umlauts are replaced are translated as bytes in one pass.
+def NormalizeText(text, KeepBlanks = False, KeepNonalpha = False):
+    if not text.isascii():
+        for c, s in Expansions:
+            if c in text:
+                text = text.replace(c, s)
+        if not text.isascii():
+            return text.translate(GetNormalizationTable(KeepBlanks, KeepNonalpha))
+    table, delete = GetAsciiTable(KeepBlanks, KeepNonalpha)
+    return text.encode("ascii").translate(table, delete).decode("ascii")
+
+# This function normalizes a text given in chunks (e.g. the
+# blocks of a large file) and yields the normalized chunks.
+# As every character is normalized on its own, the chunks
+# may be split anywhere.
+def NormalizeChunks(chunks, KeepBlanks = False, KeepNonalpha = False):
+    for chunk in chunks:
+        yield NormalizeText(chunk, KeepBlanks, KeepNonalpha)
+
+# This function reads a text file in blocks of BlockSize
+# characters and yields the normalized blocks.
+def NormalizeFile(path, KeepBlanks = False, KeepNonalpha = False, BlockSize = 1 << 20):
+    with open(path, mode = "rt", encoding = "utf-8") as TextFile:
+        yield from NormalizeChunks(iter(lambda: TextFile.read(BlockSize), ""),
+                                   KeepBlanks, KeepNonalpha)
+
+# This function checks if c is a capital letter A-Z.
+def IsCapital(c):
+    return (ord(c) <= ord("Z")) and (ord(c) >= ord("A"))
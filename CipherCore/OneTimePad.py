@@ -0,0 +1,232 @@
+# numpy provides the arrays for the crib drag
+# collections provides the ordered dictionary for the
+# cache of the crib drag
+# os and mmap are needed to XOR files with a key file
+# Hex converts between bytes and hexadecimal values
+import numpy as np
+from collections import OrderedDict
+import os
+import mmap
+from CipherCore.Hex import FromHexStr
+
+# The characters which are counted as likely in a guessed
+# plain text besides letters and digits.
+LikelyCharacters = [".", ",", ":", ";", "-", "!", "?", "'", " ", '"']
+
+# This function checks if the received string consists of
+# lines of hexadecimal values between 0 and 255, each line
+# as long as the first one (except for the last line).
+# It returns the values as a list of lines of integers and
+# raises a ValueError with the reason otherwise.
+def CheckHex(ciph):
+    data = FromHexStr(ciph)
+    ciph = ciph.split("\n")
+    lengths = [len(line.split()) for line in ciph]
+    if (len(ciph) < 2) or (lengths[1] < 1):
+        raise ValueError("Text contains only one line.")
+    n = lengths[0]
+    pos = 0
+    for i in range(len(ciph)):
+        if lengths[i] > n:
+            raise ValueError("One line is longer than the first line.")
+        if (lengths[i] < n) and (i < len(ciph)-1):
+            raise ValueError("One line (and not the last one) is shorter than the first.")
+        ciph[i] = list(data[pos : pos + lengths[i]])
+        pos += lengths[i]
+    return ciph
+
+# This function XORs data with key. If the key is shorter
+# than the data, it is reused from its beginning.
+def XorBytes(data, key):
+    if len(key) == 0:
+        raise ValueError("No key entered")
+    if len(key) < len(data):
+        key = bytes(key) * (len(data) // len(key) + 1)
+    return XorBlock(data, key[:len(data)])
+
+# This function XORs two buffers of the same length at
+# once by treating each of them as one big integer.
+def XorBlock(data, key):
+    if len(key) != len(data):
+        raise ValueError("Key file is shorter than the data.")
+    return (int.from_bytes(data, "little") ^ int.from_bytes(key, "little")).to_bytes(len(data), "little")
+
+# This function XORs the file InPath with the key file
+# KeyPath starting at the byte KeyOffset of the key and
+# writes the result into the file OutPath. The data is read
+# in blocks of BlockSize bytes and the key file is mapped
+# into memory, so files of any size can be processed. The
+# key is not reused, so it must be at least as long as the
+# data.
+# It returns the number of bytes written.
+def XorFile(InPath, OutPath, KeyPath, KeyOffset = 0, BlockSize = 1 << 20):
+    with open(InPath, mode = "br") as InFile, open(KeyPath, mode = "br") as KeyFile:
+        length = os.fstat(InFile.fileno()).st_size
+        if os.fstat(KeyFile.fileno()).st_size - KeyOffset < length:
+            raise ValueError("Key file is shorter than the data.")
+        with open(OutPath, mode = "bw") as OutFile:
+            if length == 0:
+                return 0
+            with mmap.mmap(KeyFile.fileno(), 0, access = mmap.ACCESS_READ) as KeyMap:
+                with memoryview(KeyMap) as key:
+                    pos = KeyOffset
+                    while True:
+                        block = InFile.read(BlockSize)
+                        if len(block) == 0:
+                            break
+                        OutFile.write(XorBlock(block, key[pos : pos + len(block)]))
+                        pos += len(block)
+    return pos - KeyOffset
+
+# This function checks if the character is unlikely to
+# occur in a plain text.
+def IsUnlikely(c):
+    return ((c not in LikelyCharacters) and
+            ((ord(c) > ord("Z")) or (ord(c) < ord("A"))) and
+            ((ord(c) > ord("z")) or (ord(c) < ord("a"))) and
+            ((ord(c) > ord("9")) or (ord(c) < ord("0"))))
+
+# This lookup table marks every byte value which is
+# unlikely to occur in a plain text with 1.
+UnlikelyTable = np.array([IsUnlikely(chr(b)) for b in range(256)], dtype = np.uint8)
+
+# This function converts the cipher grid (lines of
+# integers) into a 2-D uint8 array. The last line may be
+# shorter than the others and is padded with zeros.
+# It returns the array and the length of each line.
+def CiphMatrix(CiphGrid):
+    lengths = np.array([len(line) for line in CiphGrid], dtype = np.int64)
+    matrix = np.zeros((len(CiphGrid), max(lengths, default = 0)), dtype = np.uint8)
+    for i in range(len(CiphGrid)):
+        matrix[i, :lengths[i]] = CiphGrid[i]
+    return matrix, lengths
+
+# This function drags the guessed plain text over all
+# lines i and offsets k of the cipher matrix (all lines
+# encrypted with the same key, see CiphMatrix).
+# Assuming the guess is the plain text of line i at
+# offset k, it decrypts all other lines j at the same
+# offset.
+# It returns a list of the count best results [i, k, s, n]
+# (all results if count is None) sorted by the number n
+# of unlikely characters in the decrypted parts s (one
+# line per line j).
+def CribDrag(matrix, lengths, Guess, count = None):
+    return CribDragCache(matrix, lengths, MaxEntries = 1).CribDrag(Guess, count)
+
+# This class drags guesses over a cipher matrix and keeps
+# the counts of unlikely characters of the last guesses.
+# A guess typed character by character only needs the
+# counts of its last character added to those of its
+# prefix, and after a backspace the counts of the prefix
+# are still there. At most MaxEntries guesses are kept,
+# the least recently used one is dropped first.
+class CribDragCache:
+
+    def __init__(self, matrix, lengths, MaxEntries = 64):
+        self.matrix = matrix
+        self.lengths = lengths
+        self.MaxEntries = MaxEntries
+        # Lines as wide as the matrix fit every offset of
+        # a guess, so their counts are kept as a sum. The
+        # counts of shorter lines are kept per line, since
+        # they drop out for the offsets beyond their end.
+        self.full = lengths == matrix.shape[1]
+        self.short = np.flatnonzero(~self.full)
+        self.entries = OrderedDict()
+
+    # This method returns the counts for the guess: the sum
+    # over all full lines j and the counts of each short
+    # line, both for every line i and offset k. It starts
+    # from the longest prefix of the guess in the cache.
+    def Counts(self, Guess):
+        n = len(Guess)
+        while (n > 0) and (Guess[:n] not in self.entries):
+            n -= 1
+        if n > 0:
+            self.entries.move_to_end(Guess[:n])
+            FullCounts, ShortCounts = self.entries[Guess[:n]]
+        else:
+            lines, width = self.matrix.shape
+            FullCounts = np.zeros((lines, width + 1), dtype = np.int32)
+            ShortCounts = np.zeros((lines, len(self.short), width + 1), dtype = np.int32)
+        for l in range(n, len(Guess)):
+            FullCounts, ShortCounts = self.AddCharacter(FullCounts, ShortCounts, Guess[l], l)
+            self.entries[Guess[:l+1]] = (FullCounts, ShortCounts)
+            while len(self.entries) > self.MaxEntries:
+                self.entries.popitem(last = False)
+        return FullCounts, ShortCounts
+
+    # This method adds the unlikely characters decrypted by
+    # the character c at position l of the guess to the
+    # counts of the prefix. Only one column of the matrix
+    # per offset is XORed (in blocks of lines i for many
+    # lines).
+    def AddCharacter(self, FullCounts, ShortCounts, c, l):
+        lines, width = self.matrix.shape
+        offsets = width - l
+        column = self.matrix[:, l : l + offsets]
+        keys = column ^ np.uint8(ord(c))
+        FullCounts = FullCounts[:, :offsets].copy()
+        ShortCounts = ShortCounts[:, :, :offsets].copy()
+        block = max(1, (1 << 24) // max(1, lines * offsets))
+        for first in range(0, lines, block):
+            unlikely = UnlikelyTable[keys[first : first + block, None, :] ^ column[None, :, :]]
+            FullCounts[first : first + block] += unlikely[:, self.full].sum(axis = 1, dtype = np.int32)
+            ShortCounts[first : first + block] += unlikely[:, self.short]
+        # A full line i is not compared with itself.
+        FullCounts[self.full] -= UnlikelyTable[ord(c)]
+        return FullCounts, ShortCounts
+
+    # This method drags the guess like the function
+    # CribDrag.
+    def CribDrag(self, Guess, count = None):
+        if len(Guess) > self.lengths[1]:
+            raise ValueError("Guess must not be longer than assumed key.")
+        for c in Guess:
+            if ord(c) > 255:
+                raise ValueError("Guess must only contain characters from 0 to 255.")
+        if len(Guess) == 0:
+            return []
+        FullCounts, ShortCounts = self.Counts(Guess)
+        lines = len(self.lengths)
+        offsets = FullCounts.shape[1]
+        GuessArray = np.frombuffer(Guess.encode("latin-1"), dtype = np.uint8)
+        # valid[j, k] tells whether the guess fits into
+        # line j at offset k.
+        valid = np.arange(offsets)[None, :] <= (self.lengths - len(Guess))[:, None]
+        unlikely = FullCounts.astype(np.int64)
+        for s in range(len(self.short)):
+            j = self.short[s]
+            counts = ShortCounts[:, s] * valid[j][None, :]
+            counts[j] = 0
+            unlikely += counts
+        # Sorting by n, then i, then k keeps the order of the
+        # results unique.
+        candidates = np.flatnonzero(valid.ravel())
+        order = unlikely.ravel()[candidates] * (lines * offsets) + candidates
+        if (count is not None) and (count < len(order)):
+            best = np.argpartition(order, count)[:count]
+            candidates = candidates[best]
+            order = order[best]
+        candidates = candidates[np.argsort(order)]
+        ResultsList = []
+        for t in candidates:
+            i, k = divmod(int(t), offsets)
+            others = [j for j in range(lines) if (j != i) and valid[j, k]]
+            window = self.matrix[:, k : k + len(Guess)]
+            plain = window[i] ^ GuessArray ^ window[others]
+            s = "".join([line.tobytes().decode("latin-1") + "\n" for line in plain])
+            ResultsList.append([i, k, s, int(unlikely[i, k])])
+        return ResultsList
+
+# This function reveals the plain text of all lines
+# according to the guess at offset k of line i and
+# writes it into PlainGrid (lines of characters).
+def RevealGuess(PlainGrid, CiphGrid, i, k, Guess):
+    for j in range(len(CiphGrid)):
+        for l in range(len(Guess)):
+            if k + l >= len(CiphGrid[j]):
+                break
+            PlainGrid[j][k + l] = chr(ord(Guess[l]) ^ CiphGrid[i][k + l] ^ CiphGrid[j][k + l])
+    return PlainGrid
@@ -0,0 +1,149 @@
+# csv and json write the data of the charts in headless runs
+# functools keeps matplotlib once it is imported
+# os reads the export settings from the environment
+# numpy converts the values of the charts into plain numbers
+import csv
+import functools
+import json
+import os
+import numpy as np
+
+# matplotlib takes a noticeable time and memory to import, so
+# it is only imported when the first chart is shown. If the
+# environment variable CIPHERCORE_PLOT_DIR names a directory,
+# no chart is shown at all; the data of each figure is written
+# into a file named after it instead, as JSON or, if
+# CIPHERCORE_PLOT_FORMAT is "csv", as CSV.
+ExportDirectory = os.environ.get("CIPHERCORE_PLOT_DIR", "")
+ExportFormat = os.environ.get("CIPHERCORE_PLOT_FORMAT", "json").lower()
+
+# This function imports matplotlib.pyplot on its first call
+# and returns it.
+@functools.lru_cache(maxsize = None)
+def Pyplot():
+    import matplotlib.pyplot as plt
+    return plt
+
+# This function checks if matplotlib has been imported and
+# shows at least one figure. It does not import matplotlib.
+def FiguresOpen():
+    return (Pyplot.cache_info().currsize > 0) and (len(Pyplot().get_fignums()) != 0)
+
+# This function closes all figures, if matplotlib has been
+# imported.
+def CloseFigures():
+    if Pyplot.cache_info().currsize > 0:
+        Pyplot().close("all")
+
+# This function writes the data of the charts of a figure into
+# the export directory. The JSON file lists the charts with
+# their labels and values, the CSV file has one row per bar
+# with the number of the chart, its label and its value.
+def ExportBars(name, charts):
+    os.makedirs(ExportDirectory, exist_ok = True)
+    data = [{"labels": [str(label) for label in labels], "values": np.asarray(values).tolist()}
+            for labels, values, colors in charts]
+    if ExportFormat == "csv":
+        with open(os.path.join(ExportDirectory, name + ".csv"), mode = "wt", encoding = "utf-8", newline = "") as CsvFile:
+            writer = csv.writer(CsvFile)
+            writer.writerow(["chart", "label", "value"])
+            for i, chart in enumerate(data):
+                for label, value in zip(chart["labels"], chart["values"]):
+                    writer.writerow([i + 1, label, value])
+    else:
+        with open(os.path.join(ExportDirectory, name + ".json"), mode = "wt", encoding = "utf-8") as JsonFile:
+            json.dump({"figure": name, "charts": data}, JsonFile)
+
+# This class keeps a figure of bar charts, so new values
+# only change the heights of its bars instead of creating new
+# ones. The bars are animated, i.e. left out when the figure
+# is drawn; after each drawing the empty axes are copied and
+# the bars are drawn onto them (blitting). An update which
+# keeps the labels and roughly the range of the values then
+# only restores the copies and draws the bars again.
+class BarFigure:
+
+    def __init__(self, name, charts):
+        self.figure = Pyplot().figure(name)
+        self.figure.clf()
+        self.axes = list(self.figure.subplots(len(charts), 1, squeeze = False)[:, 0])
+        self.bars = []
+        self.labels = []
+        for axes, (labels, values, colors) in zip(self.axes, charts):
+            self.bars.append(axes.bar([j for j in range(len(values))], values,
+                                      tick_label = labels, color = colors, animated = True))
+            self.labels.append([str(label) for label in labels])
+        self.backgrounds = None
+        self.connection = self.figure.canvas.mpl_connect("draw_event", self.Drawn)
+
+    # This method disconnects the figure from its drawings, so
+    # a new BarFigure can reuse the figure of the same name
+    # without the handlers of the old bars being called.
+    def Disconnect(self):
+        self.figure.canvas.mpl_disconnect(self.connection)
+
+    # This method is called after the figure has been drawn.
+    # It copies the empty axes and draws the bars onto them.
+    def Drawn(self, event):
+        self.backgrounds = [self.figure.canvas.copy_from_bbox(axes.bbox) for axes in self.axes]
+        self.Blit()
+
+    # This method draws the bars onto the copies of the axes.
+    def Blit(self):
+        canvas = self.figure.canvas
+        for axes, bars, background in zip(self.axes, self.bars, self.backgrounds):
+            canvas.restore_region(background)
+            for bar in bars:
+                axes.draw_artist(bar)
+            canvas.blit(axes.bbox)
+
+    # This method checks if the figure is still open and has
+    # the same number of charts and bars as the given charts.
+    def Fits(self, charts):
+        return (Pyplot().fignum_exists(self.figure.number) and (len(charts) == len(self.bars)) and
+                all(len(values) == len(bars) for (labels, values, colors), bars in zip(charts, self.bars)))
+
+    # This method sets the heights (and colors) of the bars.
+    # The figure is only drawn anew if the labels change or the
+    # highest value leaves the upper half of the axes.
+    def Update(self, charts):
+        redraw = self.backgrounds is None
+        for i, (labels, values, colors) in enumerate(charts):
+            for j, bar in enumerate(self.bars[i]):
+                bar.set_height(values[j])
+                if colors is not None:
+                    bar.set_color(colors[j])
+            labels = [str(label) for label in labels]
+            if labels != self.labels[i]:
+                self.axes[i].set_xticks([j for j in range(len(labels))], labels)
+                self.labels[i] = labels
+                redraw = True
+            top = max(values, default = 0)
+            if (top > self.axes[i].get_ylim()[1]) or (top < self.axes[i].get_ylim()[1] / 2):
+                self.axes[i].set_ylim(0, 1.05 * top if top > 0 else 1)
+                redraw = True
+        if redraw:
+            self.figure.canvas.draw_idle()
+        else:
+            self.Blit()
+
+# The figures of bar charts shown so far, by their names.
+BarFigures = {}
+
+# This function shows the bar charts in the figure with the
+# given name, one below the other. Each chart is a tuple
+# (labels, values, colors), the colors may be None. If the
+# figure already shows charts with the same numbers of bars,
+# only their heights are updated.
+# In headless runs the data is exported instead.
+def ShowBars(name, charts):
+    if ExportDirectory != "":
+        ExportBars(name, charts)
+        return
+    if (name in BarFigures) and BarFigures[name].Fits(charts):
+        BarFigures[name].Update(charts)
+        return
+    if name in BarFigures:
+        BarFigures[name].Disconnect()
+    BarFigures[name] = BarFigure(name, charts)
+    Pyplot().show()
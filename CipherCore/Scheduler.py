@@ -0,0 +1,80 @@
+# concurrent.futures provides the worker thread
+import concurrent.futures
+
+# This class lets the Tk scripts run their computations
+# without freezing the window. It only needs the after and
+# after_cancel methods of the root window, so it does not
+# depend on tkinter itself.
+# Every task has a name (e.g. "method" for the cipher method
+# of a script). Debounce runs a callback on the main thread
+# once the events of a task stopped for delay milliseconds,
+# Run computes in the worker thread and hands the result back
+# to the main thread. A newer call of the same task
+# supersedes the older ones: pending callbacks and
+# computations are cancelled and results of computations
+# already running are dropped.
+class Scheduler:
+
+    def __init__(self, root, delay = 150, PollInterval = 20, workers = 1):
+        self.root = root
+        self.delay = delay
+        self.PollInterval = PollInterval
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = workers)
+        self.generations = {}
+        self.pending = {}
+
+    # This method increases the generation of the task, so
+    # all earlier calls of it are superseded, and cancels its
+    # pending callback.
+    # It returns the new generation.
+    def Supersede(self, name):
+        self.generations[name] = self.generations.get(name, 0) + 1
+        if name in self.pending:
+            self.root.after_cancel(self.pending.pop(name))
+        return self.generations[name]
+
+    # This method calls the callback on the main thread after
+    # delay milliseconds (by default the delay of the
+    # scheduler), unless the task is debounced or run again in
+    # the meantime.
+    def Debounce(self, name, callback, delay = None):
+        generation = self.Supersede(name)
+
+        def Fire():
+            if self.generations[name] == generation:
+                del self.pending[name]
+                callback()
+
+        self.pending[name] = self.root.after(self.delay if delay is None else delay, Fire)
+
+    # This method calls compute in the worker thread and
+    # afterwards show with its result on the main thread.
+    # If compute raises an exception, fail (if given) is
+    # called with it instead. compute must not use any
+    # widgets, since Tk may only be used by the main thread.
+    def Run(self, name, compute, show, fail = None):
+        generation = self.Supersede(name)
+        future = self.executor.submit(compute)
+
+        def Poll():
+            if self.generations[name] != generation:
+                future.cancel()
+                return
+            if not future.done():
+                self.root.after(self.PollInterval, Poll)
+                return
+            try:
+                result = future.result()
+            except Exception as e:
+                if fail is None:
+                    raise
+                fail(e)
+            else:
+                show(result)
+
+        Poll()
+
+    # This method stops the worker thread after the running
+    # computation.
+    def Close(self):
+        self.executor.shutdown(wait = False, cancel_futures = True)
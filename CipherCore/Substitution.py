@@ -0,0 +1,131 @@
+# functools keeps the translation tables of the keys
+# numpy provides the scoring of all swaps of key letters at
+# once
+# NGrams provides the n-gram statistics scoring the
+# candidate plain texts
+import functools
+import numpy as np
+from CipherCore import NGrams
+
+# The keys used by this module are strings (or lists) of
+# 26 characters: the n-th character replaces the n-th
+# letter of the alphabet.
+
+# This function returns the key of the Caesar cipher whose
+# first letter (the substitute of A) is given.
+def CaesarKey(first = "a"):
+    shift = ord(first.lower()) - ord("a")
+    return "".join([chr(ord("a") + (i + shift) % 26) for i in range(26)])
+
+# This function returns the key of the Atbash cipher.
+def AtbashKey():
+    return "".join([chr(ord("Z") - i) for i in range(26)])
+
+# This function returns the key which leaves every letter
+# unchanged.
+def IdentityKey():
+    return "".join([chr(ord("A") + i) for i in range(26)])
+
+# This function returns the translation table of the key for
+# str.translate, which maps the capitals A-Z to the letters
+# of the key and leaves all other characters unchanged. The
+# key is given as a tuple of its letters, and the tables of
+# the last keys are kept, so a key is only compiled once.
+@functools.lru_cache(maxsize = 64)
+def SubstitutionTable(key):
+    if len(key) != 26:
+        raise ValueError("The key must contain 26 letters.")
+    return str.maketrans({chr(ord("A") + i): key[i] for i in range(26)})
+
+# This function applies the substitution key to the text.
+# Only capitals A-Z are substituted, all other characters
+# are copied. The same function en- and decrypts, as the
+# decryption just uses the inverse key.
+def Substitute(text, key):
+    return text.translate(SubstitutionTable(tuple(key)))
+
+# This function returns the key which undoes the given key,
+# both in capitals.
+def InverseKey(key):
+    key = "".join(key).upper()
+    if sorted(key) != [chr(ord("A") + i) for i in range(26)]:
+        raise ValueError("The key must contain every letter once.")
+    inverse = ["" for i in range(26)]
+    for i in range(26):
+        inverse[ord(key[i]) - ord("A")] = chr(ord("A") + i)
+    return "".join(inverse)
+
+# The solver below climbs from key to key by swapping two
+# plain letters of the key. The cipher text is reduced to its
+# different n-grams and their counts. For every swap, the
+# n-grams containing one of the two cipher letters are listed
+# once together with the n-gram obtained by exchanging the
+# two letters, so a swap is rescored by these n-grams only.
+class SwapTable:
+
+    def __init__(self, ciph, StringLength):
+        symbols = NGrams.SymbolNumbers(ciph)
+        ids, self.counts = np.unique(NGrams.NGramIds(symbols, StringLength), return_counts = True)
+        self.powers = NGrams.Symbols ** np.arange(StringLength - 1, -1, -1)
+        self.grams = ids[:, None] // self.powers % NGrams.Symbols
+        self.swaps = [(a, b) for a in range(26) for b in range(a + 1, 26)]
+        grams, swapped, segments = [], [], []
+        for s in range(len(self.swaps)):
+            a, b = self.swaps[s]
+            affected = np.flatnonzero(((self.grams == a) | (self.grams == b)).any(axis = 1))
+            g = self.grams[affected]
+            grams.append(affected)
+            swapped.append(np.where(g == a, b, np.where(g == b, a, g)))
+            segments.append(np.full(len(affected), s))
+        self.affected = np.concatenate(grams + [np.zeros(0, dtype = np.int64)])
+        self.swapped = np.concatenate(swapped + [np.zeros((0, StringLength), dtype = np.int64)])
+        self.segments = np.concatenate(segments + [np.zeros(0, dtype = np.int64)])
+
+    # This method returns the score of every n-gram of the
+    # cipher text decrypted by the key (an array mapping the
+    # cipher letters 0-25 and the separator 26 to plain
+    # letters), weighted by its count.
+    def Scores(self, table, key):
+        return self.counts * table[(key[self.grams] * self.powers).sum(axis = 1)]
+
+    # This method returns for every swap how much the score of
+    # the decrypted text changes if the plain letters of the
+    # two cipher letters are exchanged in the key.
+    def Deltas(self, table, key, scores):
+        swapped = self.counts[self.affected] * table[(key[self.swapped] * self.powers).sum(axis = 1)]
+        return np.bincount(self.segments, weights = swapped - scores[self.affected], minlength = len(self.swaps))
+
+# This function searches the key of a monoalphabetic
+# substitution by hill climbing: starting from the key which
+# matches the letter frequencies of the cipher text and the
+# n-gram table, the swap of two key letters improving the
+# score most is applied until no swap improves it. Then the
+# best key found so far is disturbed by a few random swaps and
+# the climbing is repeated restarts times.
+# It returns the decryption key (the lowercase plain letter of
+# every cipher letter A-Z) and its score.
+def CrackSubstitution(ciph, table, restarts = 30, StringLength = 4, seed = 0):
+    swaps = SwapTable(ciph, StringLength)
+    random = np.random.default_rng(seed)
+    CiphOrder = np.argsort(-np.bincount(NGrams.SymbolNumbers(ciph), minlength = NGrams.Symbols)[:26], kind = "stable")
+    marginal = (10.0 ** table.reshape(NGrams.Symbols, -1)).sum(axis = 1)[:26]
+    key = np.append(np.zeros(26, dtype = np.int64), NGrams.Separator)
+    key[CiphOrder] = np.argsort(-marginal, kind = "stable")
+    BestKey, BestScore = key, None
+    for attempt in range(restarts + 1):
+        scores = swaps.Scores(table, key)
+        while True:
+            deltas = swaps.Deltas(table, key, scores)
+            s = np.argmax(deltas)
+            if deltas[s] <= 1e-9:
+                break
+            a, b = swaps.swaps[s]
+            key = key.copy()
+            key[a], key[b] = key[b], key[a]
+            scores = swaps.Scores(table, key)
+        if (BestScore is None) or (scores.sum() > BestScore):
+            BestKey, BestScore = key, scores.sum()
+        key = BestKey.copy()
+        for a, b in random.integers(0, 26, size = (3, 2)):
+            key[a], key[b] = key[b], key[a]
+    return "".join([chr(ord("a") + k) for k in BestKey[:26]]), float(BestScore)
@@ -0,0 +1,143 @@
+# This class shows a possibly huge text in a Tk text field.
+# The whole text is kept in a Python string, the text field
+# only holds a window of at most about WindowSize characters
+# of it, since Tk needs seconds to lay out megabytes of text.
+# The window moves when the user scrolls beyond its ends.
+# Set only replaces the part of the text field which differs
+# from the text shown before, so e.g. a changed key which
+# alters the end of a text does not rewrite its beginning.
+# Edits of the user in the text field are copied back into
+# the string by Get. Every change of the text increases its
+# version, so results computed from it can be kept until it
+# changes. Like the scheduler, the class only uses
+# the methods of the text field and not tkinter itself.
+class TextView:
+
+    def __init__(self, widget, WindowSize = 100000):
+        self.widget = widget
+        self.WindowSize = WindowSize
+        self.text = widget.get("1.0", "end")[:-1]
+        # The text field shows self.text[self.start : self.end].
+        self.start = 0
+        self.end = len(self.text)
+        self.version = 0
+        widget.edit_modified(False)
+        for sequence in ["<MouseWheel>", "<Button-4>", "<Button-5>", "<Prior>", "<Next>"]:
+            widget.bind(sequence, self.Scroll, add = "+")
+
+    # This method returns the index of the text field at which
+    # the character number offset of the window is shown.
+    @staticmethod
+    def Index(offset):
+        return "1.0 + " + str(offset) + " chars"
+
+    # This method copies the window of the text field back into
+    # the string, if the user has edited it.
+    def Sync(self):
+        if self.widget.edit_modified():
+            shown = self.widget.get("1.0", "end")[:-1]
+            self.text = self.text[:self.start] + shown + self.text[self.end:]
+            self.end = self.start + len(shown)
+            self.version += 1
+            self.widget.edit_modified(False)
+
+    # This method returns the whole text.
+    def Get(self):
+        self.Sync()
+        return self.text
+
+    # This method returns the version of the text.
+    def Version(self):
+        self.Sync()
+        return self.version
+
+    # This method shows the window of the text beginning about
+    # at the character number start. The window is extended to
+    # whole lines unless they are very long.
+    def ShowWindow(self, start):
+        start = max(0, min(start, len(self.text) - self.WindowSize))
+        LineStart = self.text.rfind("\n", max(0, start - 1000), start)
+        if (start > 0) and (LineStart >= 0):
+            start = LineStart + 1
+        end = min(len(self.text), start + self.WindowSize)
+        LineEnd = self.text.find("\n", end, end + 1000)
+        if LineEnd >= 0:
+            end = LineEnd
+        self.start, self.end = start, end
+        self.widget.delete("1.0", "end")
+        self.widget.insert("1.0", self.text[start:end])
+        self.widget.edit_modified(False)
+
+    # This method replaces the text. If the change lies within
+    # the window, only the changed characters of the text field
+    # are replaced. A change before the window only shifts its
+    # position, a change behind a full window does not touch
+    # the text field at all. Otherwise the window is shown anew
+    # at the same position.
+    def Set(self, text):
+        self.Sync()
+        old = self.text
+        prefix = CommonPrefix(old, text)
+        suffix = CommonSuffix(old, text, prefix)
+        ChangeEnd = len(old) - suffix
+        delta = len(text) - len(old)
+        self.text = text
+        if (prefix == len(old)) and (delta == 0):
+            return
+        self.version += 1
+        if (prefix >= self.start) and (ChangeEnd <= self.end) and (self.end + delta - self.start <= 2 * self.WindowSize):
+            self.widget.delete(self.Index(prefix - self.start), self.Index(ChangeEnd - self.start))
+            self.widget.insert(self.Index(prefix - self.start), text[prefix : len(text) - suffix])
+            self.end += delta
+            self.widget.edit_modified(False)
+        elif (ChangeEnd <= self.start) and (self.start > 0):
+            self.start += delta
+            self.end += delta
+        elif (prefix < self.end) or (self.end - self.start < self.WindowSize):
+            self.ShowWindow(self.start)
+
+    # This method is bound to the mouse wheel and the page keys
+    # of the text field. If the user scrolls beyond the first
+    # or last line of the window, the window moves by half its
+    # size, so the line at its old end stays visible.
+    def Scroll(self, event):
+        up = (getattr(event, "num", 0) == 4) or (getattr(event, "delta", 0) > 0) or (getattr(event, "keysym", "") == "Prior")
+        top, bottom = self.widget.yview()
+        if up and (top <= 0) and (self.start > 0):
+            self.Sync()
+            OldStart = self.start
+            self.ShowWindow(self.start - self.WindowSize // 2)
+            self.widget.see(self.Index(OldStart - self.start))
+            return "break"
+        if (not up) and (bottom >= 1) and (self.end < len(self.text)):
+            self.Sync()
+            OldEnd = self.end
+            self.ShowWindow(self.end - self.WindowSize // 2)
+            self.widget.see(self.Index(OldEnd - self.start))
+            return "break"
+
+# This function returns the length of the common beginning of
+# the strings a and b. The slices are compared by halves, so
+# the comparison runs in C instead of character by character.
+def CommonPrefix(a, b):
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+# This function returns the length of the common end of the
+# strings a and b, which does not overlap their common
+# beginning of the length prefix.
+def CommonSuffix(a, b, prefix = 0):
+    low, high = 0, min(len(a), len(b)) - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle : len(a) - low] == b[len(b) - middle : len(b) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
@@ -0,0 +1,492 @@
+# numpy provides the index arrays of the permutations
+# collections provides the ordered dictionary for the
+# cache of the permutations
+import numpy as np
+from collections import OrderedDict
+
+# This function returns the rank of each letter of the key
+# in alphabetical order. Repeated letters are ranked from
+# left to right, e.g. "KEYE" yields [2, 0, 3, 1].
+def KeyRanks(key):
+    order = KeyOrder(key)
+    ranks = [0 for i in range(len(key))]
+    for r in range(len(order)):
+        ranks[order[r]] = r
+    return ranks
+
+# This function returns the positions of the letters of
+# the key in alphabetical order, i.e. the order in which
+# the columns are read, e.g. "KEYE" yields [1, 3, 0, 2].
+def KeyOrder(key):
+    return sorted(range(len(key)), key = lambda i: key[i])
+
+# This function returns the rank of each letter of the key
+# in alphabetical order, where repeated letters share their
+# rank (as for the Myszkowski transposition), e.g. "KEYE"
+# yields [1, 0, 2, 0].
+def DenseKeyRanks(key):
+    letters = sorted(set(key))
+    return [letters.index(c) for c in key]
+
+# This function encrypts (and decrypts) the text by use of
+# the reverse cipher.
+def ReverseCipher(text):
+    return text[::-1]
+
+# Every other transposition is a permutation of the
+# positions of the text, which only depends on the method,
+# the key and the length of the text. Each method only
+# describes this permutation by a plan builder, which
+# returns two index arrays: the cipher text is the plain
+# text followed by a blank (for the blanks some methods
+# insert) taken at the indexes of the first one, the plain
+# text is the cipher text taken at the indexes of the
+# second one. Transpose and Untranspose apply the plans in
+# one step each.
+
+# This function turns the sort keys of the positions of the
+# plain text into a plan: the cipher text contains the
+# letters ordered by their sort keys.
+def OrderPlan(SortKeys):
+    forward = np.argsort(SortKeys, kind = "stable")
+    inverse = np.empty_like(forward)
+    inverse[forward] = np.arange(len(forward))
+    return forward, inverse
+
+# This function returns for every cell of a grid with
+# the given number of cells, filled row by row with rows as
+# long as the key, its position in the text obtained by
+# reading the columns in the alphabetical order of the key.
+def ColumnPositions(cells, key):
+    cell = np.arange(cells)
+    column = cell % len(key)
+    lengths = np.bincount(column, minlength = len(key))
+    order = KeyOrder(key)
+    start = np.zeros(len(key), dtype = np.int64)
+    start[order] = np.cumsum(lengths[order]) - lengths[order]
+    return start[column] + cell // len(key)
+
+# This function turns the cells of a grid which are blanks
+# (True) or carry the next letter (False) into the plan of
+# the grid filled row by row and read column by column in
+# the alphabetical order of the key.
+def BlankGridPlan(blanks, key):
+    positions = ColumnPositions(len(blanks), key)
+    letters = np.count_nonzero(~blanks)
+    forward = np.empty(len(blanks), dtype = np.int64)
+    forward[positions] = np.where(blanks, letters, np.cumsum(~blanks) - 1)
+    return forward, positions[~blanks]
+
+# This function computes the plan of the skytale with the
+# given diameter (the number of letters of one wrapping):
+# the plain text is written in rows along the rod, i.e. in
+# a grid of diameter rows, and the strip is read column by
+# column.
+def SkytalePlan(diameter, length):
+    width = -(-length // diameter)
+    position = np.arange(length)
+    return OrderPlan((position % width) * length + position)
+
+# This function returns the line of the zig-zag pattern of
+# the rail fence for every position of a text of the given
+# length.
+def RailIndexes(length, lines):
+    cycle = 2 * (lines - 1)
+    phase = np.arange(length) % cycle
+    return np.minimum(phase, cycle - phase)
+
+# This function computes the plan of the rail fence: the
+# lines of the zig-zag pattern are read from top to bottom.
+def RailFencePlan(lines, length):
+    return OrderPlan(RailIndexes(length, lines) * length + np.arange(length))
+
+# This function computes the plan of the redefence cipher:
+# the zig-zag pattern has as many lines as the key has
+# letters and the lines are read in the alphabetical order
+# of the key.
+def RedefencePlan(key, length):
+    ranks = np.array(KeyRanks(key))
+    return OrderPlan(ranks[RailIndexes(length, len(key))] * length + np.arange(length))
+
+# This function computes the plan of the rotation cipher:
+# the plain text is written in blocks of BlockSize rows of
+# BlockSize letters each, every block is rotated clockwise
+# by the angle (90 or 270 degrees) and read row by row.
+# Cells missing in the last block are skipped.
+def RotationPlan(key, length):
+    BlockSize, angle = key
+    position = np.arange(length)
+    block = position // (BlockSize * BlockSize)
+    row = (position % (BlockSize * BlockSize)) // BlockSize
+    column = position % BlockSize
+    if angle == 90:
+        SortKeys = column * BlockSize + (BlockSize - 1 - row)
+    else:
+        SortKeys = (BlockSize - 1 - column) * BlockSize + row
+    return OrderPlan(block * BlockSize * BlockSize + SortKeys)
+
+# This function computes the plan of the columnar
+# transposition with one or two keys (double columnar
+# transposition): the text is written in rows as long as
+# the key and the columns are read in the alphabetical
+# order of the key. With Myszkowski, the columns of repeated
+# letters are read together row by row.
+def ColumnarPlan(key, length):
+    keys, Myszkowski = key
+    position = np.arange(length)
+    forward = position
+    for k in keys:
+        ranks = np.array(DenseKeyRanks(k) if Myszkowski else KeyRanks(k))
+        forward = forward[OrderPlan(ranks[position % len(k)] * length + position)[0]]
+    inverse = np.empty_like(forward)
+    inverse[forward] = position
+    return forward, inverse
+
+# This function returns for every cell of the grid of the
+# disrupted columnar transposition with the comb approach
+# whether it is a blank (True) or carries a letter (False):
+# the first row is filled until the column of the first
+# letter of the key in alphabetical order, the next row
+# until the column of the second letter and so on. The last
+# row ends with the last letter.
+# The grid is given either by the number of letters of the
+# plain text or by the number of cells, i.e. the length of
+# the cipher text.
+def DisrColTransBlanks(key, letters = None, cells = None):
+    period = []
+    for column in KeyOrder(key):
+        period += [False] * (column + 1) + [True] * (len(key) - column - 1)
+    period = np.array(period)
+    if cells is not None:
+        blanks = np.resize(period, cells)
+        if (cells > 0) and blanks[-1]:
+            raise ValueError("Length of the ciphertext does not fit the key")
+        return blanks
+    if letters == 0:
+        return np.zeros(0, dtype = bool)
+    pattern = np.resize(period, (letters // np.count_nonzero(~period) + 1) * len(period))
+    return pattern[:np.flatnonzero(~pattern)[letters - 1] + 1]
+
+# This function returns for every cell of the grid of the
+# disrupted columnar transposition with numerical sequence
+# approach whether it is a blank (True) or carries a letter
+# (False). The rank of each letter of the disruption key
+# yields after how many letters a blank is inserted, the
+# disruption key is repeated as often as necessary. After
+# the last letter a final blank is inserted.
+# The grid is given either by the number of letters of the
+# plain text or by the number of cells, i.e. the length of
+# the cipher text.
+def DisrColTrans2Blanks(DisruptionKey, letters = None, cells = None):
+    period = []
+    for rank in KeyRanks(DisruptionKey):
+        period += [False] * rank + [True]
+    period = np.array(period)
+    if cells is not None:
+        if cells == 0:
+            return np.zeros(0, dtype = bool)
+        return np.append(np.resize(period, cells - 1), True)
+    if letters == 0:
+        return np.zeros(0, dtype = bool)
+    pattern = np.resize(period, (letters // np.count_nonzero(~period) + 1) * len(period))
+    last = np.flatnonzero(~pattern)[letters - 1]
+    return np.append(pattern[:last + 1], True)
+
+# This function computes the plan of the disrupted columnar
+# transposition with numerical sequence approach for a
+# plain text of length letters or, if FromCipher is set,
+# for a cipher text of length letters.
+def DisrColTrans2Plan(key, DisruptionKey, length, FromCipher = False):
+    if FromCipher:
+        return BlankGridPlan(DisrColTrans2Blanks(DisruptionKey, cells = length), key)
+    return BlankGridPlan(DisrColTrans2Blanks(DisruptionKey, letters = length), key)
+
+# This dictionary lists the plan builder of every method,
+# which computes the plan from the key and the length of
+# the plain text. Methods inserting blanks have a second
+# builder (name + "Cipher") taking the length of the
+# cipher text.
+PlanBuilders = {
+    "Skytale": SkytalePlan,
+    "RailFence": RailFencePlan,
+    "Redefence": RedefencePlan,
+    "Rotation": RotationPlan,
+    "Columnar": ColumnarPlan,
+    "DisrColTrans": lambda key, length: BlankGridPlan(DisrColTransBlanks(key, letters = length), key),
+    "DisrColTransCipher": lambda key, length: BlankGridPlan(DisrColTransBlanks(key, cells = length), key),
+    "DisrColTrans2": lambda key, length: DisrColTrans2Plan(key[0], key[1], length),
+    "DisrColTrans2Cipher": lambda key, length: DisrColTrans2Plan(key[0], key[1], length, FromCipher = True),
+}
+
+# This class keeps the permutations of the last texts, so a
+# text of the same length encrypted or decrypted with the
+# same key only needs the gather. At most MaxPlans
+# permutations with at most MaxBytes bytes of index arrays
+# are kept, the least recently used one is dropped first.
+class PlanCache:
+
+    def __init__(self, MaxPlans = 256, MaxBytes = 1 << 28):
+        self.MaxPlans = MaxPlans
+        self.MaxBytes = MaxBytes
+        self.size = 0
+        self.entries = OrderedDict()
+
+    # This method returns the index arrays of the method for
+    # the key (a string, number or tuple) and the length of
+    # the text. The arrays are read-only, as they are shared
+    # by all callers.
+    def Get(self, method, key, length):
+        entry = (method, key, length)
+        if entry in self.entries:
+            self.entries.move_to_end(entry)
+            return self.entries[entry]
+        plan = PlanBuilders[method](key, length)
+        for index in plan:
+            index.flags.writeable = False
+        self.entries[entry] = plan
+        self.size += sum([index.nbytes for index in plan])
+        while (len(self.entries) > self.MaxPlans) or ((self.size > self.MaxBytes) and (len(self.entries) > 1)):
+            dropped = self.entries.popitem(last = False)[1]
+            self.size -= sum([index.nbytes for index in dropped])
+        return plan
+
+    # This method drops all permutations.
+    def Clear(self):
+        self.entries.clear()
+        self.size = 0
+
+# The cache used by all transposition functions.
+Plans = PlanCache()
+
+# This function returns the characters of the text at the
+# positions of the index array in one step.
+def ApplyPermutation(text, index):
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype = np.uint32)
+    return codes[index].tobytes().decode("utf-32-le")
+
+# This function encrypts the plain text by the method with
+# the key, using the plan from the cache.
+def Transpose(method, key, plain):
+    if plain == "":
+        return ""
+    forward, inverse = Plans.Get(method, key, len(plain))
+    return ApplyPermutation(plain + " ", forward)
+
+# This function decrypts the cipher text by the method with
+# the key, using the plan from the cache.
+def Untranspose(method, key, cipher):
+    if cipher == "":
+        return ""
+    if method + "Cipher" in PlanBuilders:
+        method += "Cipher"
+    forward, inverse = Plans.Get(method, key, len(cipher))
+    return ApplyPermutation(cipher, inverse)
+
+# This function checks the number of a method (diameter,
+# number of lines or block size), which must be at least
+# minimum.
+def CheckNumber(number, minimum, name):
+    if number < minimum:
+        raise ValueError(name + " must be at least " + str(minimum))
+
+# These functions en- and decrypt by use of the skytale.
+def SkytaleEncrypt(plain, diameter):
+    CheckNumber(diameter, 1, "Diameter")
+    return Transpose("Skytale", diameter, plain)
+
+def SkytaleDecrypt(cipher, diameter):
+    CheckNumber(diameter, 1, "Diameter")
+    return Untranspose("Skytale", diameter, cipher)
+
+# These functions en- and decrypt by use of the rail fence
+# with the given number of lines.
+def RailFenceEncrypt(plain, lines):
+    CheckNumber(lines, 2, "Number of lines")
+    return Transpose("RailFence", lines, plain)
+
+def RailFenceDecrypt(cipher, lines):
+    CheckNumber(lines, 2, "Number of lines")
+    return Untranspose("RailFence", lines, cipher)
+
+# These functions en- and decrypt by use of the redefence
+# cipher.
+def RedefenceEncrypt(plain, key):
+    CheckNumber(len(key), 2, "Number of key letters")
+    return Transpose("Redefence", key, plain)
+
+def RedefenceDecrypt(cipher, key):
+    CheckNumber(len(key), 2, "Number of key letters")
+    return Untranspose("Redefence", key, cipher)
+
+# This function checks the settings of the rotation cipher.
+def CheckRotation(BlockSize, angle):
+    CheckNumber(BlockSize, 1, "Block size")
+    if angle not in [90, 270]:
+        raise ValueError("Angle of rotation must be 90° or 270°")
+
+# These functions en- and decrypt by use of the rotation
+# cipher.
+def RotationEncrypt(plain, BlockSize, angle):
+    CheckRotation(BlockSize, angle)
+    return Transpose("Rotation", (BlockSize, angle), plain)
+
+def RotationDecrypt(cipher, BlockSize, angle):
+    CheckRotation(BlockSize, angle)
+    return Untranspose("Rotation", (BlockSize, angle), cipher)
+
+# This function checks the keys of the columnar
+# transposition.
+def CheckColTransKeys(keys):
+    if (len(keys) == 0) or (min([len(k) for k in keys]) == 0):
+        raise ValueError("No key entered")
+
+# These functions en- and decrypt by use of the columnar
+# transposition with one key or, for the double columnar
+# transposition, two keys.
+def ColTransEncrypt(plain, keys, Myszkowski = False):
+    CheckColTransKeys(keys)
+    return Transpose("Columnar", (tuple(keys), Myszkowski), plain)
+
+def ColTransDecrypt(cipher, keys, Myszkowski = False):
+    CheckColTransKeys(keys)
+    return Untranspose("Columnar", (tuple(keys), Myszkowski), cipher)
+
+# These functions en- and decrypt by use of the disrupted
+# columnar transposition with the comb approach. Its grid
+# contains blanks, which are part of the cipher text.
+def DisrColTransEncrypt(plain, key):
+    CheckColTransKeys([key])
+    return Transpose("DisrColTrans", key, plain)
+
+def DisrColTransDecrypt(cipher, key):
+    CheckColTransKeys([key])
+    return Untranspose("DisrColTrans", key, cipher)
+
+# This function checks the keys of the disrupted columnar
+# transposition with numerical sequence approach.
+def CheckDisrColTrans2Keys(key, DisruptionKey):
+    if len(key) == 0:
+        raise ValueError("No key entered")
+    if len(DisruptionKey) < 2:
+        raise ValueError("Disruption key needs at least two letters")
+
+# This function arranges the plain text in the grid of the
+# disrupted columnar transposition with numerical sequence
+# approach. The grid is filled row by row, every row is as
+# long as the key, and a blank is inserted according to
+# the disruption key. After the last letter a final blank
+# is inserted.
+# It returns the columns of the grid as lists.
+def DisrColTrans2Columns(plain, key, DisruptionKey):
+    return CipherColumns(DisrColTrans2Encrypt(plain, key, DisruptionKey), key)
+
+# This function encrypts the plain text by use of the
+# disrupted columnar transposition cipher with numerical
+# sequence approach: the columns of the grid are read in
+# the alphabetical order of the key.
+def DisrColTrans2Encrypt(plain, key, DisruptionKey):
+    CheckDisrColTrans2Keys(key, DisruptionKey)
+    return Transpose("DisrColTrans2", (key, DisruptionKey), plain)
+
+# This function decrypts the cipher text of the disrupted
+# columnar transposition cipher with numerical sequence
+# approach. The cipher text determines which cells of the
+# grid are blanks and thereby the permutation, which is
+# undone in one step.
+# It returns the plain text and the columns of the grid.
+def DisrColTrans2Decrypt(cipher, key, DisruptionKey):
+    CheckDisrColTrans2Keys(key, DisruptionKey)
+    return Untranspose("DisrColTrans2", (key, DisruptionKey), cipher), CipherColumns(cipher, key)
+
+# The fixed substitution table of the ADFGVX cipher: the
+# character in row r and column c is substituted by the
+# r-th and the c-th letter of ADFGVX.
+ADFGVXLetters = "ADFGVX"
+ADFGVXSquare = "NA1C3H8TB2OME5WRPD4F6G7I9J0KLQSUVXYZ"
+
+# This function substitutes every letter and digit of the
+# text by its two letters of the ADFGVX table. All other
+# characters are dropped.
+def ADFGVXSubstitute(text):
+    pairs = {}
+    for i in range(len(ADFGVXSquare)):
+        pairs[ADFGVXSquare[i]] = ADFGVXLetters[i // 6] + ADFGVXLetters[i % 6]
+    return "".join([pairs.get(c, "") for c in text.upper()])
+
+# This function encrypts the plain text by use of the
+# ADFGVX cipher: the letters and digits are substituted by
+# the fixed table, then the columnar transposition with the
+# key is applied.
+def ADFGVXEncrypt(plain, key):
+    CheckColTransKeys([key])
+    return ColTransEncrypt(ADFGVXSubstitute(plain), [key])
+
+# This function decrypts the cipher text of the ADFGVX
+# cipher. All characters other than ADFGVX are ignored.
+def ADFGVXDecrypt(cipher, key):
+    CheckColTransKeys([key])
+    cipher = "".join([c for c in cipher if c in ADFGVXLetters])
+    if len(cipher) % 2 != 0:
+        raise ValueError("Ciphertext must contain an even number of letters ADFGVX")
+    substituted = ColTransDecrypt(cipher, [key])
+    return "".join([ADFGVXSquare[6 * ADFGVXLetters.index(substituted[i]) + ADFGVXLetters.index(substituted[i + 1])]
+                    for i in range(0, len(substituted), 2)])
+
+# This function splits the cipher text into the columns of
+# the grid, which were read in the alphabetical order of
+# the key.
+# It returns the columns in the order of the key as lists.
+def CipherColumns(cipher, key):
+    lengths = [len(range(c, len(cipher), len(key))) for c in range(len(key))]
+    columns = [[] for i in range(len(key))]
+    pos = 0
+    for c in KeyOrder(key):
+        columns[c] = list(cipher[pos : pos + lengths[c]])
+        pos += lengths[c]
+    return columns
+
+# This function reads the columns of a grid in the
+# alphabetical order of the key.
+def ReadColumns(columns, key):
+    return "".join(["".join(columns[c]) for c in KeyOrder(key)])
+
+# This function prints the columns of a grid row by row
+# for the explanation text field.
+def ColumnsExplanation(columns):
+    explanation = ""
+    for i in range(max([len(c) for c in columns] + [0])):
+        for j in range(len(columns)):
+            explanation += str(columns[j][i]) + "\t" if i < len(columns[j]) else "  "
+        explanation += "\n"
+    return explanation
+
+# This function prints the text in rows of the given width
+# for the explanation text field.
+def GridExplanation(text, width):
+    return ColumnsExplanation([list(text[c::width]) for c in range(width)])
+
+# This function prints the text in the zig-zag pattern of
+# the rail fence for the explanation text field. If a key
+# is given, each line starts with its key letter.
+def RailExplanation(text, lines, key = ""):
+    rails = RailIndexes(len(text), lines)
+    rows = [[" " for i in range(len(text))] for r in range(lines)]
+    for i in range(len(text)):
+        rows[rails[i]][i] = text[i]
+    if key != "":
+        rows = [[key[r], " "] + rows[r] for r in range(lines)]
+    return "\n".join(["".join(row).rstrip() for row in rows])
+
+# This function prints the blocks of the rotation cipher
+# for the explanation text field.
+def RotationExplanation(text, BlockSize):
+    blocks = [text[i : i + BlockSize * BlockSize] for i in range(0, len(text), BlockSize * BlockSize)]
+    return "\n".join([GridExplanation(block, BlockSize) for block in blocks])
+
+# This function prints the substitution table of the ADFGVX
+# cipher for the explanation text field.
+def ADFGVXTableExplanation():
+    explanation = "\t" + "\t".join(ADFGVXLetters) + "\n"
+    for r in range(6):
+        explanation += ADFGVXLetters[r] + "\t" + "\t".join(ADFGVXSquare[6 * r : 6 * r + 6]) + "\n"
+    return explanation
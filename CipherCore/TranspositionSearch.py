@@ -0,0 +1,193 @@
+# argparse, json, os and sys are needed for the command line
+# and the number of cores
+# concurrent.futures spreads the candidate keys over processes
+# functools keeps the permutations of the free columns
+# heapq merges the best keys of all processes
+# itertools enumerates the orders of the columns
+# numpy provides the decryption of many candidates at once
+# NGrams scores the candidates, Transposition provides the
+# permutations of the rail fence and the skytale
+import argparse
+import concurrent.futures
+import functools
+import heapq
+import itertools
+import json
+import os
+import sys
+import numpy as np
+from CipherCore import NGrams
+from CipherCore import Transposition
+
+# The methods whose keys can be searched.
+Methods = ["RailFence", "Skytale", "Columnar"]
+
+# The orders of the columns are enumerated in jobs of at most
+# 7! = 5040 orders, the first columns of an order are fixed
+# by the job.
+FreeColumns = 7
+
+# The candidates of a job are first scored by their first
+# PruneRows rows only, and only the best of them (one in
+# PruneFactor, at least as many as keys are asked for) are
+# scored by their whole text.
+PruneRows = 4
+PruneFactor = 16
+
+# The cipher text (as symbols) and the n-gram table used by
+# the jobs of a worker process. They are passed once per
+# process by StartWorker instead of with every job.
+WorkerSymbols = None
+WorkerTable = None
+
+def StartWorker(symbols, table):
+    global WorkerSymbols, WorkerTable
+    WorkerSymbols = symbols
+    WorkerTable = table
+
+# This function returns all permutations of the numbers 0 to
+# count - 1, one per row.
+@functools.lru_cache(maxsize = None)
+def Permutations(count):
+    return np.array(list(itertools.permutations(range(count))), dtype = np.int64).reshape(-1, count)
+
+# This function returns the key of the columnar transposition
+# whose columns are read in the given order, e.g. the order
+# [2, 0, 1] yields the key "BCA".
+def OrderKey(order):
+    key = ["" for i in range(len(order))]
+    for r in range(len(order)):
+        key[order[r]] = chr(ord("A") + r)
+    return "".join(key)
+
+# This function returns for each order of the columns (one
+# per row) the position in the cipher text at which each
+# column of the grid starts. The first columns of the grid
+# are one letter longer if the text does not fill the last
+# row.
+def ColumnStarts(orders, length):
+    width = orders.shape[1]
+    lengths = np.where(np.arange(width) < length % width, length // width + 1, length // width)
+    ordered = lengths[orders]
+    starts = np.empty_like(orders)
+    np.put_along_axis(starts, orders, np.cumsum(ordered, axis = 1) - ordered, axis = 1)
+    return starts
+
+# This function decrypts the first count symbols of the
+# cipher text with each order of the columns at once.
+# It returns one candidate plain text per row.
+def ColumnarCandidates(symbols, orders, count):
+    position = np.arange(count)
+    width = orders.shape[1]
+    return symbols[ColumnStarts(orders, len(symbols))[:, position % width] + position // width]
+
+# This function returns the indexes of the count highest
+# scores, best first.
+def BestIndexes(scores, count):
+    if len(scores) > count:
+        best = np.argpartition(-scores, count - 1)[:count]
+    else:
+        best = np.arange(len(scores))
+    return best[np.argsort(-scores[best], kind = "stable")]
+
+# This function scores the candidate keys of one job in a
+# worker process. A job of the rail fence or the skytale
+# lists the numbers of lines or the diameters, a columnar job
+# gives the width of the grid and the first columns of the
+# orders to try.
+# It returns the count best keys of the job as tuples
+# (score, method, key).
+def SearchJob(job):
+    method, keys, count = job
+    symbols, table = WorkerSymbols, WorkerTable
+    if method != "Columnar":
+        builder = Transposition.PlanBuilders[method]
+        scores = np.array([NGrams.Fitness(table, symbols[builder(key, len(symbols))[1]]) for key in keys])
+        return [(float(scores[i]), method, keys[i]) for i in BestIndexes(scores, count)]
+    width, prefix = keys
+    rest = np.array([c for c in range(width) if c not in prefix], dtype = np.int64)
+    orders = rest[Permutations(len(rest))]
+    orders = np.concatenate([np.tile(np.array(prefix, dtype = np.int64), (len(orders), 1)), orders], axis = 1)
+    if (len(orders) > PruneFactor * count) and (len(symbols) > PruneRows * width):
+        partial = NGrams.Fitness(table, ColumnarCandidates(symbols, orders, PruneRows * width))
+        orders = orders[BestIndexes(partial, max(count, len(orders) // PruneFactor))]
+    scores = NGrams.Fitness(table, ColumnarCandidates(symbols, orders, len(symbols)))
+    return [(float(scores[i]), method, OrderKey(orders[i])) for i in BestIndexes(scores, count)]
+
+# This function lists the jobs of the search. The numbers of
+# lines and the diameters up to MaxRails are split into jobs
+# of 64 keys.
+def SearchJobs(length, MaxWidth, count, methods, MaxRails = 15):
+    jobs = []
+    for method in ["RailFence", "Skytale"]:
+        if method in methods:
+            keys = list(range(2, min(MaxRails, length - 1) + 1))
+            jobs += [(method, keys[i : i + 64], count) for i in range(0, len(keys), 64)]
+    if "Columnar" in methods:
+        for width in range(2, min(MaxWidth, length) + 1):
+            for prefix in itertools.permutations(range(width), max(0, width - FreeColumns)):
+                jobs.append(("Columnar", (width, prefix), count))
+    return jobs
+
+# This function searches the keys of the rail fence (numbers
+# of lines) and the skytale (diameters) up to MaxRails and
+# of the columnar transposition (keys up to MaxWidth letters)
+# which decrypt the cipher text into the text matching the
+# n-gram table best. The candidates are spread over workers
+# processes (all cores by default). Columnar keys whose first rows
+# already score badly are dropped early, so the search is
+# not exhaustive for them.
+# It returns the count best keys as tuples (method, key,
+# score), best first.
+def SearchKeys(cipher, table, MaxWidth = 9, count = 10, methods = Methods, workers = None, MaxRails = 15):
+    symbols = NGrams.SymbolNumbers(cipher)
+    jobs = SearchJobs(len(symbols), MaxWidth, count, methods, MaxRails)
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers = workers,
+                                                initializer = StartWorker,
+                                                initargs = (symbols, table)) as executor:
+        results = executor.map(SearchJob, jobs, chunksize = max(1, len(jobs) // (4 * workers)))
+        best = heapq.nlargest(count, itertools.chain.from_iterable(results), key = lambda result: result[0])
+    return [(method, key, score) for score, method, key in best]
+
+# This function reads the command line, searches the keys of
+# the cipher text and prints them as JSON lines, best first.
+# It returns the exit code.
+def Main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python -m CipherCore.TranspositionSearch",
+                                     description = "Searches the keys of a transposition cipher text.")
+    parser.add_argument("sample", help = "text file in the language of the plain text or language model directory")
+    parser.add_argument("input", help = "cipher text file or - for standard input")
+    parser.add_argument("--max-width", type = int, default = 9, help = "longest columnar key")
+    parser.add_argument("--max-rails", type = int, default = 15, help = "most rail fence lines and skytale diameter")
+    parser.add_argument("--count", type = int, default = 10, help = "number of keys printed")
+    parser.add_argument("--methods", nargs = "+", choices = Methods, default = Methods)
+    parser.add_argument("-w", "--workers", type = int, default = os.cpu_count() or 1)
+    options = parser.parse_args(argv)
+    if (options.count < 1) or (options.workers < 1):
+        parser.error("--count and --workers must be at least 1")
+    # A missing file or a language model without 4-grams is a
+    # wrong argument.
+    try:
+        if os.path.isdir(options.sample):
+            table = NGrams.LoadTable(options.sample)
+        else:
+            with open(options.sample, mode = "rt", encoding = "utf-8") as SampleFile:
+                table = NGrams.NGramTable(SampleFile.read())
+        if options.input == "-":
+            cipher = sys.stdin.read()
+        else:
+            with open(options.input, mode = "rt", encoding = "utf-8") as InFile:
+                cipher = InFile.read()
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    # The line break at the end of the file is not part of
+    # the cipher text.
+    cipher = cipher.rstrip("\r\n")
+    for method, key, score in SearchKeys(cipher, table, options.max_width, options.count,
+                                         options.methods, options.workers, options.max_rails):
+        print(json.dumps({"method": method, "key": key, "score": round(score, 2)}))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(Main())
@@ -0,0 +1,433 @@
+# numpy provides the arrays for the analysis of long texts and
+# the en- and decryption of whole chunks at once
+# Frequencies converts texts into arrays of letters
+# heapq provides the queue for the ranking of keys
+# math provides the least common multiples of key lengths
+import heapq
+import math
+import numpy as np
+from CipherCore import Frequencies
+
+# The Vigenère square as codes of capitals:
+# ShiftedLetters[s, p] is the capital number p (0-25)
+# shifted by s letters.
+ShiftedLetters = ((np.arange(26)[:, None] + np.arange(26)[None, :]) % 26 + ord("A")).astype(np.uint8)
+
+# This class en- or decrypts a normalized text given in
+# chunks of any size. The position in the key is carried
+# from one chunk to the next, so the chunks give the same
+# result as the whole text at once. A chunk is a string or
+# UTF-8 bytes; only the bytes of the capitals A-Z are
+# shifted (by the table above), all other characters are
+# copied and do not consume a key letter. Capitals never
+# occur within the UTF-8 encoding of other characters.
+class VigenereCodec:
+
+    def __init__(self, key, decrypt = False):
+        if len(key) == 0:
+            raise ValueError("No valid key entered")
+        if not all("A" <= k <= "Z" for k in key):
+            raise ValueError("The key may only consist of capital letters")
+        shifts = np.array([ord(k) - ord("A") for k in key], dtype = np.int64)
+        self.shifts = (-shifts if decrypt else shifts) % 26
+        self.phase = 0
+
+    # This method en- or decrypts the next chunk of the text.
+    def Process(self, chunk):
+        data = np.frombuffer(chunk.encode("utf-8") if isinstance(chunk, str) else chunk,
+                             dtype = np.uint8).copy()
+        capitals = np.flatnonzero((data >= ord("A")) & (data <= ord("Z")))
+        keys = self.shifts[(self.phase + np.arange(len(capitals))) % len(self.shifts)]
+        data[capitals] = ShiftedLetters[keys, data[capitals] - ord("A")]
+        self.phase = (self.phase + len(capitals)) % len(self.shifts)
+        return data.tobytes().decode("utf-8") if isinstance(chunk, str) else data.tobytes()
+
+# This function en- or decrypts a text given in chunks (e.g.
+# the normalized blocks of NormalizeFile) and yields the
+# resulting chunks.
+def VigenereChunks(chunks, key, decrypt = False):
+    codec = VigenereCodec(key, decrypt)
+    for chunk in chunks:
+        yield codec.Process(chunk)
+
+# This function encrypts the normalized plain text with
+# the key (capitals only). Characters that are not
+# capitals are copied and do not consume a key letter.
+def VigenereEncrypt(plain, key):
+    return VigenereCodec(key).Process(plain)
+
+# This function decrypts the normalized cipher text with
+# the key (capitals only), i.e. it inverts VigenereEncrypt.
+def VigenereDecrypt(ciph, key):
+    return VigenereCodec(key, decrypt = True).Process(ciph)
+
+# This function finds all strings of length StringLength
+# occurring repeatedly in the strictly normalized cipher
+# text. The strings are numbered, sorted once by their
+# number and split into groups of equal strings, so the
+# search takes O(n log n) instead of comparing every
+# string with the rest of the text.
+# It returns a dictionary with the repeated strings as keys
+# and the sorted arrays of their positions as values.
+def FindRepeatedStrings(ciph, StringLength = 3):
+    positions, group, sizes = GroupRepeatedStrings(ciph, StringLength)
+    ends = np.cumsum(sizes)
+    RepeatedStrings = {}
+    for g in range(len(sizes)):
+        p = np.sort(positions[ends[g] - sizes[g] : ends[g]])
+        RepeatedStrings[ciph[p[0] : p[0] + StringLength]] = p
+    return RepeatedStrings
+
+# This function collects the positions of all strings of
+# length StringLength which occur repeatedly in the cipher
+# text, ordered by the strings. It returns these positions,
+# the number of the group of equal strings for every
+# position and the size of every group.
+def GroupRepeatedStrings(ciph, StringLength):
+    numbers = Frequencies.NGramNumbers(Frequencies.ToNumbers(ciph), StringLength)
+    if len(numbers) == 0:
+        return np.zeros(0, dtype = np.int32), np.zeros(0, dtype = np.int32), np.zeros(0, dtype = np.int64)
+    order = np.argsort(numbers)
+    numbers = numbers[order]
+    NewGroup = np.concatenate(([True], numbers[1:] != numbers[:-1]))
+    group = np.cumsum(NewGroup) - 1
+    sizes = np.bincount(group)
+    repeated = sizes[group] > 1
+    sizes = sizes[sizes > 1]
+    group = np.cumsum(NewGroup[repeated]) - 1
+    return order[repeated].astype(np.int32), group.astype(np.int32), sizes
+
+# This function lists the distances between any two
+# occurrences of the same string. The positions are ordered
+# by their groups of equal strings, so the occurrences of a
+# string follow each other: the k-th pass pairs every
+# position with the k-th next one. A pair stays within its
+# group if the pair of the pass before did and the k-th next
+# position belongs to the same group as the one before it.
+def RepeatedDistances(positions, group):
+    SameAsNext = np.append(group[1:] == group[:-1], False)
+    distances = [np.zeros(0, dtype = np.int32)]
+    candidates = np.flatnonzero(SameAsNext)
+    k = 1
+    while len(candidates) > 0:
+        distances.append(np.abs(positions[candidates + k] - positions[candidates]))
+        k += 1
+        candidates = candidates[SameAsNext[candidates + k - 1]]
+    return np.concatenate(distances)
+
+# This function counts for every divisor d from 2 to
+# MaxDivisor the pairs of occurrences of equal strings
+# whose distance is a multiple of d, without listing the
+# pairs. ids gives the number of the group of equal strings
+# of every position of the text, or groups for a string
+# occurring once. The positions with equal remainder modulo
+# d are counted per group, one remainder after the other,
+# so the counts of a remainder fit into the cache: n
+# occurrences of a string with equal remainder form
+# n*(n-1)/2 pairs whose distance is a multiple of d. The
+# counts for d are obtained from those for a multiple of d
+# by adding up the remainders, so only the divisors above
+# MaxDivisor/2 need a pass over the text.
+def ResidueDivisorCounts(ids, groups, MaxDivisor):
+    DivisorsOfDistances = {}
+    repeated = len(ids) - int(np.count_nonzero(ids == groups))
+    for d in range(MaxDivisor, MaxDivisor // 2, -1):
+        counts = np.zeros((d, groups + 1), dtype = np.int64)
+        for r in range(min(d, len(ids))):
+            counts[r] = np.bincount(ids[r::d], minlength = groups + 1)
+        counts = counts[:, :groups]
+        for e in range(2, d + 1):
+            if (d % e != 0) or (e in DivisorsOfDistances):
+                continue
+            folded = counts[0:e].copy()
+            for k in range(e, d, e):
+                folded += counts[k:k+e]
+            folded = folded.ravel()
+            DivisorsOfDistances[e] = (int(np.dot(folded, folded)) - repeated) // 2
+    return DivisorsOfDistances
+
+# The Kasiski examination lists the distances of the pairs of
+# occurrences if this costs less than counting them per
+# remainder. Listing a distance costs about as much as
+# DistanceCost positions or counts of a pass over the text.
+DistanceCost = 4
+
+# This function carries out the Kasiski examination of
+# the strictly normalized cipher text. Every string of
+# length StringLength occurring repeatedly is searched and
+# the distances between any two of its occurrences are
+# decomposed into their divisors from 2 to MaxDivisor.
+# If there are few pairs of occurrences (as for longer
+# strings), their distances are listed once and counted per
+# divisor. Otherwise the pairs are counted per remainder of
+# the positions (see ResidueDivisorCounts).
+# Unlike the former search pair by pair, every pair of
+# occurrences counts. The former search skipped an
+# occurrence directly behind the first one of a string
+# (overlapping repeats as in "CCCC"), so the distances of
+# this occurrence to the later ones were missing, and it
+# did not start at the last positions of the text. Thus
+# texts with such repeats give higher counts than before.
+# It returns a dictionary counting how often each divisor
+# occurred, sorted by the divisors, which is empty if no
+# string was found repeatedly.
+def KasiskiExamination(ciph, StringLength = 3, MaxDivisor = 20):
+    # Few possible strings: their numbers are used directly
+    # as group numbers. Strings occurring once form no pairs.
+    direct = 26 ** StringLength * MaxDivisor <= (1 << 20)
+    if direct:
+        numbers = Frequencies.NGramNumbers(Frequencies.ToNumbers(ciph), StringLength)
+        groups = 26 ** StringLength
+        sizes = np.bincount(numbers, minlength = groups)
+    else:
+        positions, group, sizes = GroupRepeatedStrings(ciph, StringLength)
+        groups = len(sizes)
+    pairs = int(np.dot(sizes, sizes - 1)) // 2
+    if pairs == 0:
+        return {}
+    IdType = np.uint16 if groups < (1 << 16) else np.int32
+    length = max(0, len(ciph) - StringLength + 1)
+    if DistanceCost * pairs <= (MaxDivisor - MaxDivisor // 2) * (length + groups * MaxDivisor):
+        if direct:
+            # The positions are ordered by their strings by
+            # a counting sort.
+            positions = np.argsort(numbers.astype(IdType), kind = "stable").astype(np.int32)
+            group = np.repeat(np.arange(groups, dtype = np.int32), sizes)
+        frequencies = np.bincount(RepeatedDistances(positions, group), minlength = MaxDivisor + 1)
+        DivisorsOfDistances = {d: int(frequencies[d::d].sum()) for d in range(2, MaxDivisor + 1)}
+    else:
+        if direct:
+            ids = numbers.astype(IdType)
+        else:
+            ids = np.full(length, groups, dtype = IdType)
+            ids[positions] = group
+        DivisorsOfDistances = ResidueDivisorCounts(ids, groups, MaxDivisor)
+    return {d: DivisorsOfDistances[d] for d in sorted(DivisorsOfDistances) if DivisorsOfDistances[d] > 0}
+
+# This function estimates the key length by the Friedman
+# test from the letter frequencies of the cipher text and
+# of a sample text in the target language.
+def FriedmanEstimate(CiphFrequencies, SampleFrequencies):
+    CiphIndexOfCoincidence = 0
+    SampleIndexOfCoincidence = 0
+    RandomIndexOfCoincidence = 1/26
+    CiphLength = sum(CiphFrequencies)
+    SampleLength = sum(SampleFrequencies)
+    if (CiphLength < 2) or (SampleLength < 2):
+        raise ValueError("Texts too short for the Friedman test")
+    for i in range(26):
+        CiphIndexOfCoincidence += (CiphFrequencies[i] * (CiphFrequencies[i] - 1) /
+                                   (CiphLength * (CiphLength - 1)))
+        SampleIndexOfCoincidence += (SampleFrequencies[i] * (SampleFrequencies[i] - 1) /
+                                     (SampleLength * (SampleLength - 1)))
+    return ((SampleIndexOfCoincidence - RandomIndexOfCoincidence) * CiphLength /
+            ((CiphLength - 1) * CiphIndexOfCoincidence + SampleIndexOfCoincidence - RandomIndexOfCoincidence * CiphLength))
+
+# This function counts the letters of the strictly
+# normalized cipher text separately for each of the
+# KeyLength columns, i.e. for all letters encrypted with
+# the same key letter.
+# It returns a KeyLength x 26 array of frequencies.
+def ColumnFrequencies(ciph, KeyLength):
+    if KeyLength < 1:
+        raise ValueError("Key length must be at least 1")
+    letters = Frequencies.ToNumbers(ciph).astype(np.int64)
+    letters += 26 * (np.arange(len(letters)) % KeyLength)
+    return np.bincount(letters, minlength = 26 * KeyLength).reshape(KeyLength, 26)
+
+# This function returns the letter frequencies of a column
+# decrypted with the shift (0 = A, ..., 25 = Z), given the
+# frequencies of its cipher letters (a row of
+# ColumnFrequencies). As the plain letter p is the cipher
+# letter p + shift, the decryption only rotates the
+# frequencies and does not touch the text.
+def DecryptedFrequencies(frequencies, shift):
+    return np.roll(frequencies, -shift)
+
+# This function calculates the index of coincidence of each
+# row of the array of frequencies. Rows with less than two
+# letters get the index 0.
+def IndexesOfCoincidence(frequencies):
+    frequencies = np.asarray(frequencies, dtype = np.float64)
+    length = frequencies.sum(axis = -1)
+    pairs = (frequencies * (frequencies - 1)).sum(axis = -1)
+    return np.where(length > 1, pairs / np.maximum(length * (length - 1), 1), 0)
+
+# The largest number of residue classes which ColumnIndexes
+# counts in one pass over the text.
+MaxModulus = 1 << 14
+
+# This function returns a few moduli which together have all
+# key lengths from 1 to MaxKeyLength as divisors, each the
+# least common multiple of some key lengths and at most
+# MaxModulus. For 20 key lengths these are three moduli.
+def ResidueModuli(MaxKeyLength):
+    moduli = []
+    for k in range(MaxKeyLength, 0, -1):
+        if any(m % k == 0 for m in moduli):
+            continue
+        for i in range(len(moduli)):
+            if math.lcm(moduli[i], k) <= MaxModulus:
+                moduli[i] = math.lcm(moduli[i], k)
+                break
+        else:
+            moduli.append(k)
+    return moduli
+
+# This function counts the letters (0-25) separately for each
+# remainder of their position modulo modulus. The letters are
+# arranged in rows of modulus letters, so the remainder is
+# the column and no division is needed.
+# It returns a modulus x 26 array of frequencies.
+def ResidueFrequencies(letters, modulus):
+    rows = len(letters) // modulus
+    offsets = 26 * np.arange(modulus, dtype = np.intp)
+    codes = letters[:rows * modulus].reshape(rows, modulus) + offsets
+    counts = np.bincount(codes.ravel(), minlength = 26 * modulus)
+    tail = letters[rows * modulus:] + offsets[:len(letters) - rows * modulus]
+    counts += np.bincount(tail, minlength = 26 * modulus)
+    return counts.reshape(modulus, 26)
+
+# This function calculates the average index of coincidence
+# of the columns of the strictly normalized cipher text for
+# every key length from 1 to MaxKeyLength. The frequencies of
+# the columns of a key length k are obtained by adding up
+# those of a modulus divisible by k, so the text is counted
+# only once per modulus instead of once per key length.
+# It returns an array of the indexes, starting with key
+# length 1.
+def ColumnIndexes(ciph, MaxKeyLength = 20):
+    if MaxKeyLength < 1:
+        raise ValueError("Key length must be at least 1")
+    letters = Frequencies.ToNumbers(ciph)
+    indexes = np.zeros(MaxKeyLength)
+    done = set()
+    for modulus in ResidueModuli(MaxKeyLength):
+        counts = ResidueFrequencies(letters, modulus)
+        for k in range(1, MaxKeyLength + 1):
+            if (modulus % k == 0) and (k not in done):
+                folded = counts.reshape(modulus // k, k, 26).sum(axis = 0)
+                indexes[k - 1] = IndexesOfCoincidence(folded).mean()
+                done.add(k)
+    return indexes
+
+# This function ranks the key lengths from 1 to MaxKeyLength
+# of the strictly normalized cipher text by the average index
+# of coincidence of their columns, the highest first. The
+# multiples of the key length score about as high as the key
+# length itself. If the letter frequencies of a sample text
+# are given, the key lengths whose columns come closer to
+# the index of the sample text than to the index of random
+# text are ranked first, the shortest of them first, as
+# EstimateKeyLength chooses.
+# It returns a list of pairs (key length, index).
+def RankKeyLengths(ciph, MaxKeyLength = 20, SampleFrequencies = None):
+    indexes = ColumnIndexes(ciph, MaxKeyLength)
+    order = list(np.argsort(-indexes, kind = "stable"))
+    if SampleFrequencies is not None:
+        threshold = (IndexesOfCoincidence(SampleFrequencies) + 1/26) / 2
+        order = sorted(order, key = lambda i: (indexes[i] < threshold, i if indexes[i] >= threshold else 0))
+    return [(int(i) + 1, float(indexes[i])) for i in order]
+
+# This function estimates the key length of the strictly
+# normalized cipher text. The divisors found by the Kasiski
+# examination are the candidates (all lengths up to
+# MaxKeyLength if no string occurs repeatedly). As in the
+# Friedman test, the columns of the right key length have
+# the index of coincidence of the language, so the shortest
+# candidate whose columns come closer to the index of the
+# sample text than to the index of random text is chosen.
+def EstimateKeyLength(ciph, SampleFrequencies, MaxKeyLength = 20, StringLength = 3):
+    SampleIndex = IndexesOfCoincidence(SampleFrequencies)
+    if SampleIndex == 0:
+        raise ValueError("Sample text too short")
+    candidates = [1] + list(KasiskiExamination(ciph, StringLength, MaxKeyLength).keys())
+    if len(candidates) == 1:
+        candidates = list(range(1, MaxKeyLength + 1))
+    indexes = ColumnIndexes(ciph, max(candidates))[np.array(candidates) - 1]
+    for i in range(len(candidates)):
+        if indexes[i] >= (SampleIndex + 1/26) / 2:
+            return candidates[i]
+    return candidates[int(np.argmax(indexes))]
+
+# This function scores every shift (0 = A, ..., 25 = Z) of
+# every column of the strictly normalized cipher text by
+# the chi-squared statistic of the decrypted column against
+# the letter frequencies of the sample text. The lower the
+# score, the better the shift fits the language.
+# It returns a KeyLength x 26 array of scores.
+def ShiftScores(ciph, KeyLength, SampleFrequencies):
+    SampleFrequencies = np.asarray(SampleFrequencies, dtype = np.float64)
+    if SampleFrequencies.sum() == 0:
+        raise ValueError("Sample text too short")
+    # Letters missing in the sample text would get an
+    # expected frequency of 0, so every letter is counted
+    # once more.
+    probabilities = (SampleFrequencies + 1) / (SampleFrequencies.sum() + 26)
+    counts = ColumnFrequencies(ciph, KeyLength)
+    # shifted[k, s, p] is the frequency of the plain letter p
+    # in the column k decrypted with the shift s.
+    shifted = counts[:, (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26]
+    expected = counts.sum(axis = 1)[:, None, None] * probabilities[None, None, :]
+    return ((shifted - expected) ** 2 / np.maximum(expected, 1e-12)).sum(axis = 2)
+
+# This function ranks the keys of length KeyLength for the
+# strictly normalized cipher text. The score of a key is
+# the sum of the scores of its shifts, so the best keys
+# are found by a best-first search over the shifts of each
+# column ordered by their scores.
+# It returns a list of up to count pairs (key, score),
+# the best key first.
+def RankKeys(ciph, KeyLength, SampleFrequencies, count = 10):
+    scores = ShiftScores(ciph, KeyLength, SampleFrequencies)
+    order = np.argsort(scores, axis = 1)
+    ranked = np.take_along_axis(scores, order, axis = 1).tolist()
+    start = (0,) * KeyLength
+    queue = [(sum(ranked[k][0] for k in range(KeyLength)), start)]
+    seen = {start}
+    keys = []
+    while queue and len(keys) < count:
+        score, ranks = heapq.heappop(queue)
+        keys.append(("".join([chr(ord("A") + int(order[k][ranks[k]])) for k in range(KeyLength)]), score))
+        for k in range(KeyLength):
+            if ranks[k] < 25:
+                following = ranks[:k] + (ranks[k] + 1,) + ranks[k+1:]
+                if following not in seen:
+                    seen.add(following)
+                    heapq.heappush(queue, (score - ranked[k][ranks[k]] + ranked[k][ranks[k] + 1], following))
+    return keys
+
+# This function recovers the key of the strictly normalized
+# cipher text without any interaction. If no key length is
+# given, it is estimated first.
+# It returns the key length and the ranked keys as
+# RankKeys does.
+def CrackVigenere(ciph, SampleFrequencies, KeyLength = None, count = 10, MaxKeyLength = 20):
+    if len(ciph) == 0:
+        raise ValueError("No ciphertext to analyze")
+    if KeyLength is None:
+        KeyLength = EstimateKeyLength(ciph, SampleFrequencies, MaxKeyLength)
+    return KeyLength, RankKeys(ciph, KeyLength, SampleFrequencies, count)
+
+# This function splits the strictly normalized text into
+# lines of KeyLength letters, so that each column of the
+# result was encrypted with the same key letter.
+def SplitIntoRows(text, KeyLength):
+    return "\n".join([text[i : i + KeyLength] for i in range(0, len(text), KeyLength)])
+
+# This function copies the letters of plain into the
+# format of ciph, i.e. wherever ciph contains a letter,
+# the next letter of plain is used, all other characters
+# of ciph are copied.
+def FormatPlaintext(ciph, plain):
+    i = 0
+    s = []
+    for c in ciph:
+        if c.isascii() and c.isalpha():
+            while not (plain[i].isascii() and plain[i].isalpha()):
+                i += 1
+            s.append(plain[i])
+            i += 1
+        else:
+            s.append(c)
+    return "".join(s)
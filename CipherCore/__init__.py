@@ -0,0 +1,37 @@
+# CipherCore contains the cipher and analysis functions of the
+# laboratory tools without any GUI code, so they can be used
+# in batch jobs and on machines without a display.
+# The Tk scripts in the other folders only read their widgets,
+# call these functions and print the results.
+# The analysis functions need numpy, the charts matplotlib.
+#
+# Normalization  - normalizes texts like the "Keep blanks" and
+#                  "Keep non-alphabetic chars" settings do
+# Frequencies    - letter frequencies of texts
+# Substitution   - monoalphabetic substitution (Caesar, Atbash,
+#                  general)
+# Vigenere       - Vigenère en-/decryption and its analysis
+#                  (Kasiski, Friedman, automatic key recovery)
+# Hex            - conversion between bytes and hexadecimal
+#                  values
+# OneTimePad     - XOR and the crib drag
+# KeyPool        - random keys and pools of pre-generated
+#                  one-time pads
+# Transposition  - transposition ciphers
+# NGrams         - n-gram statistics of sample texts scoring
+#                  candidate plain texts, and language models
+#                  saved as NumPy files (python -m CipherCore.NGrams)
+# TranspositionSearch - key search of the rail fence, skytale
+#                  and columnar transposition in several
+#                  processes (python -m CipherCore.TranspositionSearch)
+# Scheduler      - debouncing and background computation for
+#                  the Tk scripts (uses only root.after, no
+#                  tkinter import)
+# TextView       - text fields showing only a window of huge
+#                  texts, updated by their changed part
+# Plotting       - bar charts of the Tk scripts, importing
+#                  matplotlib only when needed (or exporting
+#                  the data as JSON/CSV in headless runs)
+# Batch          - command line (python -m CipherCore) applying
+#                  the ciphers to directories and JSONL streams
+#                  in several processes
@@ -0,0 +1,8 @@
+# The command line of CipherCore, e.g.
+#   python -m CipherCore vigenere messages.jsonl out.jsonl -k KEY
+# Batch provides the command line and the worker processes
+import sys
+from CipherCore import Batch
+
+if __name__ == "__main__":
+    sys.exit(Batch.Main())
@@ -1,6 +1,21 @@
 # tkinter provides GUI objects and commands
+# os and sys are needed to find the CipherCore package
+# in the parent folder of this script
+# json, signal and subprocess run and stop the key search
+# and read its results
+# CipherCore provides the cipher functions
 import tkinter as tk
 import tkinter.ttk as ttk
+import os
+import sys
+import json
+import signal
+import subprocess
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from CipherCore import Normalization
+from CipherCore import Scheduler
+from CipherCore import TextView
+from CipherCore import Transposition
 
 # An object (root) is created which represents the window.
 # Its title and full screen property are set.
@@ -8,29 +23,24 @@ root = tk.Tk()
 root.title("Transpositional decryptions")
 root.wm_state("zoomed")
 
+# The scheduler runs the en- or decryptions in the background,
+# so the window does not freeze on long texts. The second
+# worker thread waits for the key search, so the decryptions
+# go on meanwhile.
+Tasks = Scheduler.Scheduler(root, workers = 2)
+
+# The process of the running key search, which is stopped
+# when a new search starts or the window is closed. It runs
+# in a process group of its own, so its worker processes are
+# stopped together with it.
+SearchProcess = None
+
 # This function normalizes the parameter text according to the
 # settings "Keep blanks" and "Keep non-alphabetic chars".
-def NormalizeText(ciph, strict = False):
-    s = ""
-    for c in ciph:
-        if ((ord(c) <= ord("Z")) and (ord(c) >= ord("A"))):
-            s += c
-        elif ((ord(c) <= ord("z")) and (ord(c) >= ord("a"))):
-            s += chr(ord(c) + ord("A") - ord("a"))
-        elif ((c == "ä") or (c == "Ä")):
-            s += "AE"
-        elif ((c == "ö") or (c == "Ö")):
-            s += "OE"
-        elif ((c == "ü") or (c == "Ü")):
-            s += "UE"
-        elif (c == "ß"):
-            s += "SS"
-        elif ((c == " ") or (ord(c) == 10)) and not strict:
-            if KeepBlanks.get() == "1":
-                s += " "
-        elif KeepNonalpha.get() == "1" and not strict:
-            s += c
-    return s
+def NormalizeText(text, strict = False):
+    return Normalization.NormalizeText(text,
+                                       KeepBlanks = (KeepBlanks.get() == "1") and not strict,
+                                       KeepNonalpha = (KeepNonalpha.get() == "1") and not strict)
 
 # The labels used to interact with the user are cleared.
 def ClearFeedbackLabels():
@@ -47,7 +57,7 @@ def ClearFeedbackLabels():
 # textfile succeeded.
 def ButtonPlainSaveClick():
     ClearFeedbackLabels()
-    plain = TextPlain.get("1.0", "end")[:-1]
+    plain = ViewPlain.Get()
     if len(plain) < 1:
         LabelPlainFeedback["text"] = "Nothing to save"
         return
@@ -78,8 +88,7 @@ def ButtonCiphLoadClick():
             LabelCiphFeedback["text"] = "File empty"
         else:
             ciph = NormalizeText(ciph)
-            TextCiph.delete("1.0", "end")
-            TextCiph.insert("1.0", ciph)
+            ViewCiph.Set(ciph)
             LabelCiphFeedback["text"] = "File loaded successfully."
 
 # This function is invoked when the user selects a radio
@@ -124,25 +133,40 @@ def ChangeMethod():
         ADFGVXKey.set(ADFGVXKey.get())
 
 # This function collects all necessary preparations for the
-# ensuing decryption like clearing of text fields.
+# ensuing decryption like normalizing the text. The old result
+# stays until the new one is computed, so only the part of
+# it that changes has to be redrawn.
 def PrepareForDecryption():
     ClearFeedbackLabels()
-    TextPlain.delete("1.0", "end")
-    TextExplanation.delete("1.0", "end")
-    cipher = NormalizeText(TextCiph.get("1.0", "end")[:-1])
-    TextCiph.delete("1.0", "end")
-    TextCiph.insert("1.0", cipher)
+    cipher = NormalizeText(ViewCiph.Get())
+    ViewCiph.Set(cipher)
     return cipher
 
+# This function prints the plaintext and the explanation
+# once they are computed in the background.
+def ShowDecryption(result):
+    plain, explanation = result
+    ViewPlain.Set(plain)
+    ViewExplanation.Set(explanation)
+
+# This function tells the user why the decryption failed.
+def ShowMethodError(e):
+    ViewPlain.Set("")
+    ViewExplanation.Set("")
+    LabelMethodFeedback["text"] = str(e)
+
+# This function returns the callback of a spin box or key
+# variable, which runs the handler once the user has not
+# changed the settings for a moment.
+def Debounced(handler):
+    return lambda *args: Tasks.Debounce("method", lambda: handler(*args))
+
 # This function decrypts the text contained in the left
 # text field, assuming the reverse cipher was applied.
 def DoReverseCipher():
     cipher = PrepareForDecryption()
-      
-    plain = cipher[::-1]
-    
-    TextPlain.insert("1.0", plain)
-    TextExplanation.insert("1.0", "Simply flips the given text")
+    Tasks.Run("method", lambda: (Transposition.ReverseCipher(cipher), "Simply flips the given text"),
+              ShowDecryption, ShowMethodError)
 
 # This function decrypts the text contained in the left
 # text field, assuming it was encrypted using a skytale.
@@ -153,13 +177,13 @@ def DoReverseCipher():
 # been obtained.
 def SkytaleDiameterChanged():
     cipher = PrepareForDecryption()
-    pass
-    plain = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextPlain.insert("1.0", plain)
-    TextExplanation.insert("1.0", explanation)
+    diameter = SpinboxSkytaleDiameter.get()
+
+    def Decrypt():
+        plain = Transposition.SkytaleDecrypt(cipher, int(diameter))
+        return plain, Transposition.GridExplanation(plain, -(-len(plain) // int(diameter)))
+
+    Tasks.Run("method", Decrypt, ShowDecryption, ShowMethodError)
 
 # This function decrypts the text contained in the left
 # text field, assuming it was encrypted by use of the
@@ -171,13 +195,13 @@ def SkytaleDiameterChanged():
 # the number of lines of the zig-zag pattern is changed.
 def RailLinesChanged():
     cipher = PrepareForDecryption()
-    pass
-    plain = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextPlain.insert("1.0", plain)
-    TextExplanation.insert("1.0", explanation)
+    lines = SpinboxRailLines.get()
+
+    def Decrypt():
+        plain = Transposition.RailFenceDecrypt(cipher, int(lines))
+        return plain, Transposition.RailExplanation(plain, int(lines))
+
+    Tasks.Run("method", Decrypt, ShowDecryption, ShowMethodError)
 
 # This function decrypts the text contained in the left
 # text field, assuming it was encrypted by use of the
@@ -187,23 +211,17 @@ def RailLinesChanged():
 # have been arranged.
 # It is invoked, when the cipher mode is selected or when
 # the keyword is changed.
-# It invokes FindRailLengths to find the lengths of the
-# rails and lets FillRail arrange parts of the ciphertext
-# in the explanatory lines (i.e. add blank spaces).
-# RailFormatTexts prints the explanatory text and
-# picks its characters to find the plaintext.
 def RedefenceKeyChanged(var, index, mode):
     cipher = PrepareForDecryption()
     Key = NormalizeText(RedefenceKey.get(), strict = True)
     if Key != RedefenceKey.get():
         RedefenceKey.set(Key)
-    pass
-    plain = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextPlain.insert("1.0", plain)
-    TextExplanation.insert("1.0", explanation)
+
+    def Decrypt():
+        plain = Transposition.RedefenceDecrypt(cipher, Key)
+        return plain, Transposition.RailExplanation(plain, len(Key), Key)
+
+    Tasks.Run("method", Decrypt, ShowDecryption, ShowMethodError)
 
 # This function decrypts the text contained in the left
 # text field, assuming it was encrypted by use of the
@@ -212,13 +230,14 @@ def RedefenceKeyChanged(var, index, mode):
 # the block size or the angle of rotation are changed.
 def RotationChanged():
     cipher = PrepareForDecryption()
-    pass
-    plain = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextPlain.insert("1.0", plain)
-    TextExplanation.insert("1.0", explanation)
+    BlockSize = SpinboxRotationLength.get()
+    angle = SpinboxRotationAngle.get().rstrip("°")
+
+    def Decrypt():
+        plain = Transposition.RotationDecrypt(cipher, int(BlockSize), int(angle))
+        return plain, Transposition.RotationExplanation(plain, int(BlockSize)).strip()
+
+    Tasks.Run("method", Decrypt, ShowDecryption, ShowMethodError)
 
 # This function is invoked when the Myszkowski check
 # box is altered. It simulates a change of the key.
@@ -245,13 +264,20 @@ def ColTransKeyChanged(var, index, mode):
     Key2 = NormalizeText(ColTransKey2.get(), strict = True)
     if Key2 != ColTransKey2.get():
         ColTransKey2.set(Key2)
-    pass
-    plain = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextPlain.insert("1.0", plain)
-    TextExplanation.insert("1.0", explanation)
+    keys = [Key1, Key2] if DoubleColTrans.get() == "1" else [Key1]
+    UseMyszkowski = Myszkowski.get() == "1"
+
+    def Decrypt():
+        plain = Transposition.ColTransDecrypt(cipher, keys, Myszkowski = UseMyszkowski)
+        explanation = ""
+        text = cipher
+        for Key in reversed(keys):
+            text = Transposition.ColTransDecrypt(text, [Key], Myszkowski = UseMyszkowski)
+            explanation += "Keyword: " + Key + "\n______________________________\n"
+            explanation += Transposition.GridExplanation(text, len(Key)) + "\n"
+        return plain, explanation
+
+    Tasks.Run("method", Decrypt, ShowDecryption, ShowMethodError)
 
 # This function decrypts the text contained in the left
 # text field, assuming it was encrypted by use of the
@@ -264,13 +290,14 @@ def DisrColTransKeyChanged(var, index, mode):
     Key = NormalizeText(DisrColTransKey.get(), strict = True)
     if Key != DisrColTransKey.get():
         DisrColTransKey.set(Key)
-    pass
-    plain = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextPlain.insert("1.0", plain)
-    TextExplanation.insert("1.0", explanation)
+
+    def Decrypt():
+        plain = Transposition.DisrColTransDecrypt(cipher, Key)
+        explanation = "Keyword: " + Key + "\n______________________________\n"
+        explanation += Transposition.ColumnsExplanation(Transposition.CipherColumns(cipher, Key))
+        return plain, explanation
+
+    Tasks.Run("method", Decrypt, ShowDecryption, ShowMethodError)
 
 # This function decrypts the text contained in the left
 # text field, assuming it was encrypted by use of the
@@ -288,90 +315,13 @@ def DisrColTransKey2Changed(var, index, mode):
     if Key2 != DisrColTransKey2Num.get():
         DisrColTransKey2Num.set(Key2)
         #Disruption Key
-    
-    valuesOfNormalKeys = {}
-    positionNormalKeys = {}
-    valuesOfDisruptionKeys = {}
-    normalKeys = []
-    disruptionKeys = []
-    for l in range(len(DisrColTransKey2.get())):
-        normalKeys.append([*DisrColTransKey2.get()][l]) if [*DisrColTransKey2.get()][l] not in normalKeys else normalKeys.append([*DisrColTransKey2.get()][l]+str(l))
-    for l in range(len(DisrColTransKey2Num.get())):
-        disruptionKeys.append([*DisrColTransKey2Num.get()][l]) if [*DisrColTransKey2Num.get()][l] not in disruptionKeys else disruptionKeys.append([*DisrColTransKey2Num.get()][l]+str(l))
-    sortedNormalKeys = sorted(normalKeys)
-    sortedDisruptionKeys = sorted(disruptionKeys)
-    temp = 0
-    for c in normalKeys:
-        valuesOfNormalKeys[c] = sortedNormalKeys.index(c)
-        positionNormalKeys[c] = temp
-        temp += 1
-        
-    for c in disruptionKeys:
-        valuesOfDisruptionKeys[c] = sortedDisruptionKeys.index(c)
-        
-    decypheredRows = []
-    explanationRows = []
-    lenRows = []
-    for i in range(len(DisrColTransKey2.get())):
-        decypheredRows.append([])
-        explanationRows.append([])
-        lenRows.append(0)
-    indexNormalKey = 0
-    indexExplanationKey = 0
-    indexDisruptionKey = 0
-    tempCipher = cipher
-    while not tempCipher == "":
-        if len(DisrColTransKey2Num.get()) > 1:
-            for c in range(valuesOfDisruptionKeys[disruptionKeys[indexDisruptionKey]]):
-                if tempCipher == "":
-                    break
-                lenRows[indexNormalKey]+=1
-                tempCipher = tempCipher[1:]
-                indexNormalKey = indexNormalKey + 1 if indexNormalKey < len(decypheredRows)-1 else 0
-                indexExplanationKey = indexExplanationKey + 1 if indexExplanationKey < len(explanationRows)-1 else 0
-            #indexNormalKey = indexNormalKey + 1 if indexNormalKey < len(decypheredRows)-1 else 0
-            indexExplanationKey = indexExplanationKey + 1 if indexExplanationKey < len(explanationRows)-1 else 0
-            indexDisruptionKey = indexDisruptionKey + 1 if indexDisruptionKey < len(sortedDisruptionKeys)-1 else 0
-        else:
-            break
-    
-    print(lenRows)
-    for i in range(len(decypheredRows)):
-        for j in range(lenRows[positionNormalKeys[sortedNormalKeys[i]]]):
-            if cipher == "":
-                    break
-            decypheredRows[positionNormalKeys[sortedNormalKeys[i]]].append(cipher[0])
-            explanationRows[positionNormalKeys[sortedNormalKeys[i]]].append(cipher[0])
-            cipher = cipher[1:]
-    
-    print(decypheredRows)
-    indexNormalKey = 0
-    indexExplanationKey = 0
-    indexDisruptionKey = 0
-    plain = ""
-    for i in range(sum(lenRows)):
-        for c in range(valuesOfDisruptionKeys[disruptionKeys[indexDisruptionKey]]):
-            if decypheredRows[indexNormalKey] == []:
-                break
-            plain += decypheredRows[indexNormalKey][0]
-            decypheredRows[indexNormalKey].pop(0)
-            indexNormalKey = indexNormalKey + 1 if indexNormalKey < len(decypheredRows)-1 else 0
-            indexExplanationKey = indexExplanationKey + 1 if indexExplanationKey < len(explanationRows)-1 else 0
-        if not decypheredRows[indexNormalKey] == []:
-            decypheredRows[indexNormalKey].pop(0)
-        indexNormalKey = indexNormalKey + 1 if indexNormalKey < len(decypheredRows)-1 else 0
-        indexExplanationKey = indexExplanationKey + 1 if indexExplanationKey < len(explanationRows)-1 else 0
-        indexDisruptionKey = indexDisruptionKey + 1 if indexDisruptionKey < len(sortedDisruptionKeys)-1 else 0
-    
-    explanation = "Keyword: " + DisrColTransKey2.get() + "\nDisruption Key: " + DisrColTransKey2Num.get() + "\n______________________________\n"
-    for i in range(max([len(i) for i in explanationRows])):
-        for j in range(len(explanationRows)):
-            explanation += str(explanationRows[j][0]) + "\t" if not explanationRows[j] == [] else "  "
-            explanationRows[j].pop(0) if not explanationRows[j] == [] else None
-        explanation += "\n"
-        
-    TextPlain.insert("1.0", plain)
-    TextExplanation.insert("1.0", explanation)
+
+    def Decrypt():
+        plain, columns = Transposition.DisrColTrans2Decrypt(cipher, Key1, Key2)
+        explanation = "Keyword: " + Key1 + "\nDisruption Key: " + Key2 + "\n______________________________\n"
+        return plain, explanation + Transposition.ColumnsExplanation(columns)
+
+    Tasks.Run("method", Decrypt, ShowDecryption, ShowMethodError)
 
 # This function decrypts the text contained in the left
 # text field, assuming it was encrypted by use of the
@@ -383,13 +333,97 @@ def ADFGVXKeyChanged(var, index, mode):
     Key = NormalizeText(ADFGVXKey.get(), strict = True)
     if Key != ADFGVXKey.get():
         ADFGVXKey.set(Key)
-    pass
-    plain = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextPlain.insert("1.0", plain)
-    TextExplanation.insert("1.0", explanation)
+
+    def Decrypt():
+        plain = Transposition.ADFGVXDecrypt(cipher, Key)
+        substituted = Transposition.ADFGVXSubstitute(plain)
+        explanation = "Keyword: " + Key + "\n______________________________\n"
+        explanation += Transposition.GridExplanation(substituted, len(Key)) + "\n"
+        explanation += substituted + "\n\n" + Transposition.ADFGVXTableExplanation()
+        return plain, explanation
+
+    Tasks.Run("method", Decrypt, ShowDecryption, ShowMethodError)
+
+# This function is invoked when the user clicks the button
+# "Search keys".
+# It searches the keys of the rail fence, the skytale and
+# the columnar transposition by the n-gram statistics of the
+# sample text file, using all cores. The search runs as a
+# program of its own, since worker processes started by
+# this script would run the whole script again on Windows.
+# The best keys are shown below the settings and the
+# ciphertext is decrypted with the best one. The program
+# runs in the background, so the window does not freeze.
+def ButtonKeySearchClick():
+    global SearchProcess
+    ClearFeedbackLabels()
+    StopKeySearch()
+    cipher = NormalizeText(ViewCiph.Get())
+    # The program runs in the folder of CipherCore, so the
+    # path of the sample must not be relative.
+    command = [sys.executable, "-m", "CipherCore.TranspositionSearch",
+               os.path.abspath(PathSample.get()), "-", "--max-width", SpinboxSearchWidth.get()]
+    try:
+        SearchProcess = subprocess.Popen(command, stdin = subprocess.PIPE, stdout = subprocess.PIPE,
+                                         stderr = subprocess.PIPE, text = True, encoding = "utf-8",
+                                         cwd = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."),
+                                         start_new_session = (os.name == "posix"),
+                                         creationflags = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0))
+    except OSError as e:
+        LabelMethodFeedback["text"] = str(e)
+        return
+    search = SearchProcess
+
+    def Search():
+        output, errors = search.communicate(cipher)
+        if search.returncode != 0:
+            raise ValueError((errors.strip().splitlines() or ["Key search failed"])[-1])
+        keys = [json.loads(line) for line in output.splitlines()]
+        if len(keys) == 0:
+            raise ValueError("Ciphertext too short")
+        return keys
+
+    LabelMethodFeedback["text"] = "Searching keys..."
+    Tasks.Run("search", Search, ShowKeys, ShowSearchError)
+
+# This function stops the running key search and its worker
+# processes, if any.
+def StopKeySearch():
+    if (SearchProcess is not None) and (SearchProcess.poll() is None):
+        if os.name == "posix":
+            try:
+                os.killpg(SearchProcess.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        else:
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(SearchProcess.pid)], capture_output = True)
+        SearchProcess.wait()
+
+# This function shows the error of the key search.
+def ShowSearchError(e):
+    LabelMethodFeedback["text"] = str(e)
+
+# This function shows the keys found by the key search and
+# sets the best one.
+def ShowKeys(keys):
+    best = keys[0]
+    if best["method"] == "Skytale":
+        Method.set(1)
+        ChangeMethod()
+        SpinboxSkytaleDiameter.set(best["key"])
+        SkytaleDiameterChanged()
+    elif best["method"] == "RailFence":
+        Method.set(2)
+        ChangeMethod()
+        SpinboxRailLines.set(best["key"])
+        RailLinesChanged()
+    else:
+        Method.set(5)
+        DoubleColTrans.set("0")
+        ChangeMethod()
+        ColTransKey1.set(best["key"])
+        ColTransKeyChanged(0, 0, 0)
+    LabelMethodFeedback["text"] = "Best keys: " + ", ".join([str(key["key"]) for key in keys[:3]])
 
 # The window is divided into three frames.
 FramePlain = ttk.Frame(master = root)
@@ -423,6 +457,7 @@ LabelPlainFeedback = ttk.Label(master = FramePlain, text = "")
 LabelPlainFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextPlain = tk.Text(master = FramePlain, width = 10)
 TextPlain.pack(side = "bottom", fill = "both", expand = True, padx = 25, pady = 10)
+ViewPlain = TextView.TextView(TextPlain)
 
 FrameExplanation = ttk.Frame(master = FrameCiph)
 FrameExplanation["relief"] = "groove"
@@ -433,6 +468,7 @@ LabelExplanation.pack(side = "top", pady = 5)
 TextExplanation = tk.Text(master = FrameExplanation, width = 10, height = 25,
                           wrap = "none")
 TextExplanation.pack(side = "bottom", fill = "both", expand = True, padx = 20, pady = 10)
+ViewExplanation = TextView.TextView(TextExplanation)
 
 LabelMethodSettings = ttk.Label(master = FrameMethod, text = "Settings")
 LabelMethodSettings.pack(side = "top", pady = 5)
@@ -476,7 +512,7 @@ LabelSkytaleDiameter = ttk.Label(master = FrameSkytaleDiameter, text = "Diameter
 LabelSkytaleDiameter.pack(side = "left")
 SpinboxSkytaleDiameter = ttk.Spinbox(master = FrameSkytaleDiameter,
                                      from_ = 2, to = 15, width = 3,
-                                     command = SkytaleDiameterChanged)
+                                     command = Debounced(SkytaleDiameterChanged))
 SpinboxSkytaleDiameter.set(5)
 SpinboxSkytaleDiameter.pack(side = "right", padx = 2)
 
@@ -493,7 +529,7 @@ LabelRailLines = ttk.Label(master = FrameRailLines, text = "No. of lines")
 LabelRailLines.pack(side = "left")
 SpinboxRailLines = ttk.Spinbox(master = FrameRailLines,
                                from_ = 2, to = 15, width = 3,
-                               command = RailLinesChanged)
+                               command = Debounced(RailLinesChanged))
 SpinboxRailLines.set(5)
 SpinboxRailLines.pack(side = "right", padx = 2)
 
@@ -509,7 +545,7 @@ FrameRedefenceKey.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelRedefenceKey = ttk.Label(master = FrameRedefenceKey, text = "Key")
 LabelRedefenceKey.pack(side = "left")
 RedefenceKey = tk.StringVar(value = "KEY")
-RedefenceKey.trace_add("write", RedefenceKeyChanged)
+RedefenceKey.trace_add("write", Debounced(RedefenceKeyChanged))
 EntryRedefenceKey = ttk.Entry(master = FrameRedefenceKey, text = RedefenceKey,
                               width = 11)
 EntryRedefenceKey.pack(side = "right", padx = 2)
@@ -527,7 +563,7 @@ LabelRotationLength = ttk.Label(master = FrameRotationLength, text = "Block size
 LabelRotationLength.pack(side = "left")
 SpinboxRotationLength = ttk.Spinbox(master = FrameRotationLength,
                                     from_ = 2, to = 15, width = 3,
-                                    command = RotationChanged)
+                                    command = Debounced(RotationChanged))
 SpinboxRotationLength.set(5)
 SpinboxRotationLength.pack(side = "right", padx = 2)
 FrameRotationAngle = ttk.Frame(master = FrameRotation)
@@ -536,7 +572,7 @@ LabelRotationAngle = ttk.Label(master = FrameRotationAngle, text = "Angle of rot
 LabelRotationAngle.pack(side = "left")
 SpinboxRotationAngle = ttk.Spinbox(master = FrameRotationAngle,
                                    values = ["90°", "270°"], width = 5,
-                                   wrap = True, command = RotationChanged)
+                                   wrap = True, command = Debounced(RotationChanged))
 SpinboxRotationAngle.set("90°")
 SpinboxRotationAngle.pack(side = "right", padx = 2)
 
@@ -552,14 +588,14 @@ FrameColTrans1.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelColTrans1 = ttk.Label(master = FrameColTrans1, text = "Key 1")
 LabelColTrans1.pack(side = "left")
 ColTransKey1 = tk.StringVar(value = "KEY")
-ColTransKey1.trace_add("write", ColTransKeyChanged)
+ColTransKey1.trace_add("write", Debounced(ColTransKeyChanged))
 EntryColTrans1 = ttk.Entry(master = FrameColTrans1, text = ColTransKey1,
                            width = 11)
 EntryColTrans1.pack(side = "right", padx = 2)
 Myszkowski = tk.StringVar(value = 0)
-Myszkowski.trace_add("write", MyszkowskiChanged)
+Myszkowski.trace_add("write", Debounced(MyszkowskiChanged))
 DoubleColTrans = tk.StringVar(value = 0)
-DoubleColTrans.trace_add("write", DoubleColTransChanged)
+DoubleColTrans.trace_add("write", Debounced(DoubleColTransChanged))
 CheckMyszkowski = ttk.Checkbutton(master = FrameColTrans,
                                   text = "Use Myszkowski",
                                   variable = Myszkowski)
@@ -573,7 +609,7 @@ FrameColTrans2.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelColTrans2 = ttk.Label(master = FrameColTrans2, text = "Key 2")
 LabelColTrans2.pack(side = "left")
 ColTransKey2 = tk.StringVar(value = "KEY")
-ColTransKey2.trace_add("write", ColTransKeyChanged)
+ColTransKey2.trace_add("write", Debounced(ColTransKeyChanged))
 EntryColTrans2 = ttk.Entry(master = FrameColTrans2, text = ColTransKey2,
                            width = 11)
 EntryColTrans2.pack(side = "right", padx = 2)
@@ -591,7 +627,7 @@ FrameDisrColTransKey.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelDisrColTransKey = ttk.Label(master = FrameDisrColTransKey, text = "Key")
 LabelDisrColTransKey.pack(side = "left")
 DisrColTransKey = tk.StringVar(value = "KEY")
-DisrColTransKey.trace_add("write", DisrColTransKeyChanged)
+DisrColTransKey.trace_add("write", Debounced(DisrColTransKeyChanged))
 EntryDisrColTrans = ttk.Entry(master = FrameDisrColTransKey,
                               text = DisrColTransKey,
                               width = 11)
@@ -610,7 +646,7 @@ FrameDisrColTransKey2.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelDisrColTransKey2 = ttk.Label(master = FrameDisrColTransKey2, text = "Key")
 LabelDisrColTransKey2.pack(side = "left")
 DisrColTransKey2 = tk.StringVar(value = "KEY")
-DisrColTransKey2.trace_add("write", DisrColTransKey2Changed)
+DisrColTransKey2.trace_add("write", Debounced(DisrColTransKey2Changed))
 EntryDisrColTrans2 = ttk.Entry(master = FrameDisrColTransKey2,
                                   text = DisrColTransKey2,
                                   width = 11)
@@ -620,7 +656,7 @@ FrameDisrColTransKey2Num.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelDisrColTransKey2Num = ttk.Label(master = FrameDisrColTransKey2Num, text = "Disruption key")
 LabelDisrColTransKey2Num.pack(side = "left")
 DisrColTransKey2Num = tk.StringVar(value = "FILL")
-DisrColTransKey2Num.trace_add("write", DisrColTransKey2Changed)
+DisrColTransKey2Num.trace_add("write", Debounced(DisrColTransKey2Changed))
 EntryDisrColTrans2Num = ttk.Entry(master = FrameDisrColTransKey2Num,
                                      text = DisrColTransKey2Num,
                                      width = 11)
@@ -639,12 +675,36 @@ FrameADFGVXKey.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelADFGVXKey = ttk.Label(master = FrameADFGVXKey, text = "Key")
 LabelADFGVXKey.pack(side = "left")
 ADFGVXKey = tk.StringVar(value = "KEY")
-ADFGVXKey.trace_add("write", ADFGVXKeyChanged)
+ADFGVXKey.trace_add("write", Debounced(ADFGVXKeyChanged))
 EntryADFGVX = ttk.Entry(master = FrameADFGVXKey,
                         text = ADFGVXKey,
                         width = 11)
 EntryADFGVX.pack(side = "right", padx = 2)
 
+FrameKeySearch = ttk.Frame(master = FrameMethodR)
+FrameKeySearch["relief"] = "groove"
+FrameKeySearch.pack(side = "top", fill = "both")
+LabelKeySearch = ttk.Label(master = FrameKeySearch, text = "Key search (rail fence,\nskytale, columnar)")
+LabelKeySearch.pack(side = "top", pady = 5)
+FrameSample = ttk.Frame(master = FrameKeySearch)
+FrameSample.pack(side = "top", fill = "both", padx = 10, pady = 8)
+LabelSample = ttk.Label(master = FrameSample, text = "Sample text")
+LabelSample.pack(side = "left")
+PathSample = tk.StringVar(value = "./sample.txt")
+EntrySample = ttk.Entry(master = FrameSample, text = PathSample, width = 11)
+EntrySample.pack(side = "right", padx = 2)
+FrameSearchWidth = ttk.Frame(master = FrameKeySearch)
+FrameSearchWidth.pack(side = "top", fill = "both", padx = 10, pady = 8)
+LabelSearchWidth = ttk.Label(master = FrameSearchWidth, text = "Max. key length")
+LabelSearchWidth.pack(side = "left")
+SpinboxSearchWidth = ttk.Spinbox(master = FrameSearchWidth,
+                                 from_ = 2, to = 10, width = 3)
+SpinboxSearchWidth.set(8)
+SpinboxSearchWidth.pack(side = "right", padx = 2)
+ButtonKeySearch = ttk.Button(master = FrameKeySearch, text = "Search keys",
+                             command = ButtonKeySearchClick)
+ButtonKeySearch.pack(side = "top", pady = 5)
+
 LabelCiphCaption = ttk.Label(master = FrameCiph, text = "Ciphertext")
 LabelCiphCaption.pack(side = "top", pady = 5)
 FrameCiphBtnEntry = ttk.Frame(master = FrameCiph)
@@ -661,7 +721,17 @@ LabelCiphFeedback = ttk.Label(master = FrameCiph, text = "")
 LabelCiphFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextCiph = tk.Text(master = FrameCiph, width = 10)
 TextCiph.pack(side = "top", fill = "both", expand = True, padx = 25, pady = 10)
+ViewCiph = TextView.TextView(TextCiph)
 
 
 ChangeMethod()
+# This function is invoked when the window is closed.
+# It stops the key search and the worker threads of the
+# scheduler and closes the window.
+def WindowClosed():
+    StopKeySearch()
+    Tasks.Close()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", WindowClosed)
 root.mainloop()
@@ -1,6 +1,16 @@
 # tkinter provides GUI objects and commands
+# os and sys are needed to find the CipherCore package
+# in the parent folder of this script
+# CipherCore provides the cipher functions
 import tkinter as tk
 import tkinter.ttk as ttk
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from CipherCore import Normalization
+from CipherCore import Scheduler
+from CipherCore import TextView
+from CipherCore import Transposition
 
 # An object (root) is created which represents the window.
 # Its title and full screen property are set.
@@ -8,29 +18,16 @@ root = tk.Tk()
 root.title("Transpositional encryptions")
 root.wm_state("zoomed")
 
+# The scheduler runs the en- or decryptions in the background,
+# so the window does not freeze on long texts.
+Tasks = Scheduler.Scheduler(root)
+
 # This function normalizes the parameter text according to the
 # settings "Keep blanks" and "Keep non-alphabetic chars".
 def NormalizeText(text, strict = False):
-    s = ""
-    for c in text:
-        if ((ord(c) <= ord("Z")) and (ord(c) >= ord("A"))):
-            s += c
-        elif ((ord(c) <= ord("z")) and (ord(c) >= ord("a"))):
-            s += chr(ord(c) + ord("A") - ord("a"))
-        elif ((c == "ä") or (c == "Ä")):
-            s += "AE"
-        elif ((c == "ö") or (c == "Ö")):
-            s += "OE"
-        elif ((c == "ü") or (c == "Ü")):
-            s += "UE"
-        elif (c == "ß"):
-            s += "SS"
-        elif ((c == " ") or (ord(c) == 10)):
-            if ((KeepBlanks.get() == "1") and not strict):
-                s += " "
-        elif ((KeepNonalpha.get() == "1") and not strict):
-            s += c
-    return s
+    return Normalization.NormalizeText(text,
+                                       KeepBlanks = (KeepBlanks.get() == "1") and not strict,
+                                       KeepNonalpha = (KeepNonalpha.get() == "1") and not strict)
 
 # The labels used to interact with the user are cleared.
 def ClearFeedbackLabels():
@@ -56,8 +53,7 @@ def ButtonPlainLoadClick():
             LabelPlainFeedback["text"] = "File empty"
         else:
             plain = NormalizeText(plain)
-            TextPlain.delete("1.0", "end")
-            TextPlain.insert("1.0", plain)
+            ViewPlain.Set(plain)
             LabelPlainFeedback["text"] = "File loaded successfully."
 
 # This function is invoked when the user clicks the button
@@ -69,7 +65,7 @@ def ButtonPlainLoadClick():
 # textfile succeeded.
 def ButtonCiphSaveClick():
     ClearFeedbackLabels()
-    ciph = TextCiph.get("1.0", "end")[:-1]
+    ciph = ViewCiph.Get()
     if len(ciph) < 1:
         LabelCiphFeedback["text"] = "Nothing to save"
         return
@@ -124,25 +120,40 @@ def ChangeMethod():
         ADFGVXKey.set(ADFGVXKey.get())
 
 # This function collects all necessary preparations for the
-# ensuing encryption like clearing of text fields.
+# ensuing encryption like normalizing the text. The old result
+# stays until the new one is computed, so only the part of
+# it that changes has to be redrawn.
 def PrepareForEncryption():
     ClearFeedbackLabels()
-    TextCiph.delete("1.0", "end")
-    TextExplanation.delete("1.0", "end")
-    plain = NormalizeText(TextPlain.get("1.0", "end")[:-1])
-    TextPlain.delete("1.0", "end")
-    TextPlain.insert("1.0", plain)
+    plain = NormalizeText(ViewPlain.Get())
+    ViewPlain.Set(plain)
     return plain
 
+# This function prints the ciphertext and the explanation
+# once they are computed in the background.
+def ShowEncryption(result):
+    cipher, explanation = result
+    ViewCiph.Set(cipher)
+    ViewExplanation.Set(explanation)
+
+# This function tells the user why the encryption failed.
+def ShowMethodError(e):
+    ViewCiph.Set("")
+    ViewExplanation.Set("")
+    LabelMethodFeedback["text"] = str(e)
+
+# This function returns the callback of a spin box or key
+# variable, which runs the handler once the user has not
+# changed the settings for a moment.
+def Debounced(handler):
+    return lambda *args: Tasks.Debounce("method", lambda: handler(*args))
+
 # This function encrypts the text contained in the left
 # text field, by use of the reverse cipher.
 def DoReverseCipher():
     plain = PrepareForEncryption()
-    pass
-    cipher = plain[::-1]
-    #erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextCiph.insert("1.0", cipher)
+    Tasks.Run("method", lambda: (Transposition.ReverseCipher(plain), ""),
+              ShowEncryption, ShowMethodError)
 
 # This function encrypts the text contained in the left
 # text field, imitating the skytale.
@@ -152,13 +163,13 @@ def DoReverseCipher():
 # diagonally to explain how the ciphertext is obtained.
 def SkytaleDiameterChanged():
     plain = PrepareForEncryption()
-    pass
-    cipher = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextCiph.insert("1.0", cipher)
-    TextExplanation.insert("1.0", explanation)
+    diameter = SpinboxSkytaleDiameter.get()
+
+    def Encrypt():
+        return (Transposition.SkytaleEncrypt(plain, int(diameter)),
+                Transposition.GridExplanation(plain, -(-len(plain) // int(diameter))))
+
+    Tasks.Run("method", Encrypt, ShowEncryption, ShowMethodError)
 
 # This function encrypts the text contained in the left
 # text field, by use of the rail fence.
@@ -168,13 +179,13 @@ def SkytaleDiameterChanged():
 # in zig-zag to explain how the ciphertext is obtained.
 def RailLinesChanged():
     plain = PrepareForEncryption()
-    pass
-    cipher = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextCiph.insert("1.0", cipher)
-    TextExplanation.insert("1.0", explanation)
+    lines = SpinboxRailLines.get()
+
+    def Encrypt():
+        return (Transposition.RailFenceEncrypt(plain, int(lines)),
+                Transposition.RailExplanation(plain, int(lines)))
+
+    Tasks.Run("method", Encrypt, ShowEncryption, ShowMethodError)
 
 # This function encrypts the text contained in the left
 # text field, by use of the redefence cipher.
@@ -188,13 +199,12 @@ def RedefenceKeyChanged(var, index, mode):
     Key = NormalizeText(RedefenceKey.get(), strict = True)
     if Key != RedefenceKey.get():
         RedefenceKey.set(Key)
-    pass
-    cipher = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextCiph.insert("1.0", cipher)
-    TextExplanation.insert("1.0", explanation)
+
+    def Encrypt():
+        return (Transposition.RedefenceEncrypt(plain, Key),
+                Transposition.RailExplanation(plain, len(Key), Key))
+
+    Tasks.Run("method", Encrypt, ShowEncryption, ShowMethodError)
 
 # This function encrypts the text contained in the left
 # text field, by use of the rotation cipher.
@@ -202,13 +212,14 @@ def RedefenceKeyChanged(var, index, mode):
 # the block size or the angle of rotation are changed.
 def RotationChanged():
     plain = PrepareForEncryption()
-    pass
-    cipher = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextCiph.insert("1.0", cipher)
-    TextExplanation.insert("1.0", explanation.strip())
+    BlockSize = SpinboxRotationLength.get()
+    angle = SpinboxRotationAngle.get().rstrip("°")
+
+    def Encrypt():
+        return (Transposition.RotationEncrypt(plain, int(BlockSize), int(angle)),
+                Transposition.RotationExplanation(plain, int(BlockSize)).strip())
+
+    Tasks.Run("method", Encrypt, ShowEncryption, ShowMethodError)
 
 # This function is invoked when the Myszkowski check
 # box is altered. It simulates a change of the key.
@@ -234,13 +245,20 @@ def ColTransKeyChanged(var, index, mode):
     Key2 = NormalizeText(ColTransKey2.get(), strict = True)
     if Key2 != ColTransKey2.get():
         ColTransKey2.set(Key2)
-    pass
-    cipher = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextCiph.insert("1.0", cipher)
-    TextExplanation.insert("1.0", explanation)
+    keys = [Key1, Key2] if DoubleColTrans.get() == "1" else [Key1]
+    UseMyszkowski = Myszkowski.get() == "1"
+
+    def Encrypt():
+        cipher = Transposition.ColTransEncrypt(plain, keys, Myszkowski = UseMyszkowski)
+        explanation = ""
+        text = plain
+        for Key in keys:
+            explanation += "Keyword: " + Key + "\n______________________________\n"
+            explanation += Transposition.GridExplanation(text, len(Key)) + "\n"
+            text = Transposition.ColTransEncrypt(text, [Key], Myszkowski = UseMyszkowski)
+        return cipher, explanation
+
+    Tasks.Run("method", Encrypt, ShowEncryption, ShowMethodError)
 
 # This function encrypts the text contained in the left
 # text field, by use of the disrupted columnar
@@ -256,13 +274,14 @@ def DisrColTransKeyChanged(var, index, mode):
     Key = NormalizeText(DisrColTransKey.get(), strict = True)
     if Key != DisrColTransKey.get():
         DisrColTransKey.set(Key)
-    pass
-    cipher = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextCiph.insert("1.0", cipher)
-    TextExplanation.insert("1.0", explanation)
+
+    def Encrypt():
+        cipher = Transposition.DisrColTransEncrypt(plain, Key)
+        explanation = "Keyword: " + Key + "\n______________________________\n"
+        explanation += Transposition.ColumnsExplanation(Transposition.CipherColumns(cipher, Key))
+        return cipher, explanation
+
+    Tasks.Run("method", Encrypt, ShowEncryption, ShowMethodError)
 
 # This function encrypts the text contained in the left
 # text field, by use of the disrupted columnar
@@ -282,65 +301,14 @@ def DisrColTransKey2Changed(var, index, mode):
     if Key2 != DisrColTransKey2Num.get():
         DisrColTransKey2Num.set(Key2)
         #Disruption Key
-    
-    valuesOfNormalKeys = {}
-    valuesOfDisruptionKeys = {}
-    normalKeys = []
-    disruptionKeys = []
-    for l in range(len(DisrColTransKey2.get())):
-        normalKeys.append([*DisrColTransKey2.get()][l]) if [*DisrColTransKey2.get()][l] not in normalKeys else normalKeys.append([*DisrColTransKey2.get()][l]+str(l))
-    for l in range(len(DisrColTransKey2Num.get())):
-        disruptionKeys.append([*DisrColTransKey2Num.get()][l]) if [*DisrColTransKey2Num.get()][l] not in disruptionKeys else disruptionKeys.append([*DisrColTransKey2Num.get()][l]+str(l))
-    sortedNormalKeys = sorted(normalKeys)
-    sortedDisruptionKeys = sorted(disruptionKeys)
-    for c in normalKeys:
-        valuesOfNormalKeys[c] = sortedNormalKeys.index(c)
-        
-    for c in disruptionKeys:
-        valuesOfDisruptionKeys[c] = sortedDisruptionKeys.index(c)
-    cypheredRows = []
-    explanationRows = []
-    for i in range(len(DisrColTransKey2.get())):
-        cypheredRows.append([])
-        
-    for i in range(len(DisrColTransKey2.get())):
-        explanationRows.append([])
-    
-    indexNormalKey = 0
-    indexExplanationKey = 0
-    indexDisruptionKey = 0
-    while not plain == "":
-        if len(DisrColTransKey2Num.get()) > 1:
-            for c in range(valuesOfDisruptionKeys[disruptionKeys[indexDisruptionKey]]):
-                if plain == "":
-                    break
-                cypheredRows[indexNormalKey].append(plain[0])
-                explanationRows[indexExplanationKey].append(plain[0])
-                plain = plain[1:]
-                indexNormalKey = indexNormalKey + 1 if indexNormalKey < len(cypheredRows)-1 else 0
-                indexExplanationKey = indexExplanationKey + 1 if indexExplanationKey < len(explanationRows)-1 else 0
-            cypheredRows[indexNormalKey].append(" ")
-            indexNormalKey = indexNormalKey + 1 if indexNormalKey < len(cypheredRows)-1 else 0
-            explanationRows[indexExplanationKey].append(" ")
-            indexExplanationKey = indexExplanationKey + 1 if indexExplanationKey < len(explanationRows)-1 else 0
-            indexDisruptionKey = indexDisruptionKey + 1 if indexDisruptionKey < len(sortedDisruptionKeys)-1 else 0
-        else:
-            break
-        
-    cipher = ""
-    print(cypheredRows)
-    for i in range(len(cypheredRows)):
-        for c in cypheredRows[normalKeys.index(sortedNormalKeys[i])]:
-            cipher += c
-    
-    explanation = "Keyword: " + DisrColTransKey2.get() + "\nDisruption Key: " + DisrColTransKey2Num.get() + "\n______________________________\n"
-    for i in range(max([len(i) for i in explanationRows])):
-        for j in range(len(explanationRows)):
-            explanation += str(explanationRows[j][0]) + "\t" if not explanationRows[j] == [] else "  "
-            explanationRows[j].pop(0) if not explanationRows[j] == [] else None
-        explanation += "\n"
-    TextCiph.insert("1.0", cipher)
-    TextExplanation.insert("1.0", explanation)
+
+    def Encrypt():
+        cipher = Transposition.DisrColTrans2Encrypt(plain, Key1, Key2)
+        explanation = "Keyword: " + Key1 + "\nDisruption Key: " + Key2 + "\n______________________________\n"
+        explanation += Transposition.ColumnsExplanation(Transposition.CipherColumns(cipher, Key1))
+        return cipher, explanation
+
+    Tasks.Run("method", Encrypt, ShowEncryption, ShowMethodError)
 
 # This function encrypts the text contained in the left
 # text field, by use of the ADFGVX cipher.
@@ -354,13 +322,15 @@ def ADFGVXKeyChanged(var, index, mode):
     Key = NormalizeText(ADFGVXKey.get(), strict = True)
     if Key != ADFGVXKey.get():
         ADFGVXKey.set(Key)
-    pass
-    cipher = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    explanation = ""#erase this line, its only purpose is to
-    #avoid an error when running the script for the first time
-    TextCiph.insert("1.0", cipher)
-    TextExplanation.insert("1.0", explanation)
+
+    def Encrypt():
+        substituted = Transposition.ADFGVXSubstitute(plain)
+        explanation = Transposition.ADFGVXTableExplanation() + "\n" + substituted + "\n\n"
+        explanation += "Keyword: " + Key + "\n______________________________\n"
+        explanation += Transposition.GridExplanation(substituted, len(Key))
+        return Transposition.ADFGVXEncrypt(plain, Key), explanation
+
+    Tasks.Run("method", Encrypt, ShowEncryption, ShowMethodError)
 
 # The window is divided into three frames.
 FramePlain = ttk.Frame(master = root)
@@ -394,6 +364,7 @@ LabelPlainFeedback = ttk.Label(master = FramePlain, text = "")
 LabelPlainFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextPlain = tk.Text(master = FramePlain, width = 10)
 TextPlain.pack(side = "top", fill = "both", expand = True, padx = 25, pady = 10)
+ViewPlain = TextView.TextView(TextPlain)
 
 FrameExplanation = ttk.Frame(master = FramePlain)
 FrameExplanation["relief"] = "groove"
@@ -404,6 +375,7 @@ LabelExplanation.pack(side = "top", pady = 5)
 TextExplanation = tk.Text(master = FrameExplanation, width = 10, height = 25,
                           wrap = "none")
 TextExplanation.pack(side = "bottom", fill = "both", expand = True, padx = 20, pady = 10)
+ViewExplanation = TextView.TextView(TextExplanation)
 
 LabelMethodSettings = ttk.Label(master = FrameMethod, text = "Settings")
 LabelMethodSettings.pack(side = "top", pady = 5)
@@ -447,7 +419,7 @@ LabelSkytaleDiameter = ttk.Label(master = FrameSkytaleDiameter, text = "Diameter
 LabelSkytaleDiameter.pack(side = "left")
 SpinboxSkytaleDiameter = ttk.Spinbox(master = FrameSkytaleDiameter,
                                      from_ = 2, to = 15, width = 3,
-                                     command = SkytaleDiameterChanged)
+                                     command = Debounced(SkytaleDiameterChanged))
 SpinboxSkytaleDiameter.set(5)
 SpinboxSkytaleDiameter.pack(side = "right", padx = 2)
 
@@ -464,7 +436,7 @@ LabelRailLines = ttk.Label(master = FrameRailLines, text = "No. of lines")
 LabelRailLines.pack(side = "left")
 SpinboxRailLines = ttk.Spinbox(master = FrameRailLines,
                                from_ = 2, to = 15, width = 3,
-                               command = RailLinesChanged)
+                               command = Debounced(RailLinesChanged))
 SpinboxRailLines.set(5)
 SpinboxRailLines.pack(side = "right", padx = 2)
 
@@ -480,7 +452,7 @@ FrameRedefenceKey.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelRedefenceKey = ttk.Label(master = FrameRedefenceKey, text = "Key")
 LabelRedefenceKey.pack(side = "left")
 RedefenceKey = tk.StringVar(value = "KEY")
-RedefenceKey.trace_add("write", RedefenceKeyChanged)
+RedefenceKey.trace_add("write", Debounced(RedefenceKeyChanged))
 EntryRedefenceKey = ttk.Entry(master = FrameRedefenceKey, text = RedefenceKey,
                               width = 11)
 EntryRedefenceKey.pack(side = "right", padx = 2)
@@ -498,7 +470,7 @@ LabelRotationLength = ttk.Label(master = FrameRotationLength, text = "Block size
 LabelRotationLength.pack(side = "left")
 SpinboxRotationLength = ttk.Spinbox(master = FrameRotationLength,
                                     from_ = 2, to = 15, width = 3,
-                                    command = RotationChanged)
+                                    command = Debounced(RotationChanged))
 SpinboxRotationLength.set(5)
 SpinboxRotationLength.pack(side = "right", padx = 2)
 FrameRotationAngle = ttk.Frame(master = FrameRotation)
@@ -507,7 +479,7 @@ LabelRotationAngle = ttk.Label(master = FrameRotationAngle, text = "Angle of rot
 LabelRotationAngle.pack(side = "left")
 SpinboxRotationAngle = ttk.Spinbox(master = FrameRotationAngle,
                                    values = ["90°", "270°"], width = 5,
-                                   wrap = True, command = RotationChanged)
+                                   wrap = True, command = Debounced(RotationChanged))
 SpinboxRotationAngle.set("90°")
 SpinboxRotationAngle.pack(side = "right", padx = 2)
 
@@ -523,14 +495,14 @@ FrameColTrans1.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelColTrans1 = ttk.Label(master = FrameColTrans1, text = "Key 1")
 LabelColTrans1.pack(side = "left")
 ColTransKey1 = tk.StringVar(value = "KEY")
-ColTransKey1.trace_add("write", ColTransKeyChanged)
+ColTransKey1.trace_add("write", Debounced(ColTransKeyChanged))
 EntryColTrans1 = ttk.Entry(master = FrameColTrans1, text = ColTransKey1,
                            width = 11)
 EntryColTrans1.pack(side = "right", padx = 2)
 Myszkowski = tk.StringVar(value = 0)
-Myszkowski.trace_add("write", MyszkowskiChanged)
+Myszkowski.trace_add("write", Debounced(MyszkowskiChanged))
 DoubleColTrans = tk.StringVar(value = 0)
-DoubleColTrans.trace_add("write", DoubleColTransChanged)
+DoubleColTrans.trace_add("write", Debounced(DoubleColTransChanged))
 CheckMyszkowski = ttk.Checkbutton(master = FrameColTrans,
                                   text = "Use Myszkowski",
                                   variable = Myszkowski)
@@ -544,7 +516,7 @@ FrameColTrans2.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelColTrans2 = ttk.Label(master = FrameColTrans2, text = "Key 2")
 LabelColTrans2.pack(side = "left")
 ColTransKey2 = tk.StringVar(value = "KEY")
-ColTransKey2.trace_add("write", ColTransKeyChanged)
+ColTransKey2.trace_add("write", Debounced(ColTransKeyChanged))
 EntryColTrans2 = ttk.Entry(master = FrameColTrans2, text = ColTransKey2,
                            width = 11)
 EntryColTrans2.pack(side = "right", padx = 2)
@@ -562,7 +534,7 @@ FrameDisrColTransKey.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelDisrColTransKey = ttk.Label(master = FrameDisrColTransKey, text = "Key")
 LabelDisrColTransKey.pack(side = "left")
 DisrColTransKey = tk.StringVar(value = "KEY")
-DisrColTransKey.trace_add("write", DisrColTransKeyChanged)
+DisrColTransKey.trace_add("write", Debounced(DisrColTransKeyChanged))
 EntryDisrColTrans = ttk.Entry(master = FrameDisrColTransKey,
                               text = DisrColTransKey,
                               width = 11)
@@ -581,7 +553,7 @@ FrameDisrColTransKey2.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelDisrColTransKey2 = ttk.Label(master = FrameDisrColTransKey2, text = "Key")
 LabelDisrColTransKey2.pack(side = "left")
 DisrColTransKey2 = tk.StringVar(value = "KEY")
-DisrColTransKey2.trace_add("write", DisrColTransKey2Changed)
+DisrColTransKey2.trace_add("write", Debounced(DisrColTransKey2Changed))
 EntryDisrColTrans2 = ttk.Entry(master = FrameDisrColTransKey2,
                                   text = DisrColTransKey2,
                                   width = 11)
@@ -591,7 +563,7 @@ FrameDisrColTransKey2Num.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelDisrColTransKey2Num = ttk.Label(master = FrameDisrColTransKey2Num, text = "Disruption key")
 LabelDisrColTransKey2Num.pack(side = "left")
 DisrColTransKey2Num = tk.StringVar(value = "FILL")
-DisrColTransKey2Num.trace_add("write", DisrColTransKey2Changed)
+DisrColTransKey2Num.trace_add("write", Debounced(DisrColTransKey2Changed))
 EntryDisrColTrans2Num = ttk.Entry(master = FrameDisrColTransKey2Num,
                                      text = DisrColTransKey2Num,
                                      width = 11)
@@ -610,7 +582,7 @@ FrameADFGVXKey.pack(side = "top", fill = "both", padx = 10, pady = 8)
 LabelADFGVXKey = ttk.Label(master = FrameADFGVXKey, text = "Key")
 LabelADFGVXKey.pack(side = "left")
 ADFGVXKey = tk.StringVar(value = "KEY")
-ADFGVXKey.trace_add("write", ADFGVXKeyChanged)
+ADFGVXKey.trace_add("write", Debounced(ADFGVXKeyChanged))
 EntryADFGVX = ttk.Entry(master = FrameADFGVXKey,
                         text = ADFGVXKey,
                         width = 11)
@@ -632,7 +604,16 @@ LabelCiphFeedback = ttk.Label(master = FrameCiph, text = "")
 LabelCiphFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextCiph = tk.Text(master = FrameCiph, width = 10)
 TextCiph.pack(side = "bottom", fill = "both", expand = True, padx = 25, pady = 10)
+ViewCiph = TextView.TextView(TextCiph)
 
     
 ChangeMethod()
+# This function is invoked when the window is closed.
+# It stops the worker thread of the scheduler and closes the
+# window.
+def WindowClosed():
+    Tasks.Close()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", WindowClosed)
 root.mainloop()
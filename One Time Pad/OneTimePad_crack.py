@@ -1,6 +1,15 @@
 # tkinter provides GUI objects and commands
+# os and sys are needed to find the CipherCore package
+# in the parent folder of this script
+# CipherCore provides the cipher functions
 import tkinter as tk
 import tkinter.ttk as ttk
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from CipherCore import Hex
+from CipherCore import OneTimePad
+from CipherCore import Scheduler
 
 # An object (root) is created which represents the window.
 # Its title and full screen property are set.
@@ -8,6 +17,10 @@ root = tk.Tk()
 root.title("One-time pad crib drag")
 root.wm_state("zoomed")
 
+# The scheduler runs the crib drag in the background, so
+# typing the guess does not freeze the window.
+Tasks = Scheduler.Scheduler(root)
+
 # This function is invoked when the user clicks the button
 # "Load cipher data from file".
 # According to the option "Load as text file" it either:
@@ -25,13 +38,11 @@ def ButtonCiphLoadClick():
         if LoadAsText.get() == "1":
             with open(PathCiph.get(), mode = "rt", encoding = "utf-8") as CiphFile:
                 ciph = CiphFile.read()
-                try:
-                    CheckHex(ciph)
-                except:
+                if CheckHex(ciph) == None:
                     LabelCiphFeedback["text"] = "Text in the file is incorrectly formatted."
         else:
             with open(PathCiph.get(), mode = "br") as CiphFile:
-                ciph = ToHexStr(CiphFile.read())
+                ciph = Hex.ToHexStr(CiphFile.read())
     except:
         LabelCiphFeedback["text"] = "An error occurred while reading the file."
     else:
@@ -44,47 +55,15 @@ def ButtonCiphLoadClick():
             if LoadAsText.get() == "1":
                 CiphChanged()
 
-# This function formats the input data as a string of
-# hexadecimal values for each byte separated by spaces,
-# e.g. "a3 e2 00"
-def ToHexStr(data):
-    data = list(data)
-    DataList = [format(int(data[i]), "x").zfill(2) for i in range(len(data))]
-    return " ".join(DataList)
-
-# This function checks if the received string is
-# a hexadecimal value between 0 and 255. 
+# This function checks if the received string is a grid
+# of hexadecimal values between 0 and 255 and tells the
+# user what is wrong otherwise.
 def CheckHex(ciph):
-    FeedbackMessage = ""
     try:
-        ciph = ciph.split("\n")
-        for i in range(len(ciph)):
-            ciph[i] = ciph[i].split()
-        if (len(ciph) < 2) or (len(ciph[1]) < 1):
-            FeedbackMessage = "Text contains only one line."
-            raise Exception
-        n = len(ciph[0])
-        for i in range(len(ciph)):
-            if len(ciph[i]) > n:
-                FeedbackMessage = "One line is longer than the first line."
-                raise Exception
-            if (len(ciph[i]) < n) and (i < len(ciph)-1):
-                FeedbackMessage = "One line (and not the last one) is shorter than the first."
-                raise Exception
-            for j in range(len(ciph[i])):
-                try:
-                    k = int(ciph[i][j], 16)
-                    if (k < 0) or (k > 255):
-                        raise Exception
-                except:
-                    FeedbackMessage = "Some entries are not a hexadecimal number from 0 to 255."
-                    raise
-    except:
-        if FeedbackMessage == "":
-            FeedbackMessage = "Incorrectly formatted ciphertext"
-        LabelCiphFeedback["text"] = FeedbackMessage
+        return OneTimePad.CheckHex(ciph)
+    except ValueError as e:
+        LabelCiphFeedback["text"] = str(e)
         return None
-    return ciph
 
 # This function formats the * and letters in PlainGrid
 # as a string and prints in the TextPlain field.
@@ -98,27 +77,30 @@ def PrintPlaintext():
 # filled with letters and "*" respectively.
 def CiphChanged():
     global CiphGrid
+    global CiphCache
     global PlainGrid
     TextPlain.delete("1.0", "end")
     ciph = CheckHex(TextCiph.get("1.0", "end")[:-1])
     if ciph == None:
         return
     LabelCiphFeedback["text"] = ""
-    CiphGrid = [[0 for j in range(len(ciph[i]))] for i in range(len(ciph))]
+    CiphGrid = ciph
+    CiphCache = OneTimePad.CribDragCache(*OneTimePad.CiphMatrix(ciph))
     PlainGrid = [["*" for j in range(len(ciph[i]))] for i in range(len(ciph))]
-    for i in range(len(ciph)):
-        for j in range(len(ciph[i])):
-            CiphGrid[i][j] = int(ciph[i][j], 16)
     PrintPlaintext()
     GuessChanged(Guess.get())
 
 # This function is invoked when the users changes his guess
-# in the EntryGuess.
-# It sorts all results by the number of unlikely characters
-# they contain.
+# in the EntryGuess. The counts of the previous guesses
+# are cached, so typing or deleting one character only
+# needs the counts of this character.
+# The guess is checked at once, the crib drag runs in the
+# background once the user stopped typing for a moment.
+# It shows the results which contain the least unlikely
+# characters.
 def GuessChanged(Guess):
 
-    def UpdateFrameGuesses():
+    def UpdateFrameGuesses(ResultsList):
         for i in range(len(ListFramesGuess)):
             if i < len(ResultsList):
                 ListFramesGuess[i].pack(side = "top", fill = "x")
@@ -126,44 +108,30 @@ def GuessChanged(Guess):
                 ListButtonGuess[i]["command"] = lambda i=ResultsList[i][0], k=ResultsList[i][1]: GuessChosen(i, k, Guess)
             else:
                 ListFramesGuess[i].pack_forget()
-        return True
 
-    ResultsList = []
+    def ShowError(e):
+        LabelCiphFeedback["text"] = str(e)
+        UpdateFrameGuesses([])
+
     if len(CiphGrid) == 0:
         LabelCiphFeedback["text"] = "Missing ciphertext"
-        return UpdateFrameGuesses()
+        Tasks.Debounce("guess", lambda: UpdateFrameGuesses([]), delay = 0)
+        return True
     LabelCiphFeedback["text"] = ""
-    if len(Guess) > len(CiphGrid[1]):
-        LabelCiphFeedback["text"] = "Guess must not be longer than assumed key."
-        return UpdateFrameGuesses()
     if len(Guess) == 0:
-        return UpdateFrameGuesses()
+        Tasks.Debounce("guess", lambda: UpdateFrameGuesses([]), delay = 0)
+        return True
     for c in Guess:
         if ord(c) > 255:
             return False
-    GuessGrid = [ord(c) for c in Guess]
-    for i in range(len(CiphGrid)):
-        for k in range(len(CiphGrid[i]) - len(Guess) + 1):
-            s = ""
-            UnlikelyCharacters = 0
-            for j in range(len(CiphGrid)):
-                if (j == i) or (k > len(CiphGrid[j]) - len(Guess)):
-                    continue
-                for l in range(len(Guess)):
-                    c = chr(ord(Guess[l]) ^ CiphGrid[i][k + l] ^ CiphGrid[j][k + l])
-                    s += c
-                    if ((c not in [".", ",", ":", ";", "-", "!", "?", "'", " ", '"']) and
-                        ((ord(c) > ord("Z")) or (ord(c) < ord("A"))) and
-                        ((ord(c) > ord("z")) or (ord(c) < ord("a"))) and
-                        ((ord(c) > ord("9")) or (ord(c) < ord("0")))):
-                        UnlikelyCharacters += 1
-                s += "\n"
-            ResultsList.append([i, k, s, UnlikelyCharacters])
-    if len(ResultsList) == 0:
+    if len(Guess) > max([len(line) for line in CiphGrid]):
         LabelCiphFeedback["text"] = "Guess too long for this ciphertext."
         return False
-    ResultsList.sort(key = lambda x: x[3])
-    return UpdateFrameGuesses()
+    cache = CiphCache
+    count = len(ListFramesGuess)
+    Tasks.Debounce("guess", lambda: Tasks.Run("guess", lambda: cache.CribDrag(Guess, count = count),
+                                              UpdateFrameGuesses, ShowError))
+    return True
 
 # This function is invoked when the user chooses one of the
 # suggested guesses. It reveals the corresponding part of
@@ -171,11 +139,7 @@ def GuessChanged(Guess):
 def GuessChosen(i, k, Guess):
     global PlainGrid
     TextPlain.delete("1.0", "end")
-    for j in range(len(CiphGrid)):
-        for l in range(len(Guess)):
-            if k + l >= len(CiphGrid[j]):
-                break
-            PlainGrid[j][k + l] = chr(ord(Guess[l]) ^ CiphGrid[i][k + l] ^ CiphGrid[j][k + l])
+    PlainGrid = OneTimePad.RevealGuess(PlainGrid, CiphGrid, i, k, Guess)
     PrintPlaintext()
 
 # The window is divided into two frames.
@@ -248,7 +212,16 @@ for i in range(len(ListFramesGuess)):
 
 #ListFramesGuess[i].pack(side = "top", fill = "x")
 CiphGrid = []
+CiphCache = None
 PlainGrid = []
 
 
+# This function is invoked when the window is closed.
+# It stops the worker thread of the scheduler and closes the
+# window.
+def WindowClosed():
+    Tasks.Close()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", WindowClosed)
 root.mainloop()
@@ -1,9 +1,16 @@
 # tkinter provides GUI objects and commands
-# random provides random numbers for the
+# os and sys are needed to find the CipherCore package
+# in the parent folder of this script
+# CipherCore provides the cipher functions and the
 # generation of random keys
 import tkinter as tk
 import tkinter.ttk as ttk
-import random
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from CipherCore import Hex
+from CipherCore import KeyPool
+from CipherCore import OneTimePad
 
 # An object (root) is created which represents the window.
 # Its title and full screen property are set.
@@ -11,14 +18,6 @@ root = tk.Tk()
 root.title("One-time pad encryption")
 root.wm_state("zoomed")
 
-# This function formats the input data as a string of
-# hexadecimal values for each byte separated by spaces,
-# e.g. "a3 e2 00"
-def ToHexStr(data):
-    data = list(data)
-    DataList = [format(int(data[i]), "x").zfill(2) for i in range(len(data))]
-    return " ".join(DataList)
-
 # The labels used to interact with the user are cleared.
 def ClearFeedbackLabels():
     LabelPlainFeedback["text"] = ""
@@ -37,7 +36,7 @@ def ButtonPlainLoadClick():
     plain = ""
     try:
         with open(PathPlain.get(), mode = "br") as PlainFile:
-            plain = ToHexStr(PlainFile.read())
+            plain = Hex.ToHexStr(PlainFile.read())
     except:
         LabelPlainFeedback["text"] = "An error occurred while reading the file."
     else:
@@ -68,30 +67,21 @@ def ButtonCiphSaveClick():
     if len(ciph) < 1:
         LabelCiphFeedback["text"] = "Nothing to save"
         return    
-    ciph = ciph.split()
-    CiphList = [0 for i in range(len(ciph))]
     try:
-        for i in range(len(ciph)):
-            CiphList[i] = int(ciph[i], 16)
-            if CiphList[i] < 0 or CiphList[i] > 255:
-                raise Exception
-    except:
-        LabelKeyFeedback["text"] = "Invalid cipher data"
+        CiphList = Hex.FromHexStr(ciph)
+    except ValueError as e:
+        LabelKeyFeedback["text"] = "Invalid cipher data: " + str(e)
         return
     try:
         if SaveAsText.get() == "0":
             with open(PathCiph.get(), mode = "bw") as CiphFile:
-                if (CiphFile.write(bytearray(CiphList)) != len(CiphList)):
+                if (CiphFile.write(CiphList) != len(CiphList)):
                     raise Exception
         else:
             if InsertNewlines.get() == "0":
-                ciph = " ".join(ciph)
+                ciph = Hex.ToHexStr(CiphList)
             else:
-                n = int(SpinboxKeyLength.get())
-                s = ""
-                for i in range((len(ciph) // n) + (1 if len(ciph) % n != 0 else 0)):
-                    s += " ".join(ciph[i*n:(i+1)*n]) + "\n"
-                ciph = s.rstrip()
+                ciph = Hex.ToHexStr(CiphList, BytesPerLine = int(SpinboxKeyLength.get()))
             with open(PathCiph.get(), mode = "tw", encoding = "utf-8") as CiphFile:
                 if (CiphFile.write(ciph) != len(ciph)):
                     raise Exception
@@ -122,7 +112,7 @@ def ButtonKeyLoadClick():
     key = ""
     try:
         with open(PathKey.get(), mode = "br") as KeyFile:
-            Key = ToHexStr(KeyFile.read())
+            Key = Hex.ToHexStr(KeyFile.read())
     except:
         LabelKeyFeedback["text"] = "An error occurred while reading the file."
     else:
@@ -148,19 +138,14 @@ def ButtonKeySaveClick():
     if key == "":
         LabelKeyFeedback["text"] = "Nothing to save"
         return
-    key = key.split()
-    KeyList = [0 for i in range(len(key))]
     try:
-        for i in range(len(key)):
-            KeyList[i] = int(key[i], 16)
-            if KeyList[i] < 0 or KeyList[i] > 255:
-                raise Exception
-    except:
-        LabelKeyFeedback["text"] = "Invalid key"
+        KeyList = Hex.FromHexStr(key)
+    except ValueError as e:
+        LabelKeyFeedback["text"] = "Invalid key: " + str(e)
         return
     try:
         with open(PathKey.get(), mode = "bw") as KeyFile:
-            if (KeyFile.write(bytearray(KeyList)) != len(KeyList)):
+            if (KeyFile.write(KeyList) != len(KeyList)):
                 raise Exception
     except:
         LabelKeyFeedback["text"] = "An error occurred while saving to file."
@@ -177,9 +162,8 @@ def ChangeKeyGenerationMode():
 def ButtonApplyKeyClick():
 
     def GenerateKey(length):
-        KeyList = [format(random.randint(0, 255), "x").zfill(2) for i in range(length)]
         TextKey.delete("1.0", "end")
-        TextKey.insert("1.0", " ".join(KeyList))
+        TextKey.insert("1.0", Hex.ToHexStr(KeyPool.GenerateKey(length)))
 
     ClearFeedbackLabels()
     TextCiph.delete("1.0", "end")
@@ -187,41 +171,50 @@ def ButtonApplyKeyClick():
     if plain == "":
         LabelKeyFeedback["text"] = "No text to encrypt"
         return
-    plain = plain.split()
-    PlainList = [0 for i in range(len(plain))]
     try:
-        for i in range(len(plain)):
-            PlainList[i] = int(plain[i], 16)
-            if PlainList[i] < 0 or PlainList[i] > 255:
-                raise Exception
-    except:
-        LabelKeyFeedback["text"] = "Invalid plain data"
+        PlainList = Hex.FromHexStr(plain)
+    except ValueError as e:
+        LabelKeyFeedback["text"] = "Invalid plain data: " + str(e)
         return
     if KeyGenerationMode.get() == 1:
-        GenerateKey(len(plain))
+        GenerateKey(len(PlainList))
     elif KeyGenerationMode.get() == 2:
         GenerateKey(int(SpinboxKeyLength.get()))
     key = TextKey.get("1.0", "end")[:-1]
     if key == "":
         LabelKeyFeedback["text"] = "No key entered"
         return
-    key = key.split()
-    KeyList = [0 for i in range(len(key))]
     try:
-        for i in range(len(key)):
-            KeyList[i] = int(key[i], 16)
-            if KeyList[i] < 0 or KeyList[i] > 255:
-                raise Exception
-    except:
-        LabelKeyFeedback["text"] = "Invalid key"
+        KeyList = Hex.FromHexStr(key)
+    except ValueError as e:
+        LabelKeyFeedback["text"] = "Invalid key: " + str(e)
         return
-    if len(key) < len(plain):
+    if len(KeyList) == 0:
+        LabelKeyFeedback["text"] = "No key entered"
+        return
+    if len(KeyList) < len(PlainList):
         LabelKeyFeedback["text"] = "Warning: Key too short, key reused!"
-    CipherList = [0 for i in range(len(plain))]
-    for i in range(len(plain)):
-        CipherList[i] = format(PlainList[i] ^ KeyList[i % len(KeyList)], "x").zfill(2)
+    CipherList = OneTimePad.XorBytes(PlainList, KeyList)
     TextCiph.delete("1.0", "end")
-    TextCiph.insert("1.0", " ".join(CipherList))
+    TextCiph.insert("1.0", Hex.ToHexStr(CipherList))
+
+# This function is invoked when the user clicks the button
+# "Encrypt plain data file with key file".
+# It XORs the file with the name specified for the plain
+# data with the key file and writes the result into the
+# file with the name specified for the cipher data. The
+# files are processed in blocks without showing them in
+# the text fields, so they may be of any size.
+def ButtonXorFilesClick():
+    ClearFeedbackLabels()
+    try:
+        length = OneTimePad.XorFile(PathPlain.get(), PathCiph.get(), PathKey.get())
+    except ValueError as e:
+        LabelCiphFeedback["text"] = str(e)
+    except:
+        LabelCiphFeedback["text"] = "An error occurred while processing the files."
+    else:
+        LabelCiphFeedback["text"] = str(length) + " bytes encrypted to file."
 
 # The window is divided into three frames.
 FramePlain = ttk.Frame(master = root)
@@ -340,6 +333,10 @@ CheckInsertNewlines = ttk.Checkbutton(master = FrameCiph,
                                       text = "",
                                       variable = InsertNewlines)
 CheckInsertNewlines.pack(side = "top", padx = 45, pady = 5, fill = "x")
+ButtonXorFiles = ttk.Button(master = FrameCiph,
+                            text = "Encrypt plain data file with key file",
+                            command = ButtonXorFilesClick)
+ButtonXorFiles.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextCiph = tk.Text(master = FrameCiph, width = 10)
 TextCiph.pack(side = "bottom", fill = "both", expand = True, padx = 25, pady = 10)
 
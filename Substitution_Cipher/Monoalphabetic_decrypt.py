@@ -1,10 +1,20 @@
 # tkinter provides GUI objects and commands
-# matplotlib provides the commands to print
-# the statistical analysis of the letter
-# frequencies
+# os and sys are needed to find the CipherCore package
+# in the parent folder of this script
+# CipherCore provides the cipher functions and the charts of
+# the letter frequencies (matplotlib is imported by Plotting
+# only when a chart is shown)
 import tkinter as tk
 import tkinter.ttk as ttk
-import matplotlib.pyplot as plt
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from CipherCore import Frequencies
+from CipherCore import NGrams
+from CipherCore import Normalization
+from CipherCore import Plotting
+from CipherCore import Substitution
+from CipherCore import TextView
 
 # An object (root) is created which represents the window.
 # Its title and full screen property are set.
@@ -15,26 +25,9 @@ root.wm_state("zoomed")
 # This function normalizes the parameter text according to the
 # settings "Keep blanks" and "Keep non-alphabetic chars".
 def NormalizeText(text, strict = False):
-    s = ""
-    for c in text:
-        if ((ord(c) <= ord("Z")) and (ord(c) >= ord("A"))):
-            s += c
-        elif ((ord(c) <= ord("z")) and (ord(c) >= ord("a"))):
-            s += chr(ord(c) + ord("A") - ord("a"))
-        elif ((c == "ä") or (c == "Ä")):
-            s += "AE"
-        elif ((c == "ö") or (c == "Ö")):
-            s += "OE"
-        elif ((c == "ü") or (c == "Ü")):
-            s += "UE"
-        elif (c == "ß"):
-            s += "SS"
-        elif ((c == " ") or (ord(c) == 10)):
-            if ((KeepBlanks.get() == "1") and not strict):
-                s += " "
-        elif ((KeepNonalpha.get() == "1") and not strict):
-            s += c
-    return s
+    return Normalization.NormalizeText(text,
+                                       KeepBlanks = (KeepBlanks.get() == "1") and not strict,
+                                       KeepNonalpha = (KeepNonalpha.get() == "1") and not strict)
 
 # The labels used to interact with the user are cleared.
 def ClearFeedbackLabels():
@@ -51,7 +44,7 @@ def ClearFeedbackLabels():
 # textfile succeeded.
 def ButtonPlainSaveClick():
     ClearFeedbackLabels()
-    plain = TextPlain.get("1.0", "end")[:-1]
+    plain = ViewPlain.Get()
     if len(plain) < 1:
         LabelPlainFeedback["text"] = "Nothing to save"
         return
@@ -82,18 +75,45 @@ def ButtonCiphLoadClick():
             LabelCiphFeedback["text"] = "File empty"
         else:
             ciph = NormalizeText(ciph)
-            TextCiph.delete("1.0", "end")
-            TextCiph.insert("1.0", ciph)
+            ViewCiph.Set(ciph)
             LabelCiphFeedback["text"] = "File loaded successfully."
 
+# The statistics of the sample text or of the language model
+# loaded instead. They are computed once per sample.
+Sample = None
+
+# This function returns the statistics of the sample. If the
+# sample text has been edited, they are computed anew.
+def CurrentSample():
+    global Sample
+    if TextFreqAn.edit_modified() or (Sample is None):
+        Sample = NGrams.LanguageSample(TextFreqAn.get("1.0", "end")[:-1])
+        TextFreqAn.edit_modified(False)
+    return Sample
+
 # This function is invoked when the user clicks the button
 # "Load sample text from file".
 # It tries to open a textfile with the name specified in the
 # corresponding entry field. Further, it tells the user
 # whether the loading of the textfile succeeded and, if so,
 # prints its contents in the text field below.
+# If the name is a directory, the language model in it is
+# used instead of a sample text.
 def ButtonFreqAnLoadClick():
+    global Sample
     ClearFeedbackLabels()
+    if os.path.isdir(PathFreqAn.get()):
+        try:
+            model = NGrams.LanguageSample(model = PathFreqAn.get())
+            model.LetterFrequencies()
+        except (OSError, ValueError) as e:
+            LabelFreqAnFeedback["text"] = str(e)
+            return
+        TextFreqAn.delete("1.0", "end")
+        TextFreqAn.edit_modified(False)
+        Sample = model
+        LabelFreqAnFeedback["text"] = "Language model loaded successfully."
+        return
     try:
         with open(PathFreqAn.get(), mode = "rt", encoding = "utf-8") as SampleFile:
             FreqAnText = SampleFile.read()
@@ -110,16 +130,11 @@ def ButtonFreqAnLoadClick():
 # This function is invoked when the user clicks the button
 # "Compare letter frequencies".
 # It counts each letter in both the cipher and the sample
-# text and prints the frequencies by use of matplotlib.
+# text and prints the frequencies as bar charts.
 def ButtonFreqCheckClick():
-    ciph = NormalizeText(TextCiph.get("1.0", "end")[:-1], strict = True)
-    samp = NormalizeText(TextFreqAn.get("1.0", "end")[:-1], strict = True)
-    FreqCiph = [[chr(ord("A") + i), 0] for i in range(26)]
-    FreqSamp = [[chr(ord("a") + i), 0] for i in range(26)]
-    for c in ciph:
-        FreqCiph[ord(c) - ord("A")][1] += 1
-    for c in samp:
-        FreqSamp[ord(c) - ord("A")][1] += 1
+    ciph = NormalizeText(ViewCiph.Get(), strict = True)
+    FreqCiph = [[chr(ord("A") + i), n] for i, n in enumerate(Frequencies.LetterFrequencies(ciph))]
+    FreqSamp = [[chr(ord("a") + i), n] for i, n in enumerate(CurrentSample().LetterFrequencies())]
     SortCiph = sorted(FreqCiph, key = lambda x: x[1], reverse = True)
     SortSamp = sorted(FreqSamp, key = lambda x: x[1], reverse = True)
     ColoCiph = [(0,0,0) for i in range(26)]
@@ -131,18 +146,9 @@ def ButtonFreqCheckClick():
             ColoCiph[i] = ColoCiph[i-1]
         if SortSamp[i][1] == SortSamp[i-1][1]:
             ColoSamp[i] = ColoSamp[i-1]
-    plt.figure("Letter frequencies")
-    plt.subplot(211)
-    plt.bar([i for i in range(26)],
-            [SortCiph[i][1] for i in range(26)],
-            tick_label = [SortCiph[i][0] for i in range(26)],
-            color = ColoCiph)
-    plt.subplot(212)
-    plt.bar([i for i in range(26)],
-            [SortSamp[i][1] for i in range(26)],
-            tick_label = [SortSamp[i][0] for i in range(26)],
-            color = ColoSamp)
-    plt.show()
+    Plotting.ShowBars("Letter frequencies",
+                      [([SortCiph[i][0] for i in range(26)], [SortCiph[i][1] for i in range(26)], ColoCiph),
+                       ([SortSamp[i][0] for i in range(26)], [SortSamp[i][1] for i in range(26)], ColoSamp)])
 
 # This function is invoked when the user selects a radio
 # button corresponding to one of the various cipher modes.
@@ -223,20 +229,57 @@ def FocusOutCombo(contents, index):
                 break
     UpdatePlaintext()
 
+# The key is read from the combo boxes only once after one of
+# them was changed and kept as tuple until the next change,
+# so the substitution table compiled for it is reused.
+SubstitutionKey = None
+
+# This function is invoked whenever a combo box is changed.
+# It drops the key read before.
+def KeyChanged(var, index, mode):
+    global SubstitutionKey
+    SubstitutionKey = None
+
+# This function returns the key of the combo boxes.
+def CurrentKey():
+    global SubstitutionKey
+    if SubstitutionKey is None:
+        SubstitutionKey = tuple([ComboText[i].get() for i in range(26)])
+    return SubstitutionKey
+
 # This function is invoked whenever the encryption mode
 # is changed. It applies the decryption to the ciphertext.
 def UpdatePlaintext():
-    ciph = NormalizeText(TextCiph.get("1.0", "end")[:-1])
-    TextCiph.delete("1.0", "end")
-    TextCiph.insert("1.0", ciph)
-    plain = ""
-    for c in ciph:
-        if ((ord(c) < ord("A")) or (ord(c) > ord("Z"))):
-            plain += c
-        else:
-            plain += ComboText[ord(c)-ord("A")].get()
-    TextPlain.delete("1.0", "end")
-    TextPlain.insert("1.0", plain)
+    ciph = NormalizeText(ViewCiph.Get())
+    ViewCiph.Set(ciph)
+    plain = Substitution.Substitute(ciph, CurrentKey())
+    ViewPlain.Set(plain)
+
+# This function is invoked when the user clicks the button
+# "Solve automatically".
+# It searches the key by hill climbing, scoring the
+# candidate plaintexts by the n-gram statistics of the
+# sample text (or language model), and fills the combo boxes
+# with it.
+def ButtonSolveClick():
+    ClearFeedbackLabels()
+    sample = CurrentSample()
+    if sample.IsEmpty():
+        LabelFreqAnFeedback["text"] = "Load a sample text first."
+        return
+    StringLength = sample.StringLength()
+    ciph = NormalizeText(ViewCiph.Get())
+    try:
+        table = sample.Table(StringLength)
+    except (OSError, ValueError) as e:
+        LabelFreqAnFeedback["text"] = str(e)
+        return
+    key, score = Substitution.CrackSubstitution(ciph, table, StringLength = StringLength)
+    GeneralMode.set(1)
+    for i in range(26):
+        ComboSubst[i]["state"] = "normal"
+        ComboText[i].set(key[i])
+    UpdatePlaintext()
 
 # The window is divided into three frames.
 FramePlain = ttk.Frame(master = root)
@@ -270,6 +313,7 @@ LabelPlainFeedback = ttk.Label(master = FramePlain, text = "")
 LabelPlainFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextPlain = tk.Text(master = FramePlain, width = 10)
 TextPlain.pack(side = "bottom", fill = "both", expand = True, padx = 25, pady = 10)
+ViewPlain = TextView.TextView(TextPlain)
 
 LabelKeyCaption = ttk.Label(master = FrameKey, text = "Key")
 LabelKeyCaption.pack(side = "top", pady = 5)
@@ -294,6 +338,9 @@ RadioButtonGeneral = ttk.Radiobutton(master = FrameKey, text = "General",
 RadioButtonAtbash.pack(side = "top", fill = "x", padx = 25, pady = 5)
 RadioButtonCaesar.pack(side = "top", fill = "x", padx = 25, pady = 5)
 RadioButtonGeneral.pack(side = "top", fill = "x", padx = 25, pady = 5)
+ButtonSolve = ttk.Button(master = FrameKey, text = "Solve automatically",
+                         command = ButtonSolveClick)
+ButtonSolve.pack(side = "top", fill = "x", padx = 25, pady = 5)
 FrameKeyPad1 = ttk.Frame(master = FrameKey)
 FrameKeyPad2 = ttk.Frame(master = FrameKey)
 FrameKeyPad2["borderwidth"] = 5
@@ -314,6 +361,7 @@ for i in range(26):
     FramesSubst[i].pack(side = "top", fill = "both", expand = True)
     LabelSubst.append(ttk.Label(master = FramesSubst[i], text = chr(ord("A")+i) + " "))
     ComboText.append(tk.StringVar(value = chr(ord("A")+i)))
+    ComboText[i].trace_add("write", KeyChanged)
     ComboSubst.append(ttk.Combobox(master = FramesSubst[i],
                                    width = 2,
                                    textvariable = ComboText[i],
@@ -341,6 +389,7 @@ LabelCiphFeedback = ttk.Label(master = FrameCiph, text = "")
 LabelCiphFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextCiph = tk.Text(master = FrameCiph, width = 10)
 TextCiph.pack(side = "top", fill = "both", expand = True, padx = 25, pady = 10)
+ViewCiph = TextView.TextView(TextCiph)
 
 # The frame for the sample text and the frequency analysis
 # is defined.
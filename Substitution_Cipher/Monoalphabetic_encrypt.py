@@ -1,6 +1,15 @@
 # tkinter provides GUI objects and commands
+# os and sys are needed to find the CipherCore package
+# in the parent folder of this script
+# CipherCore provides the cipher functions
 import tkinter as tk
 import tkinter.ttk as ttk
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from CipherCore import Normalization
+from CipherCore import Substitution
+from CipherCore import TextView
 
 # An object (root) is created which represents the window.
 # Its title and full screen property are set.
@@ -11,26 +20,9 @@ root.wm_state("zoomed")
 # This function normalizes the parameter text according to the
 # settings "Keep blanks" and "Keep non-alphabetic chars".
 def NormalizeText(text, strict = False):
-    s = ""
-    for c in text:
-        if ((ord(c) <= ord("Z")) and (ord(c) >= ord("A"))):
-            s += c
-        elif ((ord(c) <= ord("z")) and (ord(c) >= ord("a"))):
-            s += chr(ord(c) + ord("A") - ord("a"))
-        elif ((c == "ä") or (c == "Ä")):
-            s += "AE"
-        elif ((c == "ö") or (c == "Ö")):
-            s += "OE"
-        elif ((c == "ü") or (c == "Ü")):
-            s += "UE"
-        elif (c == "ß"):
-            s += "SS"
-        elif ((c == " ") or (ord(c) == 10)):
-            if ((KeepBlanks.get() == "1") and not strict):
-                s += " "
-        elif ((KeepNonalpha.get() == "1") and not strict):
-            s += c
-    return s
+    return Normalization.NormalizeText(text,
+                                       KeepBlanks = (KeepBlanks.get() == "1") and not strict,
+                                       KeepNonalpha = (KeepNonalpha.get() == "1") and not strict)
 
 # The labels used to interact with the user are cleared.
 def ClearFeedbackLabels():
@@ -55,8 +47,7 @@ def ButtonPlainLoadClick():
             LabelPlainFeedback["text"] = "File empty"
         else:
             plain = NormalizeText(plain)
-            TextPlain.delete("1.0", "end")
-            TextPlain.insert("1.0", plain)
+            ViewPlain.Set(plain)
             LabelPlainFeedback["text"] = "File loaded successfully."
 
 # This function is invoked when the user clicks the button
@@ -68,7 +59,7 @@ def ButtonPlainLoadClick():
 # textfile succeeded.
 def ButtonCiphSaveClick():
     ClearFeedbackLabels()
-    ciph = TextCiph.get("1.0", "end")[:-1]
+    ciph = ViewCiph.Get()
     if len(ciph) < 1:
         LabelCiphFeedback["text"] = "Nothing to save"
         return
@@ -160,20 +151,31 @@ def FocusOutCombo(contents, index):
                 break
     UpdatePlaintext()
 
+# The key is read from the combo boxes only once after one of
+# them was changed and kept as tuple until the next change,
+# so the substitution table compiled for it is reused.
+SubstitutionKey = None
+
+# This function is invoked whenever a combo box is changed.
+# It drops the key read before.
+def KeyChanged(var, index, mode):
+    global SubstitutionKey
+    SubstitutionKey = None
+
+# This function returns the key of the combo boxes.
+def CurrentKey():
+    global SubstitutionKey
+    if SubstitutionKey is None:
+        SubstitutionKey = tuple([ComboText[i].get() for i in range(26)])
+    return SubstitutionKey
+
 # This function is invoked whenever the encryption mode
 # is changed. It applies the encryption to the plaintext.
 def UpdatePlaintext():
-    plain = NormalizeText(TextPlain.get("1.0", "end")[:-1])
-    TextPlain.delete("1.0", "end")
-    TextPlain.insert("1.0", plain)
-    cipher = ""
-    for c in plain:
-        if ((ord(c) < ord("A")) or (ord(c) > ord("Z"))):
-            cipher += c
-        else:
-            cipher += ComboText[ord(c)-ord("A")].get()
-    TextCiph.delete("1.0", "end")
-    TextCiph.insert("1.0", cipher)
+    plain = NormalizeText(ViewPlain.Get())
+    ViewPlain.Set(plain)
+    cipher = Substitution.Substitute(plain, CurrentKey())
+    ViewCiph.Set(cipher)
 
 # The window is divided into three frames.
 FramePlain = ttk.Frame(master = root)
@@ -207,6 +209,7 @@ LabelPlainFeedback = ttk.Label(master = FramePlain, text = "")
 LabelPlainFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextPlain = tk.Text(master = FramePlain, width = 10)
 TextPlain.pack(side = "bottom", fill = "both", expand = True, padx = 25, pady = 10)
+ViewPlain = TextView.TextView(TextPlain)
 
 LabelKeyCaption = ttk.Label(master = FrameKey, text = "Key")
 LabelKeyCaption.pack(side = "top", pady = 5)
@@ -251,6 +254,7 @@ for i in range(26):
     FramesSubst[i].pack(side = "top", fill = "both", expand = True)
     LabelSubst.append(ttk.Label(master = FramesSubst[i], text = chr(ord("A")+i) + " "))
     ComboText.append(tk.StringVar(value = chr(ord("A")+i)))
+    ComboText[i].trace_add("write", KeyChanged)
     ComboSubst.append(ttk.Combobox(master = FramesSubst[i],
                                    width = 2,
                                    textvariable = ComboText[i],
@@ -278,6 +282,7 @@ LabelCiphFeedback = ttk.Label(master = FrameCiph, text = "")
 LabelCiphFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextCiph = tk.Text(master = FrameCiph, width = 10)
 TextCiph.pack(side = "bottom", fill = "both", expand = True, padx = 25, pady = 10)
+ViewCiph = TextView.TextView(TextCiph)
 
     
 ChangeMode()
@@ -1,6 +1,15 @@
 # tkinter provides GUI objects and commands
+# os and sys are needed to find the CipherCore package
+# in the parent folder of this script
+# CipherCore provides the cipher functions
 import tkinter as tk
 import tkinter.ttk as ttk
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from CipherCore import Normalization
+from CipherCore import TextView
+from CipherCore import Vigenere
 
 # An object (root) is created which represents the window.
 # Its title and full screen property are set.
@@ -11,26 +20,9 @@ root.wm_state("zoomed")
 # This function normalizes the parameter text according to the
 # settings "Keep blanks" and "Keep non-alphabetic chars".
 def NormalizeText(text, strict = False):
-    s = ""
-    for c in text:
-        if ((ord(c) <= ord("Z")) and (ord(c) >= ord("A"))):
-            s += c
-        elif ((ord(c) <= ord("z")) and (ord(c) >= ord("a"))):
-            s += chr(ord(c) + ord("A") - ord("a"))
-        elif ((c == "ä") or (c == "Ä")):
-            s += "AE"
-        elif ((c == "ö") or (c == "Ö")):
-            s += "OE"
-        elif ((c == "ü") or (c == "Ü")):
-            s += "UE"
-        elif (c == "ß"):
-            s += "SS"
-        elif ((c == " ") or (ord(c) == 10)):
-            if ((KeepBlanks.get() == "1") and not strict):
-                s += " "
-        elif ((KeepNonalpha.get() == "1") and not strict):
-            s += c
-    return s
+    return Normalization.NormalizeText(text,
+                                       KeepBlanks = (KeepBlanks.get() == "1") and not strict,
+                                       KeepNonalpha = (KeepNonalpha.get() == "1") and not strict)
 
 # The labels used to interact with the user are cleared.
 def ClearFeedbackLabels():
@@ -56,8 +48,7 @@ def ButtonPlainLoadClick():
             LabelPlainFeedback["text"] = "File empty"
         else:
             plain = NormalizeText(plain)
-            TextPlain.delete("1.0", "end")
-            TextPlain.insert("1.0", plain)
+            ViewPlain.Set(plain)
             LabelPlainFeedback["text"] = "File loaded successfully."
 
 # This function is invoked when the user clicks the button
@@ -69,7 +60,7 @@ def ButtonPlainLoadClick():
 # textfile succeeded.
 def ButtonCiphSaveClick():
     ClearFeedbackLabels()
-    ciph = TextCiph.get("1.0", "end")[:-1]
+    ciph = ViewCiph.Get()
     if len(ciph) < 1:
         LabelCiphFeedback["text"] = "Nothing to save"
         return
@@ -87,30 +78,18 @@ def ButtonCiphSaveClick():
 # It normalizes the plain text and the key, checks if the
 # key is valid and executes the encryption.
 def ButtonEncodeClick():
-    ClearFeedbackLabels()   
-    ciph = ""
-    plain = TextPlain.get("1.0", "end")[:-1]
+    ClearFeedbackLabels()
+    plain = ViewPlain.Get()
     plain = NormalizeText(plain)
-    TextPlain.delete("1.0", "end")
-    TextPlain.insert("1.0", plain)
+    ViewPlain.Set(plain)
     key = NormalizeText(Key.get(), strict = True)
     Key.set(key) 
-    keylength = len(key)
-    if keylength == 0:
-        LabelKeyFeedback["text"] = "No valid key entered"
+    try:
+        ciph = Vigenere.VigenereEncrypt(plain, key)
+    except ValueError as e:
+        LabelKeyFeedback["text"] = str(e)
         return
-    i = 0
-    for p in plain:
-        if ((ord(p) < ord("A")) or (ord(p) > ord("Z"))):
-            ciph += p
-        else:
-            a = ord(p) + ord(key[i % keylength]) - ord("A")
-            i += 1
-            if a > ord("Z"):
-                a -= 26
-            ciph += chr(a)
-    TextCiph.delete("1.0", "end")
-    TextCiph.insert("1.0", ciph)
+    ViewCiph.Set(ciph)
 
 # The window is divided into three frames.
 FramePlain = ttk.Frame(master = root)
@@ -144,6 +123,7 @@ LabelPlainFeedback = ttk.Label(master = FramePlain, text = "")
 LabelPlainFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextPlain = tk.Text(master = FramePlain, width = 10)
 TextPlain.pack(side = "bottom", fill = "both", expand = True, padx = 25, pady = 10)
+ViewPlain = TextView.TextView(TextPlain)
 
 LabelKeyCaption = ttk.Label(master = FrameKey, text = "Key")
 LabelKeyCaption.pack(side = "top", pady = 5)
@@ -181,6 +161,7 @@ LabelCiphFeedback = ttk.Label(master = FrameCiph, text = "")
 LabelCiphFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextCiph = tk.Text(master = FrameCiph, width = 10)
 TextCiph.pack(side = "bottom", fill = "both", expand = True, padx = 25, pady = 10)
+ViewCiph = TextView.TextView(TextCiph)
 
 
 root.mainloop()
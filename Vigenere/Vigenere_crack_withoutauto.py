@@ -1,12 +1,20 @@
 # tkinter provides GUI objects and commands
-# math provides floor, ceil and sqrt
-# matplotlib provides the commands to print
-# the statistical analysis of the letter
-# frequencies
+# os and sys are needed to find the CipherCore package
+# in the parent folder of this script
+# CipherCore provides the cipher functions and the charts of
+# the letter frequencies (matplotlib is imported by Plotting
+# only when a chart is shown)
 import tkinter as tk
 import tkinter.ttk as ttk
-import math
-import matplotlib.pyplot as plt
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from CipherCore import NGrams
+from CipherCore import Normalization
+from CipherCore import Plotting
+from CipherCore import Scheduler
+from CipherCore import TextView
+from CipherCore import Vigenere
 
 # An object (root) is created which represents the window.
 # Its title and full screen property are set.
@@ -14,29 +22,16 @@ root = tk.Tk()
 root.title("Vigenère Crack")
 root.wm_state("zoomed")
 
+# The scheduler lets the plaintext be
+# updated only once the user stopped clicking the shift.
+Tasks = Scheduler.Scheduler(root)
+
 # This function normalizes the parameter text according to the
 # settings "Keep blanks" and "Keep non-alphabetic chars".
 def NormalizeText(text, strict = False):
-    s = ""
-    for c in text:
-        if ((ord(c) <= ord("Z")) and (ord(c) >= ord("A"))):
-            s += c
-        elif ((ord(c) <= ord("z")) and (ord(c) >= ord("a"))):
-            s += chr(ord(c) + ord("A") - ord("a"))
-        elif ((c == "ä") or (c == "Ä")):
-            s += "AE"
-        elif ((c == "ö") or (c == "Ö")):
-            s += "OE"
-        elif ((c == "ü") or (c == "Ü")):
-            s += "UE"
-        elif (c == "ß"):
-            s += "SS"
-        elif ((c == " ") or (ord(c) == 10)):
-            if ((KeepBlanks.get() == "1") and not strict):
-                s += " "
-        elif ((KeepNonalpha.get() == "1") and not strict):
-            s += c
-    return s
+    return Normalization.NormalizeText(text,
+                                       KeepBlanks = (KeepBlanks.get() == "1") and not strict,
+                                       KeepNonalpha = (KeepNonalpha.get() == "1") and not strict)
 
 # The labels used to interact with the user are cleared.
 def ClearFeedbackLabels():
@@ -54,7 +49,7 @@ def ClearFeedbackLabels():
 # textfile succeeded.
 def ButtonPlainSaveClick():
     ClearFeedbackLabels()
-    plain = TextPlain.get("1.0", "end")[:-1]
+    plain = ViewPlain.Get()
     if len(plain) < 1:
         LabelPlainFeedback["text"] = "Nothing to save"
         return
@@ -85,8 +80,7 @@ def ButtonCiphLoadClick():
             LabelCiphFeedback["text"] = "File empty"
         else:
             ciph = NormalizeText(ciph)
-            TextCiph.delete("1.0", "end")
-            TextCiph.insert("1.0", ciph)
+            ViewCiph.Set(ciph)
             LabelCiphFeedback["text"] = "File loaded successfully."
 
 # This function is invoked when the user clicks the button
@@ -95,8 +89,23 @@ def ButtonCiphLoadClick():
 # corresponding entry field. Further, it tells the user
 # whether the loading of the textfile succeeded and, if so,
 # prints its contents in the text field below.
+# If the name is a directory, the letter frequencies of the
+# language model in it are used instead of a sample text.
 def ButtonFreqAnLoadClick():
+    global Sample
     ClearFeedbackLabels()
+    if os.path.isdir(PathFreqAn.get()):
+        try:
+            model = NGrams.LanguageSample(model = PathFreqAn.get())
+            model.LetterFrequencies()
+        except (OSError, ValueError) as e:
+            LabelFreqAnFeedback["text"] = str(e)
+            return
+        TextFreqAn.delete("1.0", "end")
+        TextFreqAn.edit_modified(False)
+        Sample = model
+        LabelFreqAnFeedback["text"] = "Language model loaded successfully."
+        return
     try:
         with open(PathFreqAn.get(), mode = "rt", encoding = "utf-8") as SampleFile:
             FreqAnText = SampleFile.read()
@@ -108,69 +117,32 @@ def ButtonFreqAnLoadClick():
         else:
             TextFreqAn.delete("1.0", "end")
             TextFreqAn.insert("1.0", FreqAnText)
+            SampleChanged()
             LabelFreqAnFeedback["text"] = "File loaded successfully."       
 
 # This function is invoked when the users clicks the button
 # "Carry out Kasiski examination."
-# 
+# It counts the divisors of the distances between repeated
+# strings and prints them as possible key lengths.
 def ButtonKasiskiClick():
     ClearFeedbackLabels()
-    plt.close("all")
-    StringLength = int(SpinboxKasiskiLength.get())
-    RepeatedStrings = {}
-    DivisorsOfDistances = {}
-
-    def FindDivisorsOfDistances(coinc):
-        def AddDivisor(d):
-            if d > MaxDivisor:
-                return
-            if d in DivisorsOfDistances:
-                DivisorsOfDistances[d] += 1
-            else:
-                DivisorsOfDistances.update({d: 1})
-            
-        for i in range(len(coinc) - 1):
-            for j in range(i + 1, len(coinc)):
-                dist = coinc[j] - coinc[i]
-                for d in range(2, min(math.floor(math.sqrt(dist) + 1), MaxDivisor)):
-                    if (dist % d == 0):
-                        AddDivisor(d)
-                        m = dist //d
-                        if m != d:
-                            AddDivisor(m)
-                AddDivisor(dist)                            
-    
-    ciph = TextCiph.get("1.0", "end")[:-1]
+    Plotting.CloseFigures()
+    ciph = ViewCiph.Get()
     ciph = NormalizeText(ciph)
-    TextCiph.delete("1.0", "end")
-    TextCiph.insert("1.0", ciph)
-    ciph = NormalizeText(ciph, strict = True)
-    MaxDivisor = int(SpinboxKasiskiMaxDivisor.get())
-    for pos in range(len(ciph) - StringLength - 1):
-        s = ciph[pos : pos + StringLength]
-        if s in RepeatedStrings:
-            continue
-        coinc = []
-        for pos2 in range(pos + 2, len(ciph) - StringLength + 1):
-            if s == ciph[pos2 : pos2 + StringLength]:
-                coinc.append(pos2)
-        if coinc != []:
-            coinc.insert(0, pos)
-            FindDivisorsOfDistances(coinc)
-            RepeatedStrings.update({s: len(coinc)})
-    try:
-        MaxDivisor = max(DivisorsOfDistances.keys())
-    except:
+    ViewCiph.Set(ciph)
+    ciph = StrictCiphertext()
+    DivisorsOfDistances = Vigenere.KasiskiExamination(ciph,
+                                                      int(SpinboxKasiskiLength.get()),
+                                                      int(SpinboxKasiskiMaxDivisor.get()))
+    if len(DivisorsOfDistances) == 0:
         LabelExamFeedback["text"] = "No string found repeatedly"
         return
+    MaxDivisor = max(DivisorsOfDistances.keys())
     CoincidenceOfDivisors = [0 for i in range(2, MaxDivisor + 1)]
     for i in DivisorsOfDistances.keys():
         CoincidenceOfDivisors[i - 2] = DivisorsOfDistances[i]
-    plt.figure("Possible key lengths")
-    plt.bar([i for i in range(MaxDivisor - 1)],
-            [CoincidenceOfDivisors[i] for i in range(MaxDivisor - 1)],
-            tick_label = [i for i in range(2, MaxDivisor + 1)])
-    plt.show()
+    Plotting.ShowBars("Possible key lengths",
+                      [([i for i in range(2, MaxDivisor + 1)], CoincidenceOfDivisors, None)])
 
 def ButtonFriedmanClick():
     freq = CalculateFrequencies(UseWholeCipherText = True)
@@ -180,19 +152,14 @@ def ButtonFriedmanClick():
     if freq == 1:
         LabelExamFeedback["text"] = "No sample text to compare with"
         return
-    CiphIndexOfCoincidence = 0
-    SampleIndexOfCoincidence = 0
-    RandomIndexOfCoincidence = 1/26
-    CiphLength = sum(freq[0])
-    SampleLength = sum(freq[1])
-    for i in range(26):
-        CiphIndexOfCoincidence += (freq[0][i] * (freq[0][i] - 1) /
-                                   (CiphLength * (CiphLength - 1)))
-        SampleIndexOfCoincidence += (freq[1][i] * (freq[1][i] - 1) /
-                                     (SampleLength * (SampleLength - 1)))
-    EstimatedKeyLength = ((SampleIndexOfCoincidence - RandomIndexOfCoincidence) * CiphLength /
-                          ((CiphLength - 1) * CiphIndexOfCoincidence + SampleIndexOfCoincidence - RandomIndexOfCoincidence * CiphLength))
-    LabelExamFeedback["text"] = "Estimated keylength: %.2f" % EstimatedKeyLength
+    try:
+        EstimatedKeyLength = Vigenere.FriedmanEstimate(freq[0], freq[1])
+    except ValueError as e:
+        LabelExamFeedback["text"] = str(e)
+        return
+    ranked = Vigenere.RankKeyLengths(StrictCiphertext(), SampleFrequencies = freq[1])
+    LabelExamFeedback["text"] = ("Estimated keylength: %.2f, by columns: " % EstimatedKeyLength +
+                                 ", ".join([str(KeyLength) for KeyLength, index in ranked[:3]]))
 
 def KeyLengthChanged():
     ClearFeedbackLabels()
@@ -200,7 +167,7 @@ def KeyLengthChanged():
     SpinboxLetterSelection.set(1)
     SpinboxLetterSelection["to"] = int(SpinboxKeyLength.get())
     SpinboxLetterShift.set(0)
-    ButtonShowFrequenciesClick(ShowFigure = (len(plt.get_fignums()) != 0))
+    ButtonShowFrequenciesClick(ShowFigure = Plotting.FiguresOpen())
 
 def LetterSelectionChanged():
     ClearFeedbackLabels()
@@ -214,50 +181,110 @@ def LetterShiftChanged():
     shift = int(SpinboxLetterShift.get())
     key = key[:letter - 1] + chr(ord("A") + shift) + key[letter:]
     LabelKey["text"] = key
-    ButtonShowFrequenciesClick(ShowFigure = (len(plt.get_fignums()) != 0))
-
-def CalculateFrequencies(UseWholeCipherText = False):
-    def CalcPlainText():
-        for i in range(len(ciph)):
-            n = ord(ciph[i]) - ord(key[i % KeyLength]) + ord("A")
-            if n < ord("A"):
-                n += 26
-            PlainGrid[i // KeyLength][i % KeyLength] = chr(n)                
-    
+    ButtonShowFrequenciesClick(ShowFigure = Plotting.FiguresOpen(), ShowPlaintext = False)
+    Tasks.Debounce("plaintext", PrintPlaintext)
+
+# The strictly normalized ciphertext and the letter
+# frequencies of the sample text are kept between the clicks.
+# The ciphertext is normalized again only when a new version
+# of it is entered, the sample text is counted again only when
+# its text field has been modified or a file has been loaded.
+StrictCiph = ""
+CiphVersion = None
+Sample = None
+
+# The letter frequencies of the columns of the ciphertext are
+# counted once per key length. The frequencies of a column of
+# the plaintext are obtained from them for any shift, so
+# scanning the shifts does not read the text again.
+ColumnCounts = None
+ColumnCountsOf = None
+
+# This function returns the strictly normalized ciphertext.
+def StrictCiphertext():
+    global StrictCiph
+    global CiphVersion
+    if CiphVersion != ViewCiph.Version():
+        StrictCiph = NormalizeText(ViewCiph.Get(), strict = True)
+        CiphVersion = ViewCiph.Version()
+    return StrictCiph
+
+# This function returns the letter frequencies of the columns
+# of the ciphertext for the key length as array of KeyLength
+# rows.
+def CiphColumnFrequencies(KeyLength):
+    global ColumnCounts
+    global ColumnCountsOf
+    ciph = StrictCiphertext()
+    if ColumnCountsOf != (CiphVersion, KeyLength):
+        ColumnCounts = Vigenere.ColumnFrequencies(ciph, KeyLength)
+        ColumnCountsOf = (CiphVersion, KeyLength)
+    return ColumnCounts
+
+# This function decrypts the ciphertext with the assumed key
+# and prints the plaintext in lines as long as the key. If
+# format is set, the plaintext is formatted like the
+# normalized ciphertext instead. The decryption runs in the
+# background, so the window does not freeze on long texts.
+def PrintPlaintext(format = False):
+    key = LabelKey.cget("text")
+    ciph = StrictCiphertext()
+    FormatCiph = ViewCiph.Get() if format else ""
+
+    def Decrypt():
+        plain = Vigenere.SplitIntoRows(Vigenere.VigenereDecrypt(ciph, key), len(key))
+        if format:
+            plain = Vigenere.FormatPlaintext(FormatCiph, plain)
+        return plain
+
+    Tasks.Run("plaintext", Decrypt, ViewPlain.Set, ShowPlaintextError)
+
+# This function tells the user why the decryption failed.
+def ShowPlaintextError(e):
+    LabelExamFeedback["text"] = str(e)
+
+# This function drops the letter frequencies of the sample
+# text counted before.
+def SampleChanged():
+    global Sample
+    Sample = None
+
+# This function returns the letter frequencies of the sample
+# text or of the language model loaded instead.
+def CurrentSampleFrequencies():
+    global Sample
+    if TextFreqAn.edit_modified() or (Sample is None):
+        Sample = NGrams.LanguageSample(TextFreqAn.get("1.0", "end")[:-1])
+        TextFreqAn.edit_modified(False)
+    return Sample.LetterFrequencies()
+
+# This function prints the plaintext (unless ShowPlaintext is
+# False) and calculates the letter frequencies.
+# It returns 0 if there is no ciphertext, 1 if there is no
+# sample text and otherwise the letter frequencies of the
+# selected column of the plaintext (or the whole ciphertext)
+# and of the sample text.
+def CalculateFrequencies(UseWholeCipherText = False, ShowPlaintext = True):
     ClearFeedbackLabels()
     key = LabelKey.cget("text")
     KeyLength = (len(key))
     letter = int(SpinboxLetterSelection.get())
-    ciph = TextCiph.get("1.0", "end")[:-1]
-    ciph = NormalizeText(ciph, strict = True)
-    sample = TextFreqAn.get("1.0", "end")[:-1]
-    sample = NormalizeText(sample, strict = True)
-    if ciph == "":
+    if StrictCiphertext() == "":
         return 0
-    PlainGrid = [[0 for j in range(KeyLength)] for i in range(math.ceil(len(ciph)/KeyLength))]
-    if len(ciph) % KeyLength != 0:
-        PlainGrid[-1] = [0 for j in range(len(ciph) % KeyLength)]
-    CalcPlainText()
-    TextPlain.delete("1.0", "end")
-    TextPlain.insert("1.0", "\n".join(["".join(PlainGrid[i]) for i in range(len(PlainGrid))]))
-    if sample == "":
+    if ShowPlaintext:
+        PrintPlaintext()
+    SampleFrequencies = CurrentSampleFrequencies()
+    if sum(SampleFrequencies) == 0:
         return 1
-    SampleFrequencies = [0 for i in range(26)]
-    CiphFrequencies = [0 for i in range(26)]
-    for c in sample:
-        SampleFrequencies[ord(c) - ord("A")] += 1
     if UseWholeCipherText:
-        for c in ciph:
-            CiphFrequencies[ord(c) - ord("A")] += 1
+        CiphFrequencies = CiphColumnFrequencies(1)[0].tolist()
     else:
-        for i in range(len(PlainGrid) - 1):
-            CiphFrequencies[ord(PlainGrid[i][letter - 1]) - ord("A")] += 1
-        if len(PlainGrid[-1]) >= letter:
-            CiphFrequencies[ord(PlainGrid[-1][letter - 1]) - ord("A")] += 1
+        CiphFrequencies = Vigenere.DecryptedFrequencies(CiphColumnFrequencies(KeyLength)[letter - 1],
+                                                        ord(key[letter - 1]) - ord("A")).tolist()
     return [CiphFrequencies, SampleFrequencies]
 
-def ButtonShowFrequenciesClick(ShowFigure = True):
-    freq = CalculateFrequencies()
+def ButtonShowFrequenciesClick(ShowFigure = True, ShowPlaintext = True):
+    freq = CalculateFrequencies(ShowPlaintext = ShowPlaintext)
     if freq == 0:
         LabelExamFeedback["text"] = "No ciphertext to analyze"
         return
@@ -268,46 +295,44 @@ def ButtonShowFrequenciesClick(ShowFigure = True):
     if not ShowFigure:
         return
     alphabet = [chr(ord("A") + i) for i in range(26)]
-    fig = plt.figure("Letter frequencies")
-    plt.subplot(211)
-    plt.cla()
-    plt.bar([i for i in range(52)],
-            [freq[1][i % 26] for i in range(52)],
-            tick_label = [alphabet[i % 26] for i in range(52)])
-    plt.subplot(212)
-    plt.cla()
-    plt.bar([i for i in range(52)],
-            [freq[0][i % 26] for i in range(52)],
-            tick_label = [alphabet[i % 26] for i in range(52)])
-    plt.show()
+    Plotting.ShowBars("Letter frequencies",
+                      [([alphabet[i % 26] for i in range(52)], [freq[1][i % 26] for i in range(52)], None),
+                       ([alphabet[i % 26] for i in range(52)], [freq[0][i % 26] for i in range(52)], None)])
 
+# This function is invoked when the user clicks the button
+# "auto". It finds the shifts of all letters of the key with
+# the assumed key length by comparing each column with the
+# sample text, sets the best key and prints the runners-up.
 def ButtonEstimateShiftClick():
-    LabelExamFeedback["text"] = "Function disabled"
+    ClearFeedbackLabels()
+    ciph = StrictCiphertext()
+    if ciph == "":
+        LabelExamFeedback["text"] = "No ciphertext to analyze"
+        return
+    if sum(CurrentSampleFrequencies()) == 0:
+        LabelExamFeedback["text"] = "No sample text to compare with"
+        return
+    try:
+        KeyLength, keys = Vigenere.CrackVigenere(ciph, CurrentSampleFrequencies(),
+                                                 KeyLength = int(SpinboxKeyLength.get()), count = 3)
+    except ValueError as e:
+        LabelExamFeedback["text"] = str(e)
+        return
+    key = keys[0][0]
+    LabelKey["text"] = key
+    letter = int(SpinboxLetterSelection.get())
+    SpinboxLetterShift.set(ord(key[letter - 1]) - ord("A"))
+    ButtonShowFrequenciesClick(ShowFigure = Plotting.FiguresOpen())
+    LabelExamFeedback["text"] = "Best keys: " + ", ".join([k[0] for k in keys])
 
 def ButtonFormatPlaintextClick():
-    def IsLetter(c):
-        return ((ord(c) <= ord("Z")) and (ord(c) >= ord("A"))) or ((ord(c) <= ord("z")) and (ord(c) >= ord("a")))
-
-    if CalculateFrequencies() == 0:
+    if CalculateFrequencies(ShowPlaintext = False) == 0:
         LabelExamFeedback["text"] = "No ciphertext entered"
         return
-    ciph = TextCiph.get("1.0", "end")[:-1]
+    ciph = ViewCiph.Get()
     ciph = NormalizeText(ciph)
-    TextCiph.delete("1.0", "end")
-    TextCiph.insert("1.0", ciph)
-    plain_old = TextPlain.get("1.0", "end")[:-1]
-    i = 0
-    plain = ""
-    for c in ciph:
-        if IsLetter(c):
-            while not IsLetter(plain_old[i]):
-                i += 1
-            plain += plain_old[i]
-            i += 1
-        else:
-            plain += c
-    TextPlain.delete("1.0", "end")
-    TextPlain.insert("1.0", plain)
+    ViewCiph.Set(ciph)
+    PrintPlaintext(format = True)
 
 # The window is divided into three frames.
 FramePlain = ttk.Frame(master = root)
@@ -341,6 +366,7 @@ LabelCiphFeedback = ttk.Label(master = FrameCiph, text = "")
 LabelCiphFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextCiph = tk.Text(master = FrameCiph, width = 10)
 TextCiph.pack(side = "top", fill = "both", expand = True, padx = 25, pady = 10)
+ViewCiph = TextView.TextView(TextCiph)
 
 LabelExamCaption = ttk.Label(master = FrameExam, text = "Settings")
 LabelExamCaption.pack(side = "top", pady = 5)
@@ -472,6 +498,7 @@ LabelPlainFeedback = ttk.Label(master = FramePlain, text = "")
 LabelPlainFeedback.pack(side = "top", padx = 25, pady = 5, fill = "x")
 TextPlain = tk.Text(master = FramePlain, width = 10)
 TextPlain.pack(side = "bottom", fill = "both", expand = True, padx = 25, pady = 10)
+ViewPlain = TextView.TextView(TextPlain)
 
 FrameFreqAn = ttk.Frame(master = FrameCiph)
 FrameFreqAn["relief"] = "groove"
@@ -495,4 +522,12 @@ TextFreqAn = tk.Text(master = FrameFreqAn, width = 10, height = 5)
 TextFreqAn.pack(side = "bottom", fill = "both", expand = True,
                 padx = 20, pady = 10)
 
+# This function is invoked when the window is closed.
+# It stops the worker thread of the scheduler and closes the
+# window.
+def WindowClosed():
+    Tasks.Close()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", WindowClosed)
 root.mainloop()
@@ -0,0 +1,44 @@
+# unittest provides the test cases
+# sys and os provide the path of the package CipherCore
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from CipherCore import Transposition
+
+# The key of twelve letters repeats "A" at the positions
+# 1, 3, 5, 7, 9 and 11. The former ranking sorted the
+# letters suffixed by their position ("A", "A3", ...,
+# "A11") as strings and thereby ranked "A11" before "A3".
+# Repeated letters are now ranked from left to right.
+LongKey = "BANANABANANA"
+LongKeyRanks = [6, 0, 8, 1, 9, 2, 7, 3, 10, 4, 11, 5]
+Plain = "WEATTACKATDAWNFROMTHENORTHSIDE"
+Cipher = "     EKNHH          TDOOD     WCWTTTTRNI     AAFES     AAMRE"
+DisruptedCipher = "ET AA RTN  DWT KDN MERHI AACTWFOHOTSE"
+
+class TestLongKeys(unittest.TestCase):
+
+    # This function checks the ranks of the repeated letters
+    # of a key of more than ten letters.
+    def test_key_ranks(self):
+        self.assertEqual(Transposition.KeyRanks(LongKey), LongKeyRanks)
+        self.assertEqual(Transposition.KeyOrder(LongKey), [1, 3, 5, 7, 9, 11, 0, 6, 2, 4, 8, 10])
+
+    # This function checks the cipher text of the disrupted
+    # columnar transposition, whose columns are read in the
+    # order of the long key.
+    def test_disrcoltrans2_long_key(self):
+        self.assertEqual(Transposition.DisrColTrans2Encrypt(Plain, LongKey, "KEY"), Cipher)
+        self.assertEqual(Transposition.DisrColTrans2Decrypt(Cipher, LongKey, "KEY")[0], Plain)
+
+    # This function checks the cipher text of the disrupted
+    # columnar transposition, whose blanks follow the ranks
+    # of the long disruption key.
+    def test_disrcoltrans2_long_disruption_key(self):
+        self.assertEqual(Transposition.DisrColTrans2Encrypt(Plain, "KEY", LongKey), DisruptedCipher)
+        self.assertEqual(Transposition.DisrColTrans2Decrypt(DisruptedCipher, "KEY", LongKey)[0], Plain)
+
+if __name__ == "__main__":
+    unittest.main()